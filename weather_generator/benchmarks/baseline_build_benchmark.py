@@ -0,0 +1,152 @@
+# Standard Python Library
+import argparse
+import datetime
+import logging
+import time
+import pandas as pd
+
+# Custom Python Library
+from generator.generate_baseline_data import build_gis_historical_data
+
+def get_samples_data(number_locations, sampling_number):
+    """This function returns synthetic locations and weather data samples in
+    the layout returned by the baseline requests.
+
+    Parameters
+    ----------
+    number_locations : int
+        The number of locations.
+    sampling_number : int
+        The number of weather data samples of each location and month.
+
+    Returns
+    -------
+    locations : list
+    locations_data : list
+    elevations : list
+    samples_data : list
+    """
+
+    locations = ["City {}, Country".format(idx) for idx in range(number_locations)]
+    locations_data = [{"latitude": -33.85 + idx, "longitude": 151.22 - idx} for idx in range(number_locations)]
+    elevations = [idx * 10 for idx in range(number_locations)]
+    samples_data = [(datetime.datetime(2010 + sample % 8, month, 1 + sample % 28, 12, 0, 0)
+                    ,18.7, 21.61, 81.0, 1014.27, "Australia/Sydney")
+                    for _ in locations
+                    for month in range(1, 13)
+                    for sample in range(sampling_number)]
+
+    return locations, locations_data, elevations, samples_data
+
+def build_append_historical_data(locations, locations_data, elevations, samples_data):
+    """This function builds the baseline historical data row by row with
+    DataFrame.append, as the baseline collection did before the record
+    buffer. It is kept as the reference of the benchmark.
+
+    Parameters
+    ----------
+    locations : list
+        The location names including country e.g. 'Sydney, Australia'.
+    locations_data : list
+        The geolocation data of each location with the latitude and longitude
+        keys.
+    elevations : list
+        The elevation of each location.
+    samples_data : list
+        The weather data samples ordered by location with the same number of
+        samples for each location.
+
+    Returns
+    -------
+    df_hist : pandas.DataFrame
+        The baseline historical data.
+    """
+
+    df_hist = pd.DataFrame(columns=["Location", "Date"
+                                   ,"Month", "Temperature_Min"
+                                   ,"Temperature_Max", "Humidity"
+                                   ,"Pressure"])
+    location_samples = len(samples_data) // len(locations)
+
+    for idx, loc in enumerate(locations):
+        for date_gen, temp_min, temp_max, humidity, pressure, timezone in samples_data[idx*location_samples:(idx+1)*location_samples]:
+            df_hist = df_hist.append(pd.Series(dict(zip(df_hist.columns
+                                                       ,[loc, date_gen
+                                                        ,date_gen.month, temp_min
+                                                        ,temp_max, humidity
+                                                        ,pressure])))
+                                    ,ignore_index=True)
+
+    return df_hist
+
+def time_build(build_func, number_locations, sampling_number):
+    """This function returns the seconds taken by build_func to build the
+    baseline data of the synthetic samples.
+
+    Parameters
+    ----------
+    build_func : callable
+        The function building the baseline data from the locations,
+        locations data, elevations and samples data.
+    number_locations : int
+        The number of locations.
+    sampling_number : int
+        The number of weather data samples of each location and month.
+
+    Returns
+    -------
+    seconds : float
+        The wall time of the build in seconds.
+    """
+
+    data = get_samples_data(number_locations, sampling_number)
+    start_time = time.perf_counter()
+    build_func(*data)
+
+    return time.perf_counter() - start_time
+
+if __name__ == "__main__":
+    """This benchmark measures the baseline data build time for an increasing
+    sampling_number. A constant time per sample shows linear scaling.
+    """
+
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument(
+        "--number_locations"
+       ,help = "The number of synthetic locations."
+       ,type = int
+       ,default = 12
+    )
+
+    parser.add_argument(
+        "--sampling_numbers"
+       ,help = "The comma separated sampling_number values to be measured."
+       ,type = str
+       ,default = "10,100,1000,5000"
+    )
+
+    parser.add_argument(
+        "--append_max_samples"
+       ,help = "The maximum number of samples measured with the DataFrame.append reference."
+       ,type = int
+       ,default = 20000
+    )
+
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    print("{:>16} {:>10} {:>12} {:>16} {:>16}".format("sampling_number", "samples", "buffer (s)", "buffer (us/row)", "append (us/row)"))
+
+    for sampling_number in [int(value) for value in args.sampling_numbers.split(",")]:
+        number_samples = args.number_locations * 12 * sampling_number
+        buffer_time = time_build(build_gis_historical_data, args.number_locations, sampling_number)
+
+        # DataFrame.append is quadratic and removed in pandas 2.
+        if number_samples <= args.append_max_samples and hasattr(pd.DataFrame, "append"):
+            append_row_time = "{:.1f}".format(time_build(build_append_historical_data, args.number_locations, sampling_number) / number_samples * 1e6)
+        else:
+            append_row_time = "-"
+
+        print("{:>16} {:>10} {:>12.3f} {:>16.1f} {:>16}".format(sampling_number, number_samples, buffer_time
+                                                             ,buffer_time / number_samples * 1e6, append_row_time))
@@ -0,0 +1,295 @@
+# Standard Python Library
+import argparse
+import datetime
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+# Custom Python Library
+from generator.generate_baseline_data import aggregate_historical_data, get_baseline_file_path
+from generator.output_writer import get_output_writer, open_output_stream
+from generator.weather_data_generator import WeatherDataGen
+from common.profiler import StageProfiler
+from common.utils import get_config
+
+def measure_generation(config_data, number_data, chunk_size, memory=False):
+    """This function generates and saves number_data simulated weather data
+    points in chunks to the null device, timing the initialisation, each
+    generation stage and the save.
+
+    Parameters
+    ----------
+    config_data : dict
+        The configuration data.
+    number_data : int
+        The number of simulated data points.
+    chunk_size : int
+        The maximum number of data points generated at a time.
+    memory : bool, default is False
+        Flag if the peak memory of each stage is traced.
+
+    Returns
+    -------
+    profiler : StageProfiler
+    """
+
+    profiler = StageProfiler(enabled=True, trace_memory=memory)
+    wdg = WeatherDataGen(number_data, seed=0, profiler=profiler)
+    writer = get_output_writer(config_data, stream=open_output_stream(os.devnull))
+
+    for output_data in wdg.generate_iter(chunk_size):
+        with profiler.stage("save_output", len(output_data)):
+            writer.write(output_data)
+
+    writer.close()
+
+    return profiler
+
+def measure_aggregation(df_hist, number_data, memory=False):
+    """This function aggregates number_data historical data rows sampled with
+    replacement from the baseline historical data.
+
+    Parameters
+    ----------
+    df_hist : pandas.DataFrame
+        The baseline historical data.
+    number_data : int
+        The number of historical data rows.
+    memory : bool, default is False
+        Flag if the peak memory of the aggregation is traced.
+
+    Returns
+    -------
+    profiler : StageProfiler
+    """
+
+    profiler = StageProfiler(enabled=True, trace_memory=memory)
+    df_sample = df_hist.iloc[np.random.RandomState(0).randint(0, len(df_hist), size=number_data)]
+
+    with profiler.stage("aggregate_historical_data", number_data):
+        aggregate_historical_data(df_sample)
+
+    return profiler
+
+def measure(measure_func, repeat, memory, *args):
+    """This function returns the stage results of the fastest of repeat runs
+    of measure_func, with the peak memory of an additional traced run.
+
+    Returns
+    -------
+    results : dict
+        The seconds and peak memory in bytes of each stage.
+    """
+
+    seconds = {}
+
+    for _ in range(repeat):
+        for stage, record in measure_func(*args).stages.items():
+            seconds[stage] = min(seconds.get(stage, record["wall_seconds"]), record["wall_seconds"])
+
+    peak_memory = {}
+
+    # Tracing the allocations slows the stages down, so the memory is
+    # measured in its own run.
+    if memory:
+        peak_memory = {stage: record["peak_traced_bytes"] for stage, record in measure_func(*args, True).stages.items()}
+        tracemalloc.stop()
+
+    return {stage: {"seconds": stage_seconds, "peak_memory_bytes": peak_memory.get(stage)}
+            for stage, stage_seconds in seconds.items()}
+
+def get_commit():
+    """This function returns the git commit of the working tree, or None
+    outside a git repository.
+    """
+
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], stdout=subprocess.PIPE
+                             ,stderr=subprocess.DEVNULL, universal_newlines=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare_results(baseline, results, threshold, min_seconds, min_delta):
+    """This function returns the stages of results slower than the same stage
+    and number of data points of baseline by more than threshold. Both
+    results hold the fastest of their repeated runs.
+
+    Parameters
+    ----------
+    baseline : dict
+        The benchmark results of the reference commit.
+    results : dict
+        The benchmark results of the current commit.
+    threshold : float
+        The relative slowdown reported as a regression e.g. 0.2.
+    min_seconds : float
+        The stages faster than min_seconds in both results are skipped as
+        their time is dominated by noise.
+    min_delta : float
+        The stages slower by less than min_delta seconds are skipped as the
+        difference is within the noise.
+
+    Returns
+    -------
+    comparison : list
+        The (stage, number_data, baseline seconds, seconds, ratio, regression
+        flag) of every stage in both results.
+    """
+
+    baseline_seconds = {(result["stage"], result["number_data"]): result["seconds"] for result in baseline["results"]}
+    comparison = []
+
+    for result in results["results"]:
+        key = (result["stage"], result["number_data"])
+
+        if key not in baseline_seconds:
+            continue
+
+        ratio = result["seconds"] / baseline_seconds[key] if baseline_seconds[key]>0 else float("inf")
+        regression = (ratio > 1 + threshold
+                      and max(result["seconds"], baseline_seconds[key]) >= min_seconds
+                      and result["seconds"] - baseline_seconds[key] >= min_delta)
+        comparison.append(key + (baseline_seconds[key], result["seconds"], ratio, regression))
+
+    return comparison
+
+if __name__ == "__main__":
+    """This benchmark measures the time and peak memory of each WeatherDataGen
+    stage and of the baseline aggregation for increasing numbers of data
+    points, using the baseline data in the data folder. The results are
+    written as JSON and compared with the results of another commit.
+    """
+
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument(
+        "--sizes"
+       ,help = "The comma separated numbers of data points to be measured e.g. 1e3,1e4,1e5."
+       ,type = str
+       ,default = "1e3,1e4,1e5,1e6"
+    )
+
+    parser.add_argument(
+        "--chunk_size"
+       ,help = "The maximum number of data points generated at a time. Defaults to chunk_size in config.yaml."
+       ,type = int
+       ,default = None
+    )
+
+    parser.add_argument(
+        "--aggregate_max_size"
+       ,help = "The maximum number of historical data rows measured with the baseline aggregation."
+       ,type = float
+       ,default = 1e7
+    )
+
+    parser.add_argument(
+        "--repeat"
+       ,help = "The number of runs of each size. The fastest run is reported."
+       ,type = int
+       ,default = 5
+    )
+
+    parser.add_argument(
+        "--memory"
+       ,help = "Measure the peak memory allocated during each stage in an additional run."
+       ,action = "store_true"
+    )
+
+    parser.add_argument(
+        "--output"
+       ,help = "The JSON file the results are written to."
+       ,type = str
+       ,default = None
+    )
+
+    parser.add_argument(
+        "--compare"
+       ,help = "The JSON file of the results of another commit to be compared with."
+       ,type = str
+       ,default = None
+    )
+
+    parser.add_argument(
+        "--threshold"
+       ,help = "The relative slowdown of a stage reported as a regression."
+       ,type = float
+       ,default = 0.2
+    )
+
+    parser.add_argument(
+        "--min_seconds"
+       ,help = "The stages faster than min_seconds are not reported as a regression."
+       ,type = float
+       ,default = 0.05
+    )
+
+    parser.add_argument(
+        "--min_delta"
+       ,help = "The stages slower by less than min_delta seconds are not reported as a regression."
+       ,type = float
+       ,default = 0.05
+    )
+
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    config_data = get_config()
+    chunk_size = args.chunk_size or config_data["simulation"]["chunk_size"]
+    df_hist = pd.read_csv(get_baseline_file_path(config_data, "output_base_historical_file_name"))
+    results = {"commit": get_commit()
+              ,"created": datetime.datetime.now().isoformat(timespec="seconds")
+              ,"python": platform.python_version()
+              ,"numpy": np.__version__
+              ,"pandas": pd.__version__
+              ,"chunk_size": chunk_size
+              ,"repeat": args.repeat
+              ,"results": []}
+
+    # Warming up the caches and lazy imports of the first run.
+    measure_generation(config_data, 1000, chunk_size)
+    measure_aggregation(df_hist, 1000)
+
+    print("{:>28} {:>12} {:>12} {:>16} {:>16}".format("stage", "number_data", "seconds", "rows/second", "peak memory (MB)"))
+
+    for number_data in [int(float(value)) for value in args.sizes.split(",")]:
+        stage_results = measure(measure_generation, args.repeat, args.memory, config_data, number_data, chunk_size)
+
+        if number_data <= args.aggregate_max_size:
+            stage_results.update(measure(measure_aggregation, args.repeat, args.memory, df_hist, number_data))
+
+        for stage, stage_result in stage_results.items():
+            results["results"].append(dict(stage=stage, number_data=number_data, **stage_result))
+            peak_memory = stage_result["peak_memory_bytes"]
+
+            print("{:>28} {:>12} {:>12.4f} {:>16.0f} {:>16}".format(stage, number_data, stage_result["seconds"]
+                                                                 ,number_data / stage_result["seconds"] if stage_result["seconds"]>0 else float("inf")
+                                                                 ,"-" if peak_memory is None else "{:.1f}".format(peak_memory / 1e6)))
+
+    if args.output is not None:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if args.compare is not None:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+
+        comparison = compare_results(baseline, results, args.threshold, args.min_seconds, args.min_delta)
+
+        print()
+        print("Compared with commit {}.".format(baseline.get("commit")))
+        print("{:>28} {:>12} {:>12} {:>12} {:>8}".format("stage", "number_data", "baseline (s)", "seconds", "ratio"))
+
+        for stage, number_data, baseline_seconds, seconds, ratio, regression in comparison:
+            print("{:>28} {:>12} {:>12.4f} {:>12.4f} {:>8.2f}{}".format(stage, number_data, baseline_seconds, seconds, ratio
+                                                                      ," REGRESSION" if regression else ""))
+
+        # A failing exit status lets a CI job catch the regressions.
+        if any(comparison_row[-1] for comparison_row in comparison):
+            sys.exit(1)
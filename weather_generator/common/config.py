@@ -1,4 +1,6 @@
 # Standard Python Library
+import logging.config
+import threading
 import yaml
 
 # Custom Python Library
@@ -11,4 +13,27 @@ class LoggingConfig:
     
     # Retrieve the loggin.yaml data.
     logging_config = get_config(file_name="logging.yaml")
+    
+    # Flag if the logging is configured in this process.
+    configured = False
+    configure_lock = threading.Lock()
+    
+    @classmethod
+    def configure(cls, force=False):
+        """This function configures the logging with the logging.yaml data
+        once per process. Configuring it again would restart the background
+        thread of the queue handler and reopen the log files, so every module
+        can call it on import.
 
+        Parameters
+        ----------
+        force : bool, default is False
+            Flag if the logging is configured again.
+        """
+        
+        with cls.configure_lock:
+            if cls.configured and not force:
+                return
+            
+            logging.config.dictConfig(cls.logging_config)
+            cls.configured = True
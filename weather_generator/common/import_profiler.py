@@ -0,0 +1,102 @@
+# Standard Python Library
+import logging
+import os
+import subprocess
+import sys
+
+def get_import_times(module_name):
+    """Returns the import time of a module and of every module it imports,
+    measured with 'python -X importtime' in a new interpreter so the modules
+    already imported by the caller are not excluded.
+
+    Parameters
+    ----------
+    module_name : string
+        The module name e.g. 'run'.
+
+    Returns
+    -------
+    import_times : list
+        The (module name, self time in microseconds, cumulative time in
+        microseconds, nesting depth) of each imported module in import order.
+    """
+
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import {}".format(module_name)]
+                           ,cwd=os.path.abspath(os.curdir)
+                           ,stdout=subprocess.DEVNULL
+                           ,stderr=subprocess.PIPE
+                           ,universal_newlines=True)
+
+    if result.returncode!=0:
+        logging.error("Importing {} failed. Error: {}.".format(module_name, result.stderr.strip().splitlines()[-1:]))
+        raise RuntimeError
+
+    import_times = []
+
+    for line in result.stderr.splitlines():
+
+        if not line.startswith("import time:"):
+            continue
+
+        self_time, cumulative_time, name = line[len("import time:"):].split("|")
+
+        # Skipping the header line.
+        if not self_time.strip().isdigit():
+            continue
+
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        import_times.append((name.strip(), int(self_time), int(cumulative_time), depth))
+
+    # Python 3.6 ignores the unknown importtime option instead of failing.
+    if len(import_times)==0:
+        logging.error("No import times were reported for {}. Import profiling requires Python 3.7 or above.".format(module_name))
+        raise RuntimeError
+
+    return import_times
+
+def report_import_times(module_name, top=15):
+    """Logs the import time of a module and the import time of each top
+    level package it imports e.g. pandas, and returns the import time of
+    the module.
+
+    Parameters
+    ----------
+    module_name : string
+        The module name e.g. 'run'.
+    top : int, default is 15
+        The number of slowest packages to be reported.
+
+    Returns
+    -------
+    module_time : int
+        The cumulative import time of the module in microseconds.
+    """
+
+    import_times = get_import_times(module_name)
+    module_time = 0
+    package_times = {}
+    nested_imports = []
+    
+    # The imports are listed after the modules they import, so the imports
+    # of the module are listed before it.
+    for name, self_time, cumulative_time, depth in import_times:
+        
+        nested_imports.append((name, self_time))
+        
+        if depth==0:
+            if name==module_name:
+                module_time = cumulative_time
+                
+                # Summing the self time of the imports by top level package.
+                for nested_name, nested_self_time in nested_imports:
+                    package = nested_name.split(".")[0]
+                    package_times[package] = package_times.get(package, 0) + nested_self_time
+            
+            nested_imports = []
+
+    logging.info("Import time of {}: {:.1f} ms.".format(module_name, module_time / 1000))
+
+    for package, package_time in sorted(package_times.items(), key=lambda item: item[1], reverse=True)[:top]:
+        logging.info("Import time of {} package: {:.1f} ms.".format(package, package_time / 1000))
+
+    return module_time
@@ -0,0 +1,197 @@
+# Standard Python Library
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+
+# Keyword arguments of the progress records, attributing them to the caller
+# of ProgressLogger.update. Python 3.7 and older have no stacklevel.
+_progress_log_kwargs = {"stacklevel": 2} if sys.version_info>=(3, 8) else {}
+
+class QueueListenerHandler(logging.handlers.QueueHandler):
+    """This class puts the log records in a queue emptied by a background
+    listener thread, which passes them to its handlers, so the logging
+    threads do not wait on the console and file I/O. It is configured in
+    logging.yaml with the handlers it forwards to e.g.
+
+        queue_handler:
+            (): common.logging_utils.QueueListenerHandler
+            handlers: [cfg://handlers.console]
+
+    The records pending in the queue are written when the handler is closed
+    on exit. A forked child process, e.g. a process pool worker, writes its
+    records synchronously instead, as the listener thread is not copied by
+    the fork and the child can exit without closing the handler. The fork
+    is detected from the process id, as Python 3.6 has no
+    os.register_at_fork.
+    """
+
+    def __init__(self, handlers, respect_handler_level=True):
+        """
+        Parameters
+        ----------
+        handlers : list
+            The handlers the log records are passed to.
+        respect_handler_level : bool, default is True
+            Flag if a record is only passed to the handlers of a level lower
+            or equal to the record level.
+        """
+
+        # Python 3.6 has no queue.SimpleQueue.
+        super().__init__(queue.Queue(-1))
+
+        # The handlers configured by logging.config.dictConfig are only
+        # resolved from their cfg:// references when indexed.
+        self.target_handlers = [handlers[idx] for idx in range(len(handlers))]
+        self.respect_handler_level = respect_handler_level
+        self.listener = logging.handlers.QueueListener(self.queue, *self.target_handlers
+                                                      ,respect_handler_level=respect_handler_level)
+        self.listener.start()
+        self.pid = os.getpid()
+
+    def emit(self, record):
+        """This function puts the log record in the queue, or passes it to
+        the handlers when the listener is stopped or in a forked child
+        process.
+
+        Parameters
+        ----------
+        record : logging.LogRecord
+            The log record.
+        """
+
+        if self.listener is not None and self.pid==os.getpid():
+            super().emit(record)
+            return
+
+        for handler in self.target_handlers:
+            if not self.respect_handler_level or record.levelno>=handler.level:
+                handler.handle(record)
+
+    def stop_listener(self):
+        """This function writes the log records pending in the queue and
+        stops the listener thread. A forked child process only drops the
+        listener, as its thread runs in the parent process.
+        """
+
+        listener = self.listener
+        self.listener = None
+
+        if listener is not None and self.pid==os.getpid():
+            listener.stop()
+
+    def close(self):
+        """This function stops the listener thread and closes the handler.
+        """
+
+        self.stop_listener()
+        super().close()
+
+def set_console_stream(stream):
+    """This function sets the stream of the console handlers writing to the
+    standard output, including the handlers of the queue handlers, e.g. to
+    the standard error when the output data is written to the standard
+    output.
+
+    Parameters
+    ----------
+    stream : file object
+        The text stream of the console handlers.
+    """
+
+    handlers = list(logging.getLogger().handlers)
+
+    for handler in list(handlers):
+        handlers.extend(getattr(handler, "target_handlers", []))
+
+    for handler in handlers:
+        if type(handler) is logging.StreamHandler and handler.stream is sys.stdout:
+            handler.setStream(stream)
+
+def format_duration(seconds):
+    """This function formats a number of seconds as hours, minutes and
+    seconds e.g. 01:02:03.
+
+    Parameters
+    ----------
+    seconds : float
+        The number of seconds.
+
+    Returns
+    -------
+    duration : string
+    """
+
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+
+    return "{:02d}:{:02d}:{:02d}".format(hours, minutes, seconds)
+
+class ProgressLogger(object):
+    """This class logs the progress of a loop over a total number of items at
+    most once per interval, with the number of items done, the rate and the
+    estimated time remaining, instead of a log record per item. The items
+    can be counted from several threads.
+    """
+
+    def __init__(self, description, total, unit="item(s)", interval=5.0, level=logging.INFO):
+        """
+        Parameters
+        ----------
+        description : string
+            The description of the loop e.g. 'Retrieving weather data'.
+        total : int
+            The total number of items.
+        unit : string, default is 'item(s)'
+            The unit of the items.
+        interval : float, default is 5.0
+            The minimum number of seconds between two progress records.
+        level : int, default is logging.INFO
+            The level of the progress records.
+        """
+
+        self.description = description
+        self.total = total
+        self.unit = unit
+        self.interval = interval
+        self.level = level
+        self.done = 0
+        self.lock = threading.Lock()
+        self.start_time = time.perf_counter()
+        self.next_time = self.start_time + interval
+
+    def update(self, count=1):
+        """This function counts items done, logging the progress when the
+        interval has passed since the last progress record or all the items
+        are done.
+
+        Parameters
+        ----------
+        count : int, default is 1
+            The number of items done.
+        """
+
+        with self.lock:
+            done_before = self.done
+            self.done += count
+            now = time.perf_counter()
+
+            if now<self.next_time and (self.done<self.total or done_before>=self.total):
+                return
+
+            self.next_time = now + self.interval
+            done = self.done
+
+        elapsed_time = now - self.start_time
+        rate = done / elapsed_time if elapsed_time>0 else float("inf")
+
+        if done>=self.total:
+            logging.log(self.level, "{}: completed {} {} in {} ({:.1f} {} per second)."
+                                    .format(self.description, done, self.unit, format_duration(elapsed_time), rate, self.unit), **_progress_log_kwargs)
+        else:
+            logging.log(self.level, "{}: {} of {} {} ({:.1%}) at {:.1f} {} per second, {} remaining."
+                                    .format(self.description, done, self.total, self.unit, done / self.total if self.total>0 else 0
+                                           ,rate, self.unit, format_duration((self.total - done) / rate) if rate>0 else "--:--:--"), **_progress_log_kwargs)
@@ -0,0 +1,235 @@
+# Standard Python Library
+import contextlib
+import sys
+import time
+import tracemalloc
+
+# The resource module is only available on Unix.
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Multiplier of the peak resident set size of getrusage to bytes.
+RSS_UNIT = 1 if sys.platform=="darwin" else 1024
+
+def get_peak_rss():
+    """Returns the peak resident set size of the process in bytes. Without
+    the resource module e.g. on Windows, the peak working set of psutil is
+    returned when it is installed.
+
+    Returns
+    -------
+    peak_rss : int
+        The peak resident set size, or None when it is not available.
+    """
+
+    if resource is not None:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * RSS_UNIT
+
+    try:
+        import psutil
+    except ImportError:
+        return None
+
+    return getattr(psutil.Process().memory_info(), "peak_wset", None)
+
+def get_peak_rss_growth(start_peak_rss):
+    """Returns how much the peak resident set size of the process grew since
+    start_peak_rss. The peak never decreases, so the growth is the memory a
+    stage needed beyond the peak reached before it.
+
+    Parameters
+    ----------
+    start_peak_rss : int
+        The peak resident set size at the start, or None.
+
+    Returns
+    -------
+    peak_rss_growth : int
+        The growth in bytes, or None when the peak is not available.
+    """
+
+    peak_rss = get_peak_rss()
+
+    if peak_rss is None or start_peak_rss is None:
+        return None
+
+    return peak_rss - start_peak_rss
+
+class StageProfiler(object):
+    """This class records the wall time, CPU time, number of rows and peak
+    memory of named stages, and of each generated chunk. A disabled profiler
+    records nothing, so the stages can be instrumented permanently.
+    """
+
+    def __init__(self, enabled=False, trace_memory=False):
+        """
+        Parameters
+        ----------
+        enabled : bool, default is False
+            Flag if the stages are recorded.
+        trace_memory : bool, default is False
+            Flag if the peak memory allocated during each stage is traced
+            with tracemalloc. Tracing slows the stages down.
+        """
+
+        self.enabled = enabled
+        self.trace_memory = trace_memory
+        self.stages = {}
+        self.chunks = []
+
+    def __start(self):
+        """This function returns the wall time, CPU time, traced memory and
+        peak resident memory at the start of a measure.
+        """
+
+        traced_memory = 0
+
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+
+            # Python 3.8 and older have no reset_peak, and clearing the
+            # traces resets the peak instead.
+            if hasattr(tracemalloc, "reset_peak"):
+                traced_memory = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.clear_traces()
+
+        return time.perf_counter(), time.process_time(), traced_memory, get_peak_rss()
+
+    def __stop(self, start, rows):
+        """This function returns the measure of rows since start.
+        """
+
+        wall_time, cpu_time, traced_memory, peak_rss = start
+        measure = {"calls": 1
+                  ,"rows": rows
+                  ,"wall_seconds": time.perf_counter() - wall_time
+                  ,"cpu_seconds": time.process_time() - cpu_time
+                  ,"peak_rss_growth_bytes": get_peak_rss_growth(peak_rss)}
+
+        if self.trace_memory:
+            measure["peak_traced_bytes"] = tracemalloc.get_traced_memory()[1] - traced_memory
+
+        return measure
+
+    @staticmethod
+    def __add(record, measure):
+        """This function adds a measure to a stage record, summing the times
+        and rows and keeping the peak memory.
+        """
+
+        for key, value in measure.items():
+            if key.startswith("peak_"):
+                record[key] = max((peak for peak in (record.get(key), value) if peak is not None), default=None)
+            else:
+                record[key] = record.get(key, 0) + value
+
+    @contextlib.contextmanager
+    def stage(self, name, rows=0):
+        """This function records the block of the with statement as a stage.
+
+        Parameters
+        ----------
+        name : string
+            The stage name.
+        rows : int, default is 0
+            The number of rows processed by the stage.
+        """
+
+        if not self.enabled:
+            yield
+            return
+
+        start = self.__start()
+
+        try:
+            yield
+        finally:
+            self.__add(self.stages.setdefault(name, {}), self.__stop(start, rows))
+
+    @contextlib.contextmanager
+    def chunk(self, chunk_start, rows):
+        """This function records the block of the with statement as the
+        generation of a chunk. The traced memory of a chunk is the peak of
+        its stages.
+
+        Parameters
+        ----------
+        chunk_start : int
+            The position of the first data point of the chunk.
+        rows : int
+            The number of data points of the chunk.
+        """
+
+        if not self.enabled:
+            yield
+            return
+
+        wall_time = time.perf_counter()
+        cpu_time = time.process_time()
+        peak_rss = get_peak_rss()
+
+        try:
+            yield
+        finally:
+            self.chunks.append({"chunk_start": chunk_start
+                               ,"rows": rows
+                               ,"wall_seconds": time.perf_counter() - wall_time
+                               ,"cpu_seconds": time.process_time() - cpu_time
+                               ,"peak_rss_growth_bytes": get_peak_rss_growth(peak_rss)})
+
+    def merge(self, records):
+        """This function adds the records of another profiler e.g. of a worker
+        process.
+
+        Parameters
+        ----------
+        records : dict
+            The stages and chunks returned by the drain method.
+        """
+
+        for name, record in records["stages"].items():
+            self.__add(self.stages.setdefault(name, {}), record)
+
+        self.chunks.extend(records["chunks"])
+
+    def drain(self):
+        """This function returns the stages and chunks recorded so far and
+        clears them.
+
+        Returns
+        -------
+        records : dict
+        """
+
+        records = {"stages": self.stages, "chunks": self.chunks}
+        self.stages = {}
+        self.chunks = []
+
+        return records
+
+    def report(self):
+        """This function returns the structured report of the recorded stages
+        and chunks in order of chunk position, with the rows per second.
+
+        Returns
+        -------
+        report : dict
+        """
+
+        stages = {}
+
+        for name, record in self.stages.items():
+            stages[name] = dict(record, rows_per_second=record["rows"] / record["wall_seconds"] if record["wall_seconds"]>0 else None)
+
+        chunks = [dict(record, rows_per_second=record["rows"] / record["wall_seconds"] if record["wall_seconds"]>0 else None)
+                  for record in sorted(self.chunks, key=lambda record: record["chunk_start"])]
+
+        return {"enabled": self.enabled
+               ,"stages": stages
+               ,"chunks": chunks
+               ,"peak_rss_bytes": get_peak_rss()}
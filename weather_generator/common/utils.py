@@ -1,5 +1,7 @@
 # Standard Python Library
+import copy
 import os
+import threading
 import yaml
 
 def get_file_path(file_name, folder_name="data", subdirectory=""):
@@ -27,8 +29,18 @@ def get_file_path(file_name, folder_name="data", subdirectory=""):
 
     return file_path
     
+# Cached configuration data keyed by the configuration file path, with the
+# modification time and size of the file when it was parsed.
+_config_cache = {}
+_config_cache_lock = threading.Lock()
+
+# YAML loader, using the faster LibYAML based loader where available.
+_yaml_loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 def get_config(file_name="config.yaml", format="yaml"):
-    """Returns the configuration file data.
+    """Returns the configuration file data. The parsed data is cached per
+    file and reused until the modification time or size of the file
+    changes, so an edited file is picked up without a restart.
 
     Parameters
     ----------
@@ -40,17 +52,43 @@ def get_config(file_name="config.yaml", format="yaml"):
     Returns
     -------
     config_data : yaml or other format
+        A copy of the cached data, so callers can modify it.
     """
     
     # Get the configuration file path.
     config_file_path = get_file_path(folder_name="config", file_name=file_name)
+    file_stat = os.stat(config_file_path)
+    file_version = (file_stat.st_mtime_ns, file_stat.st_size)
     
-    if format=="yaml":
-        with open(config_file_path) as config:
-            # Load the YAML file.
-            config_data = yaml.safe_load(config)
+    with _config_cache_lock:
+        cached = _config_cache.get(config_file_path)
+        
+        if cached is None or cached[0]!=file_version:
+            if format=="yaml":
+                with open(config_file_path) as config:
+                    # Load the YAML file.
+                    config_data = yaml.load(config, Loader=_yaml_loader)
+            
+            cached = (file_version, config_data)
+            _config_cache[config_file_path] = cached
+
+    return copy.deepcopy(cached[1])
+
+def reload_config(file_name=None):
+    """Clears the cached configuration data so the next get_config call
+    parses the file again.
 
-    return config_data
+    Parameters
+    ----------
+    file_name : string, default is None
+        The configuration file name. None clears every configuration file.
+    """
+    
+    with _config_cache_lock:
+        if file_name is None:
+            _config_cache.clear()
+        else:
+            _config_cache.pop(get_file_path(folder_name="config", file_name=file_name), None)
  
 def get_city(loc):
     """Return the city name of the location data.
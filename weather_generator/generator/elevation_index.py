@@ -0,0 +1,186 @@
+# Standard Python Library
+import json
+import logging.config
+import numpy as np
+import os
+
+# Custom Python Library
+from common.config import LoggingConfig
+from common.utils import get_file_path
+
+# Load logging.yaml file
+LoggingConfig.configure()
+
+# File name of the tile bounds index in the elevation index folder.
+INDEX_FILE_NAME = "elevation_index.json"
+
+def build_elevation_index(config_data, index_directory):
+    """This function converts the elevation tif files into raw NumPy arrays
+    that can be memory-mapped and writes the index of the tile bounds. The
+    tiles are written in the order of the latitude and longitude conditions
+    of config.yaml.
+
+    Parameters
+    ----------
+    config_data : dict
+        The gis configuration data.
+    index_directory : string
+        The folder of the NumPy arrays and the tile bounds index.
+    """
+
+    # Imported on use as rasterio is only needed to build the index.
+    import rasterio as rio
+    
+    logging.info("Building elevation index in {}.".format(index_directory))
+
+    # Initialising function variables
+    os.makedirs(index_directory, exist_ok=True)
+    tiles = []
+
+    for lat_value in config_data["latitude_condition"].values():
+        for lon_value in config_data["longitude_condition"].values():
+
+            grid_id = "".join([lon_value["grid_lon"], lat_value["grid_lat"]])
+            elev_file_path = get_file_path(folder_name="data"
+                                          ,subdirectory=config_data["input_subdirectory"]
+                                          ,file_name=config_data["input_file_name"].format(grid_id=grid_id))
+
+            logging.info("Converting elevation file {}.".format(elev_file_path))
+
+            with rio.open(elev_file_path) as file:
+                np.save(os.path.join(index_directory, "{}.npy".format(grid_id)), file.read(1))
+
+                tiles.append({"grid_id": grid_id
+                             ,"west": file.bounds.left
+                             ,"south": file.bounds.bottom
+                             ,"east": file.bounds.right
+                             ,"north": file.bounds.top
+                             ,"height": file.height
+                             ,"width": file.width})
+
+    # The index is written last so an interrupted build is rebuilt.
+    with open(os.path.join(index_directory, INDEX_FILE_NAME), "w") as file:
+        json.dump({"tiles": tiles}, file, indent=2)
+
+    logging.info("Completed building elevation index of {} tile(s).".format(len(tiles)))
+
+class ElevationIndex(object):
+    """This class looks up the elevation of many coordinates at once from the
+    memory-mapped elevation tiles. Only the pages of the tiles holding the
+    gathered pixels are read from disk.
+    """
+
+    def __init__(self, index_directory):
+        """
+        Parameters
+        ----------
+        index_directory : string
+            The folder of the NumPy arrays and the tile bounds index written
+            by build_elevation_index.
+        """
+
+        with open(os.path.join(index_directory, INDEX_FILE_NAME)) as file:
+            self.tiles = json.load(file)["tiles"]
+
+        self.index_directory = index_directory
+        self.bounds = np.array([[tile["west"], tile["south"], tile["east"], tile["north"]] for tile in self.tiles], dtype=float)
+        self.__arrays = [None] * len(self.tiles)
+
+    @classmethod
+    def from_config(cls, config_data):
+        """This function returns the elevation index of the gis configuration
+        data, building it from the elevation tif files on the first use.
+
+        Parameters
+        ----------
+        config_data : dict
+            The gis configuration data.
+
+        Returns
+        -------
+        index : ElevationIndex
+        """
+
+        index_directory = get_file_path(folder_name="data"
+                                       ,subdirectory=config_data["elevation_index_subdirectory"]
+                                       ,file_name="")
+
+        if not os.path.exists(os.path.join(index_directory, INDEX_FILE_NAME)):
+            logging.info("Elevation index does not exists. Building elevation index.")
+            build_elevation_index(config_data, index_directory)
+
+        return cls(index_directory)
+
+    def __getstate__(self):
+
+        # The memory-mapped tiles are reopened after unpickling instead of
+        # being copied to the worker processes.
+        state = self.__dict__.copy()
+        state["_ElevationIndex__arrays"] = [None] * len(self.tiles)
+
+        return state
+
+    def get_tile(self, tile_index):
+        """This function returns the memory-mapped array of a tile.
+
+        Parameters
+        ----------
+        tile_index : int
+            The position of the tile in the index.
+
+        Returns
+        -------
+        array : numpy.memmap
+        """
+
+        if self.__arrays[tile_index] is None:
+            self.__arrays[tile_index] = np.load(os.path.join(self.index_directory, "{}.npy".format(self.tiles[tile_index]["grid_id"]))
+                                               ,mmap_mode="r")
+
+        return self.__arrays[tile_index]
+
+    def lookup(self, lats, lons):
+        """This function returns the elevation of each coordinate. A
+        coordinate on the boundary of two tiles belongs to the last one.
+
+        Parameters
+        ----------
+        lats : numpy.ndarray
+            The latitudes of the coordinates.
+        lons : numpy.ndarray
+            The longitudes of the coordinates.
+
+        Returns
+        -------
+        elevs : numpy.ndarray
+        """
+
+        # Initialising function variables
+        lats = np.asarray(lats, dtype=float)
+        lons = np.asarray(lons, dtype=float)
+        tile_idx = np.full(len(lats), -1)
+        elevs = np.zeros(len(lats), dtype=np.int64)
+
+        # Determine the tile of each coordinate.
+        for idx, (west, south, east, north) in enumerate(self.bounds):
+            tile_idx[(west <= lons) & (lons <= east) & (south <= lats) & (lats <= north)] = idx
+
+        # Determine that every coordinate is in a tile.
+        if (tile_idx<0).any():
+            logging.error("Invalid coordinate(s) {}. Please check the value!".format(list(zip(lats[tile_idx<0], lons[tile_idx<0]))[:10]))
+            raise ValueError
+
+        # Gathering the pixel of each coordinate, keeping the coordinates on
+        # the tile edge in the tile.
+        for idx in np.unique(tile_idx).tolist():
+            points = np.flatnonzero(tile_idx==idx)
+            west, south, east, north = self.bounds[idx]
+            height = self.tiles[idx]["height"]
+            width = self.tiles[idx]["width"]
+
+            rows = np.clip(np.floor((north - lats[points]) / (north - south) * height).astype(np.int64), 0, height - 1)
+            cols = np.clip(np.floor((lons[points] - west) / (east - west) * width).astype(np.int64), 0, width - 1)
+
+            elevs[points] = self.get_tile(idx)[rows, cols]
+
+        return elevs
@@ -0,0 +1,197 @@
+# Standard Python Library
+import logging.config
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Custom Python Library
+from common.config import LoggingConfig
+
+# Load logging.yaml file
+LoggingConfig.configure()
+
+class TokenBucket(object):
+    """This class limits the request rate with a token bucket shared by the
+    fetch threads. Tokens are added at rate per second up to capacity.
+    """
+
+    def __init__(self, rate, capacity):
+        """
+        Parameters
+        ----------
+        rate : float
+            The number of tokens added per second.
+        capacity : int
+            The maximum number of tokens i.e. the request burst size.
+        """
+
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.__tokens = float(capacity)
+        self.__updated = time.monotonic()
+        self.__lock = threading.Lock()
+
+    def acquire(self):
+        """This function blocks until a token is available and takes it.
+        """
+
+        while True:
+            with self.__lock:
+                now = time.monotonic()
+                self.__tokens = min(self.capacity, self.__tokens + (now - self.__updated) * self.rate)
+                self.__updated = now
+
+                if self.__tokens >= 1:
+                    self.__tokens -= 1
+                    return
+
+                wait_time = (1 - self.__tokens) / self.rate
+
+            time.sleep(wait_time)
+
+class RequestBudget(object):
+    """This class counts the requests of a run and stops the run once the
+    maximum number of requests is reached.
+    """
+
+    def __init__(self, max_requests=None):
+        """
+        Parameters
+        ----------
+        max_requests : int, default is None
+            The maximum number of requests. None means unlimited.
+        """
+
+        self.max_requests = max_requests
+        self.used = 0
+        self.__lock = threading.Lock()
+
+    def consume(self):
+        """This function takes one request from the budget.
+        """
+
+        with self.__lock:
+            if self.max_requests is not None and self.used >= self.max_requests:
+                logging.error("The request budget of {} requests is exhausted. Please check config.yaml file.".format(self.max_requests))
+                raise RuntimeError
+
+            self.used += 1
+
+class FetchEngine(object):
+    """This class runs the baseline HTTP requests concurrently in a thread
+    pool with a concurrency limit, token bucket rate limiting, exponential
+    backoff retries and a per-run request budget.
+    """
+
+    def __init__(self, concurrency=8, rate_limit=10, burst=10, max_retries=5
+                ,backoff_base=0.5, backoff_max=30, request_budget=None):
+        """
+        Parameters
+        ----------
+        concurrency : int, default is 8
+            The maximum number of concurrent requests.
+        rate_limit : float, default is 10
+            The maximum number of requests per second.
+        burst : int, default is 10
+            The maximum number of requests sent at once.
+        max_retries : int, default is 5
+            The number of retries of a failed request.
+        backoff_base : float, default is 0.5
+            The wait time in seconds before the first retry. It doubles on
+            every retry.
+        backoff_max : float, default is 30
+            The maximum wait time in seconds before a retry.
+        request_budget : int, default is None
+            The maximum number of requests of the run. None means unlimited.
+        """
+
+        # Determine that concurrency is more than 0.
+        if concurrency<1:
+            logging.error("The fetch concurrency is less than 1. Value: {}.".format(concurrency))
+            raise ValueError
+
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.bucket = TokenBucket(rate_limit, burst)
+        self.budget = RequestBudget(request_budget)
+
+    @classmethod
+    def from_config(cls, config_data):
+        """This function returns the fetch engine of the fetch configuration
+        data.
+
+        Parameters
+        ----------
+        config_data : dict
+            The gis fetch configuration data.
+
+        Returns
+        -------
+        engine : FetchEngine
+        """
+
+        return cls(concurrency=config_data["concurrency"]
+                  ,rate_limit=config_data["rate_limit"]
+                  ,burst=config_data["burst"]
+                  ,max_retries=config_data["max_retries"]
+                  ,backoff_base=config_data["backoff_base"]
+                  ,backoff_max=config_data["backoff_max"]
+                  ,request_budget=config_data["request_budget"])
+
+    def request(self, func, *args, **kwargs):
+        """This function sends a request within the rate limit and request
+        budget, retrying failed requests with exponential backoff.
+
+        Parameters
+        ----------
+        func : callable
+            The function sending the request.
+        *args, **kwargs
+            The arguments of func.
+
+        Returns
+        -------
+        response : object
+            The value returned by func.
+        """
+
+        for attempt in range(self.max_retries + 1):
+            self.budget.consume()
+            self.bucket.acquire()
+
+            try:
+                return func(*args, **kwargs)
+
+            except Exception as error:
+                if attempt==self.max_retries:
+                    logging.error("Request failed after {} retries. Error: {}.".format(self.max_retries, error))
+                    raise
+
+                # Wait with exponential backoff and jitter before retrying.
+                wait_time = min(self.backoff_max, self.backoff_base * 2 ** attempt) * random.uniform(0.5, 1.0)
+
+                logging.warning("Request failed. Retrying in {:.2f} seconds. Error: {}.".format(wait_time, error))
+
+                time.sleep(wait_time)
+
+    def map(self, func, items):
+        """This function runs func for each item concurrently and returns the
+        results in the order of items.
+
+        Parameters
+        ----------
+        func : callable
+            The function called with each item.
+        items : list
+            The items to be processed.
+
+        Returns
+        -------
+        results : list
+        """
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            return list(executor.map(func, items))
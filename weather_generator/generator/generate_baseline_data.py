@@ -3,18 +3,200 @@ import calendar
 import datetime
 import forecastio
 import logging.config
+import numpy as np
+import os
 import pandas as pd
 import random
-import rasterio as rio
-from faker import Faker
+from rasterio.windows import Window
 from geopy.geocoders import Nominatim
 
 # Custom Python Library
 from common.config import LoggingConfig
+from common.logging_utils import ProgressLogger
 from common.utils import get_file_path, get_config, get_city
+from generator.fetch_engine import FetchEngine
+from generator.raster_pool import RasterPool
+from generator.record_buffer import RecordBuffer
+from generator.response_cache import ResponseCache
 
 # Load logging.yaml file
-logging.config.dictConfig(LoggingConfig.logging_config)
+LoggingConfig.configure()
+
+# Pool of the open elevation tif files shared by the elevation lookups.
+_raster_pool = None
+
+# Maximum number of pixels of the window read for the coordinates of a tile.
+# The coordinates spread over a larger window are read in windows per
+# cluster of coordinates instead, as a bounding window can be most of a
+# 90 x 90 degree tile.
+MAX_WINDOW_PIXELS = 4194304
+
+# Number of rows and columns of the pixel cells clustering the coordinates
+# of a tile.
+CLUSTER_CELL_PIXELS = 256
+
+def get_raster_pool(config_data):
+    """This function returns the pool of open elevation tif files, creating
+    it on the first call.
+
+    Parameters
+    ----------
+    config_data : dict
+        The gis configuration data.
+
+    Returns
+    -------
+    pool : RasterPool
+    """
+    
+    global _raster_pool
+    
+    if _raster_pool is None:
+        _raster_pool = RasterPool(max_open=config_data["raster_pool_size"])
+    
+    return _raster_pool
+
+def get_grid_ids(config_data, lats, lons):
+    """This function returns the elevation tif file grid_id of each
+    coordinate e.g. 'D2' for Sydney. The latitude and longitude conditions of
+    config.yaml are applied to every coordinate at once and a coordinate on
+    the boundary of two conditions belongs to the last one.
+
+    Parameters
+    ----------
+    config_data : dict
+        The gis configuration data.
+    lats : numpy.ndarray
+        The latitudes of the coordinates.
+    lons : numpy.ndarray
+        The longitudes of the coordinates.
+
+    Returns
+    -------
+    grid_ids : numpy.ndarray
+        The grid_id of each coordinate with object dtype.
+    """
+    
+    # Initialising function variables
+    lats = np.asarray(lats, dtype=float)
+    lons = np.asarray(lons, dtype=float)
+    grid_lat = np.full(len(lats), "", dtype=object)
+    grid_lon = np.full(len(lons), "", dtype=object)
+    
+    # Determine the latitude data from the image grid. Valid values are 1
+    # and 2.
+    for key, value in config_data["latitude_condition"].items():
+        grid_lat[(value["min_lat"] <= lats) & (lats <= value["max_lat"])] = value["grid_lat"]
+    
+    # Determine the longitude data from the image grid. Valid values are A,
+    # B, C and D.
+    for key, value in config_data["longitude_condition"].items():
+        grid_lon[(value["min_lon"] <= lons) & (lons <= value["max_lon"])] = value["grid_lon"]
+    
+    # Determine that there is a valid grid_lat and grid_lon data.
+    invalid = (grid_lat=="") | (grid_lon=="")
+    
+    if invalid.any():
+        logging.error("Invalid coordinate(s) {}. Please check the value!".format(list(zip(lats[invalid], lons[invalid]))[:10]))
+        raise ValueError
+    
+    return grid_lon + grid_lat
+
+def read_pixels(dataset, rows, cols):
+    """This function returns the pixels of a tif file at the rows and
+    columns. The pixels are read in one window bounding them, or when that
+    window is more than MAX_WINDOW_PIXELS, in one window per cell of
+    CLUSTER_CELL_PIXELS pixels holding pixels.
+
+    Parameters
+    ----------
+    dataset : rasterio.io.DatasetReader
+        The open tif file.
+    rows : numpy.ndarray
+        The row of each pixel.
+    cols : numpy.ndarray
+        The column of each pixel.
+
+    Returns
+    -------
+    values : numpy.ndarray
+    """
+
+    row_min = rows.min()
+    col_min = cols.min()
+    height = rows.max() - row_min + 1
+    width = cols.max() - col_min + 1
+
+    if height * width <= MAX_WINDOW_PIXELS:
+        band = dataset.read(1, window=Window(col_min, row_min, width, height))
+
+        return band[rows - row_min, cols - col_min]
+
+    values = np.zeros(len(rows), dtype=dataset.dtypes[0])
+    _, cells = np.unique(np.column_stack([rows // CLUSTER_CELL_PIXELS, cols // CLUSTER_CELL_PIXELS]), axis=0, return_inverse=True)
+    cells = cells.ravel()
+
+    for cell in range(cells.max() + 1):
+        points = np.flatnonzero(cells==cell)
+        values[points] = read_pixels(dataset, rows[points], cols[points])
+
+    return values
+
+def get_elevation_batch(coords, config_data=None):
+    """This function returns the elevation of each coordinate based on tif
+    files located in the ./data/elevation/*.tif folder. The coordinates are
+    grouped by grid tile and each tile is read once in a window bounding its
+    coordinates, or in windows per cluster of coordinates when they are far
+    apart. The tif files are kept open in a pool of raster_pool_size
+    files.
+
+    Parameters
+    ----------
+    coords : list
+        The (latitude, longitude) of each coordinate.
+    config_data : dict, default is None
+        The gis configuration data. Defaults to the gis key of config.yaml.
+
+    Returns
+    -------
+    elevs : numpy.ndarray
+        The elevation of each coordinate.
+    """
+    
+    # Initialising function variables
+    if config_data is None:
+        config_data = get_config()["gis"]
+    
+    coords = np.asarray(coords, dtype=float).reshape(-1, 2)
+    lats = coords[:, 0]
+    lons = coords[:, 1]
+    elevs = np.zeros(len(coords), dtype=np.int64)
+    grid_ids = get_grid_ids(config_data, lats, lons)
+    pool = get_raster_pool(config_data)
+    
+    for grid_id in np.unique(grid_ids).tolist():
+        
+        idx = np.flatnonzero(grid_ids==grid_id)
+        file_name = config_data["input_file_name"].format(grid_id=grid_id)
+        
+        # Retrieve the elevation tif file path based on grid_id.
+        elev_file_path = get_file_path(folder_name="data"
+                                      ,subdirectory=config_data["input_subdirectory"]
+                                      ,file_name=file_name)
+        
+        logging.info("Retrieving elevation data for {} coordinate(s) in {} file.".format(len(idx), file_name))
+        
+        dataset = pool.get(elev_file_path)
+        
+        # Convert the coordinates to pixels, keeping the coordinates on the
+        # tile edge in the tile.
+        cols, rows = ~dataset.transform * (lons[idx], lats[idx])
+        rows = np.clip(np.floor(rows).astype(np.int64), 0, dataset.height - 1)
+        cols = np.clip(np.floor(cols).astype(np.int64), 0, dataset.width - 1)
+        
+        elevs[idx] = read_pixels(dataset, rows, cols)
+    
+    return elevs
 
 def get_elevation_data(lat, lon):
     """This function returns the elevation based on tif files located
@@ -33,193 +215,346 @@ def get_elevation_data(lat, lon):
          This is the elevation based on supplied coordinates.
     """
     
-    logging.info("Getting elevation data for the coordinate ({}, {}).".format(lat, lon))
+    logging.debug("Getting elevation data for the coordinate ({}, {}).".format(lat, lon))
     
-    # Initialising function variables
-    grid_lat = None
-    grid_lon = None
-    coord = (lon, lat)
-    config_data = get_config()["gis"]
-    elev_file_name = config_data["input_file_name"]
+    elev = get_elevation_batch([(lat, lon)])[0]
     
-    logging.info("Determining the appropriate tif file for the coordinate ({}, {}).".format(lat, lon))
+    logging.debug("Completed retrieving elevation data for the coordinate ({}, {}). Elevation value: {}.".format(lat, lon, elev))
     
-    # Determine location's latitude data from the image
-    # grid. Valid values are 1 and 2.
-    for key, value in config_data["latitude_condition"].items():
-        
-        if value["min_lat"] <= lat <= value["max_lat"]:
-             grid_lat = value["grid_lat"]
+    return elev
 
-    # Determine location's longitude data from the image
-    # grid. Valid values are A, B, C and D.
-    for key, value in config_data["longitude_condition"].items():
+def fetch_forecast(config_data, lat, lon, date_gen):
+    """This function retrieves the Dark Sky historical forecast of a
+    coordinate and date from the forecast_url in config.yaml.
+
+    Parameters
+    ----------
+    config_data : dict
+        The configuration data.
+    lat : float
+        The latitude of the location.
+    lon : float
+        The longitude of the location.
+    date_gen : datetime.datetime
+        The date of the historical forecast.
+
+    Returns
+    -------
+    forecast : dict
+        The forecast JSON data.
+    """
+    
+    # The API returns an error for microseconds.
+    url = config_data["gis"]["forecast_url"].format(api_key=config_data["forecastio_api_key"]
+                                                   ,lat=lat
+                                                   ,lon=lon
+                                                   ,time=date_gen.replace(microsecond=0).isoformat())
+    
+    return forecastio.manual(url).json
+
+def geocode_location(geolocator, loc):
+    """This function retrieves the geolocation data of a location.
+
+    Parameters
+    ----------
+    geolocator : geopy.geocoders.Nominatim
+        The geocoder.
+    loc : string
+        The location name including country e.g. 'Sydney, Australia'.
+
+    Returns
+    -------
+    loc_data : dict
+        The latitude, longitude and address of the location or None when
+        the location is not found.
+    """
+    
+    loc_data = geolocator.geocode(loc)
+    
+    if loc_data is None:
+        return None
+    
+    return {"latitude": loc_data.latitude
+           ,"longitude": loc_data.longitude
+           ,"address": loc_data.address}
+
+def get_historical_sample(config_data, engine, cache, loc, lat, lon, month, sample):
+    """This function retrieves one historical weather data sample of a
+    location for a random date of the month. Dates with missing weather data
+    are re-sampled. The dates are drawn from a random generator seeded with
+    the location, month and sample number, so the same requests are sent,
+    and found in the response cache, on every baseline generation.
+
+    Parameters
+    ----------
+    config_data : dict
+        The configuration data.
+    engine : FetchEngine
+        The fetch engine sending the requests.
+    cache : ResponseCache
+        The response cache of the forecasts.
+    loc : string
+        The location name including country e.g. 'Sydney, Australia'.
+    lat : float
+        The latitude of the location.
+    lon : float
+        The longitude of the location.
+    month : int
+        The month of the sample.
+    sample : int
+        The sample number of the month.
+
+    Returns
+    -------
+    sample : tuple
+        The date, minimum temperature, maximum temperature, humidity,
+        pressure and timezone of the sample.
+    """
+    
+    logging.debug("Retrieving {} weather data for month {}.".format(loc, month))
+    
+    temp_min = None
+    temp_max = None
+    humidity = None
+    pressure = None
+    sample_random = random.Random("{}|{}|{}".format(loc, month, sample))
+    
+    while temp_min is None or temp_max is None or humidity is None or pressure is None:
         
-        if value["min_lon"] <= lon <= value["max_lon"]:
-             grid_lon = value["grid_lon"]
+        year = sample_random.randint(config_data["gis"]["year_start"], config_data["gis"]["year_end"])
 
-    # Determine that there is a valid grid_lat and grid_lon data.
-    if grid_lat is None or grid_lon is None:
-        logging.error("Invalid coordinate ({}, {}). Please check the value!".format(lat, lon))
-        raise ValueError
+        _, last_day = calendar.monthrange(year, month)
 
-    grid_id = "".join([grid_lon, grid_lat])
-    file_name = elev_file_name.format(grid_id=grid_id)
+        datetime_start = datetime.datetime(year, month, 1)
+        datetime_end = datetime.datetime(year, month, last_day)
 
-    # Retrieve the elevation tif file path based on grid_id.
-    elev_file_path = get_file_path(folder_name="data"
-                                  ,subdirectory=config_data["input_subdirectory"]
-                                  ,file_name=file_name)
-                                  
-    logging.info("Retrieving elevation data for the coordinate ({}, {}) is in {} file.".format(lat, lon, file_name))
+        date_gen = datetime_start + datetime.timedelta(seconds=sample_random.randint(0, int((datetime_end - datetime_start).total_seconds())))
 
-    # Retrieve the elevation data found in elev_file_path.
-    with rio.open(elev_file_path) as file:
-        elevs = file.sample((coord, coord))
-        elev = next(elevs)[0]
+        forecast = cache.fetch(["forecast", lat, lon, date_gen.isoformat(), config_data["gis"]["forecast_url"]]
+                              ,engine.request, fetch_forecast, config_data, lat, lon, date_gen)
 
-    logging.info("Completed retrieving elevation data for the coordinate ({}, {}). Elevation value: {}.".format(lat, lon, elev))
+        historical_data = forecast["daily"]["data"][0]
+        
+        timezone = forecast.get("timezone", None)
+        temp_min =  historical_data.get("temperatureMin", None)
+        temp_max =  historical_data.get("temperatureMax", None)
+        humidity =  historical_data.get("humidity", None)
+        pressure =  historical_data.get("pressure", None)
     
-    return elev
+    return date_gen, temp_min, temp_max, humidity * 100, pressure, timezone
 
-def get_gis_historical_data():
-    """This function retrieves the baseline historical weather data
-    supplied in 'location key' of config.yaml. It uses Dark Sky API to
-    retrieve historical weather data such as temperature, humidity and
-    pressure.
+def get_baseline_file_path(config_data, file_name_key):
+    """This function returns the file path of a baseline data set.
+
+    Parameters
+    ----------
+    config_data : dict
+        The configuration data.
+    file_name_key : string
+        The 'gis' key of the baseline file name in config.yaml e.g.
+        'output_base_reference_file_name'.
+
+    Returns
+    -------
+    file_path : string
     """
-    logging.info("Generating baseline reference and historical weather data.")
     
-    # Initialising function variables
-    fake = Faker()
-    geolocator = Nominatim()
-    config_data = get_config()
-    locations = config_data["location"]
+    return get_file_path(folder_name="data"
+                        ,subdirectory=config_data["gis"]["output_subdirectory"]
+                        ,file_name=config_data["gis"][file_name_key])
+
+def check_duplicate_locations(locations):
+    """This function checks if there are no duplicate locations in the
+    config.yaml file.
+
+    Parameters
+    ----------
+    locations : list
+        The location names including country e.g. 'Sydney, Australia'.
+    """
     
-    # Check if there are no duplicate locations in the config.yaml file.
     if len(locations) != len(set(locations)):
         logging.error("Duplicate location found. Please check config.yaml file.")
         raise ValueError
+
+def build_gis_historical_data(locations, locations_data, elevations, samples_data):
+    """This function builds the baseline reference and historical data of the
+    retrieved location and weather data samples. The rows are collected in
+    columnar record buffers and the data frames are built once, so the build
+    time is linear in the number of samples.
+
+    Parameters
+    ----------
+    locations : list
+        The location names including country e.g. 'Sydney, Australia'.
+    locations_data : list
+        The geolocation data of each location with the latitude and longitude
+        keys.
+    elevations : list
+        The elevation of each location.
+    samples_data : list
+        The weather data samples returned by get_historical_sample, ordered by
+        location with the same number of samples for each location.
+
+    Returns
+    -------
+    df_ref : pandas.DataFrame
+        The baseline reference data.
+    df_hist : pandas.DataFrame
+        The baseline historical data.
+    """
     
-    # Initialise pandas dataframe column name for baseline reference
-    # and historical data.
-    df_ref = pd.DataFrame(columns=["Location", "Latitude"
+    # Initialise record buffers with the column names of the baseline
+    # reference and historical data.
+    ref_buffer = RecordBuffer(["Location", "Latitude"
                               ,"Longitude", "Elevation"
                               ,"Timezone"])
-    df_hist = pd.DataFrame(columns=["Location", "Date"
-                              ,"Month", "Temperature_Min"
-                              ,"Temperature_Max", "Humidity"
-                              ,"Pressure"])
+    hist_buffer = RecordBuffer(["Location", "Date"
+                               ,"Month", "Temperature_Min"
+                               ,"Temperature_Max", "Humidity"
+                               ,"Pressure"])
+    
+    # Number of weather data samples of each location.
+    location_samples = len(samples_data) // len(locations)
     
     # Generate weather data for each location.
-    for idx, loc in enumerate(locations):
-        
-        logging.info("Retrieving geolocation data for {}.".format(loc))
-        
-        # Retrieving geolocation data from geopy library.
-        loc_data = geolocator.geocode(loc)
-        
-        logging.info("Check if the location {} is valid.".format(loc))
-        if loc_data is None:
-            logging.error("Invalid location value supplied ({}). Please check config.yaml file.".format(loc))
-            raise ValueError
-        logging.info("The location {} is valid.".format(loc))
+    for idx, (loc, loc_data, elev) in enumerate(zip(locations, locations_data, elevations)):
         
         city = get_city(loc)
-        lat = loc_data.latitude
-        lon = loc_data.longitude
+        timezone = None
         
-        # Retrieving elevation data for the location.
-        elev = get_elevation_data(lat, lon)
+        for date_gen, temp_min, temp_max, humidity, pressure, timezone in samples_data[idx*location_samples:(idx+1)*location_samples]:
+            hist_buffer.append(city, date_gen
+                              ,date_gen.month, temp_min
+                              ,temp_max, humidity
+                              ,pressure)
         
-        for month in range(1, 13):
-            
-            logging.info("Retrieving {} weather data for month {}.".format(loc, month))
-            
-            for sample in range(config_data["gis"]["sampling_number"]):
-                
-                temp_min = None
-                temp_max = None
-                humidity = None
-                pressure = None
-                
-                while temp_min is None or temp_max is None or humidity is None or pressure is None:
-                    
-                    year = random.randint(config_data["gis"]["year_start"], config_data["gis"]["year_end"])
-
-                    _, last_day = calendar.monthrange(year, month)
-
-                    datetime_start = datetime.datetime(year, month, 1)
-                    datetime_end = datetime.datetime(year, month, last_day)
-
-                    date_gen = fake.date_time_between_dates(datetime_start=datetime_start
-                                                           ,datetime_end=datetime_end)
-
-                    forecast = forecastio.load_forecast(config_data["forecastio_api_key"]
-                                                       ,lat
-                                                       ,lon
-                                                       ,time=date_gen
-                                                       ,units="si")
-
-                    historical_data = forecast.json["daily"]["data"][0]
-                    
-                    timezone = forecast.json.get("timezone", None)
-                    temp_min =  historical_data.get("temperatureMin", None)
-                    temp_max =  historical_data.get("temperatureMax", None)
-                    humidity =  historical_data.get("humidity", None) * 100
-                    pressure =  historical_data.get("pressure", None)
-                    
-                df_temp_hist = pd.Series(dict(zip(df_hist.columns
-                                                 ,[city, date_gen
-                                                 ,date_gen.month, temp_min
-                                                 ,temp_max, humidity
-                                                 ,pressure])))
-                
-                df_hist = df_hist.append(df_temp_hist, ignore_index=True)
-        
-        df_temp_ref = pd.Series(dict(zip(df_ref.columns
-                                        ,[city, lat
-                                        ,lon, elev
-                                        ,timezone])))
-        df_ref = df_ref.append(df_temp_ref, ignore_index=True)
+        ref_buffer.append(city, loc_data["latitude"]
+                         ,loc_data["longitude"], elev
+                         ,timezone)
+    
+    df_ref = ref_buffer.to_frame()
+    df_hist = hist_buffer.to_frame()
     
     logging.info("Generating position to consolidate latitude, longitude and elevation data")
     df_pos = df_ref[["Latitude", "Longitude", "Elevation"]].round(2)
     df_pos["Elevation"] = df_pos["Elevation"].astype(int) 
     df_ref["Position"] = df_pos.astype(str).apply(lambda x: ",".join(x), axis=1)
     
+    return df_ref, df_hist
+
+def collect_gis_historical_data(config_data, locations):
+    """This function retrieves the baseline reference and historical weather
+    data of the locations. It uses Dark Sky API to retrieve historical weather
+    data such as temperature, humidity and pressure. The requests are sent
+    concurrently by the fetch engine configured in the 'gis.fetch' key of
+    config.yaml and the responses are cached in the response cache configured
+    in the 'gis.cache' key.
+
+    Parameters
+    ----------
+    config_data : dict
+        The configuration data.
+    locations : list
+        The location names including country e.g. 'Sydney, Australia'.
+
+    Returns
+    -------
+    df_ref : pandas.DataFrame
+        The baseline reference data.
+    df_hist : pandas.DataFrame
+        The baseline historical data.
+    """
+    
+    # Initialising function variables
+    geolocator = Nominatim(user_agent=config_data["gis"]["geocode_user_agent"]
+                          ,domain=config_data["gis"]["geocode_domain"]
+                          ,scheme=config_data["gis"]["geocode_scheme"])
+    engine = FetchEngine.from_config(config_data["gis"]["fetch"])
+    cache = ResponseCache.from_config(config_data["gis"]["cache"])
+    
+    logging.info("Retrieving geolocation data for {} location(s).".format(len(locations)))
+    # Retrieving geolocation data from geopy library.
+    locations_data = engine.map(lambda loc: cache.fetch(["geocode", loc, config_data["gis"]["geocode_domain"]]
+                                                       ,engine.request, geocode_location, geolocator, loc)
+                               ,locations)
+    
+    for loc, loc_data in zip(locations, locations_data):
+        
+        logging.debug("Check if the location {} is valid.".format(loc))
+        if loc_data is None:
+            logging.error("Invalid location value supplied ({}). Please check config.yaml file.".format(loc))
+            raise ValueError
+        logging.debug("The location {} is valid.".format(loc))
+    
+    # Retrieving weather data samples for each location and month.
+    samples = [(loc, loc_data, month, sample)
+               for loc, loc_data in zip(locations, locations_data)
+               for month in range(1, 13)
+               for sample in range(config_data["gis"]["sampling_number"])]
+    progress = ProgressLogger("Retrieving weather data samples", len(samples), unit="sample(s)")
+    
+    def fetch_sample(sample):
+        sample_data = get_historical_sample(config_data, engine, cache
+                                           ,sample[0], sample[1]["latitude"]
+                                           ,sample[1]["longitude"], sample[2], sample[3])
+        progress.update()
+        
+        return sample_data
+    
+    samples_data = engine.map(fetch_sample, samples)
+    
+    logging.info("Completed retrieving {} weather data sample(s) using {} request(s).".format(len(samples_data), engine.budget.used))
+    
+    cache.close()
+    
+    # Retrieving elevation data for each location.
+    elevations = get_elevation_batch([(loc_data["latitude"], loc_data["longitude"]) for loc_data in locations_data]
+                                    ,config_data["gis"]).tolist()
+    
+    return build_gis_historical_data(locations, locations_data, elevations, samples_data)
+
+def get_gis_historical_data():
+    """This function retrieves the baseline historical weather data
+    supplied in 'location key' of config.yaml and saves the baseline
+    reference and historical data.
+    """
+    logging.info("Generating baseline reference and historical weather data.")
+    
+    # Initialising function variables
+    config_data = get_config()
+    locations = config_data["location"]
+    
+    # Check if there are no duplicate locations in the config.yaml file.
+    check_duplicate_locations(locations)
+    
+    df_ref, df_hist = collect_gis_historical_data(config_data, locations)
+    
     logging.info("Saving baseline reference data.")
-    df_ref.to_csv(get_file_path(folder_name="data"
-                                ,subdirectory=config_data["gis"]["output_subdirectory"]
-                                ,file_name=config_data["gis"]["output_base_reference_file_name"])
-                 ,index=False)
+    df_ref.to_csv(get_baseline_file_path(config_data, "output_base_reference_file_name"), index=False)
     logging.info("Completed saving baseline reference data.")
 
     logging.info("Saving baseline historical data.")
-    df_hist.to_csv(get_file_path(folder_name="data"
-                                ,subdirectory=config_data["gis"]["output_subdirectory"]
-                                ,file_name=config_data["gis"]["output_base_historical_file_name"])
-                  ,index=False)
+    df_hist.to_csv(get_baseline_file_path(config_data, "output_base_historical_file_name"), index=False)
     logging.info("Completed saving baseline historical data.")
 
-def aggregate_gis_historical_data():
-    """This function aggregates baseline historical data by location and month
+def aggregate_historical_data(df):
+    """This function aggregates historical data by location and month
     for the weather parameters:
     - Temperature: Mean for minimum and maximum temperature
     - Humidity: Minimum and maximum humidity
     - Pressure: Minimum and maximum pressure
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        The baseline historical data.
+
+    Returns
+    -------
+    df_aggregate : pandas.DataFrame
+        The baseline aggregate data.
     """
-    
-    logging.info("Processing historical weather data aggregation.")
-    
-    # Initialising function variables
-    config_data = get_config()
-    
-    # Initialise pandas dataframe column name for baseline reference
-    # and historical data.
-    hist_file_path = get_file_path(folder_name="data"
-                                  ,subdirectory=config_data["gis"]["output_subdirectory"]
-                                  ,file_name=config_data["gis"]["output_base_historical_file_name"])
 
     # Define group by columns.
     group_by_cols = ["Location", "Month"]
@@ -229,17 +564,10 @@ def aggregate_gis_historical_data():
                      ,"Temperature_Max": "mean"
                      ,"Humidity": ["min", "max"]
                      ,"Pressure": ["min", "max"]}
-
-    logging.info("Reading historical weather data.")
-    
-    # Read baseline historical data.
-    df = pd.read_csv(hist_file_path)
-    
-    logging.info("Completed reading historical weather data.")
     
     logging.info("Aggregating historical weather data.")
     df_aggregate = df.groupby(group_by_cols, as_index=False).aggregate(aggregate_cols)
-    df_aggregate.columns = ["".join(name) for name in df_aggregate.columns.ravel()]
+    df_aggregate.columns = ["".join(name) for name in df_aggregate.columns]
     df_aggregate.rename(columns={"Temperature_Minmean": "T_avg_min"
                                 ,"Temperature_Maxmean": "T_avg_max"
                                 ,"Humiditymin": "H_min"
@@ -251,16 +579,143 @@ def aggregate_gis_historical_data():
     df_aggregate ["H_range"] = df_aggregate ["H_max"] - df_aggregate ["H_min"]
     df_aggregate ["P_range"] = df_aggregate ["P_max"] - df_aggregate ["P_min"]
 
-    logging.info("Saving baseline aggregate data.")
-    df_aggregate.to_csv(get_file_path(folder_name="data"
-                                 ,subdirectory=config_data["gis"]["output_subdirectory"]
-                                 ,file_name=config_data["gis"]["output_base_aggregate_file_name"])
-                       ,index=False)
-    logging.info("Completed saving baseline aggregate data.")
+    logging.info("Fitting the multivariate normal weather model.")
+    df_model = fit_weather_model(df)
+    df_aggregate = df_aggregate.merge(df_model, on=group_by_cols, how="left")
 
+    return df_aggregate
 
+def fit_weather_model(df):
+    """This function fits the mean and covariance of the temperature, pressure
+    and humidity of historical data by location and month for the
+    multivariate normal weather model. The temperature of a sample is the
+    mean of its minimum and maximum temperature, and the mean variance of a
+    temperature taken uniformly between them is the temperature variance
+    within the day. The covariance of a location and month with one sample
+    is 0.
 
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        The baseline historical data.
+
+    Returns
+    -------
+    df_model : pandas.DataFrame
+        The T_mean, P_mean, H_mean, T_var, P_var, H_var, TP_cov, TH_cov,
+        PH_cov and T_day_var of each location and month.
+    """
+
+    # Initialising the daily variables and their products.
+    df_daily = pd.DataFrame({"Location": df["Location"]
+                            ,"Month": df["Month"]
+                            ,"T": (df["Temperature_Min"] + df["Temperature_Max"]) / 2
+                            ,"P": df["Pressure"]
+                            ,"H": df["Humidity"]
+                            ,"T_day_var": (df["Temperature_Max"] - df["Temperature_Min"]) ** 2 / 12})
+    pairs = [("T", "T"), ("P", "P"), ("H", "H"), ("T", "P"), ("T", "H"), ("P", "H")]
+    df_group = df_daily.groupby(["Location", "Month"])
+
+    # Calculating the products of the deviations from the mean.
+    for first, second in pairs:
+        df_daily[first + second] = ((df_daily[first] - df_group[first].transform("mean"))
+                                   *(df_daily[second] - df_group[second].transform("mean")))
 
+    df_group = df_daily.groupby(["Location", "Month"], as_index=False)
+    df_mean = df_group.mean()
+    count = df_group.size()["size"].values
+    correction = np.where(count>1, count / np.maximum(count - 1, 1), 0)
 
+    # Calculating the sample covariance from the mean of the products.
+    df_model = df_mean[["Location", "Month"]].copy()
 
+    for variable in ("T", "P", "H"):
+        df_model[variable + "_mean"] = df_mean[variable]
 
+    for first, second in pairs:
+        name = first + "_var" if first==second else first + second + "_cov"
+        df_model[name] = df_mean[first + second] * correction
+
+    df_model["T_day_var"] = df_mean["T_day_var"]
+
+    return df_model
+
+def aggregate_gis_historical_data():
+    """This function aggregates the baseline historical data by location and
+    month and saves the baseline aggregate data.
+    """
+    
+    logging.info("Processing historical weather data aggregation.")
+    
+    # Initialising function variables
+    config_data = get_config()
+
+    logging.info("Reading historical weather data.")
+    
+    # Read baseline historical data.
+    df = pd.read_csv(get_baseline_file_path(config_data, "output_base_historical_file_name"))
+    
+    logging.info("Completed reading historical weather data.")
+    
+    df_aggregate = aggregate_historical_data(df)
+
+    logging.info("Saving baseline aggregate data.")
+    df_aggregate.to_csv(get_baseline_file_path(config_data, "output_base_aggregate_file_name"), index=False)
+    logging.info("Completed saving baseline aggregate data.")
+
+def update_gis_historical_data():
+    """This function updates the baseline data sets with the locations added
+    to or removed from the 'location' key of config.yaml. Only the added
+    locations are retrieved and aggregated, the removed locations are dropped
+    and the three baseline data sets are rewritten. Without existing baseline
+    data sets, every location is retrieved.
+    """
+    
+    logging.info("Updating baseline data sets with the config.yaml locations.")
+    
+    # Initialising function variables
+    config_data = get_config()
+    locations = config_data["location"]
+    file_name_keys = ["output_base_reference_file_name"
+                     ,"output_base_historical_file_name"
+                     ,"output_base_aggregate_file_name"]
+    
+    # Check if there are no duplicate locations in the config.yaml file.
+    check_duplicate_locations(locations)
+    
+    # Generate every location without existing baseline data sets.
+    if not all(os.path.exists(get_baseline_file_path(config_data, key)) for key in file_name_keys):
+        logging.info("Baseline data sets do not exist. Generating baseline data for every location.")
+        get_gis_historical_data()
+        aggregate_gis_historical_data()
+        return
+    
+    # Read the existing baseline data sets.
+    df_ref, df_hist, df_aggregate = [pd.read_csv(get_baseline_file_path(config_data, key)) for key in file_name_keys]
+    
+    # Determine the added and removed locations.
+    cities = set(get_city(loc) for loc in locations)
+    added_locations = [loc for loc in locations if get_city(loc) not in set(df_ref["Location"])]
+    removed_cities = set(df_ref["Location"]).difference(cities)
+    
+    logging.info("Adding {} location(s): {}. Removing {} location(s): {}.".format(len(added_locations), added_locations
+                                                                                 ,len(removed_cities), sorted(removed_cities)))
+    
+    # Drop the removed locations.
+    df_ref, df_hist, df_aggregate = [df[~df["Location"].isin(removed_cities)] for df in (df_ref, df_hist, df_aggregate)]
+    
+    # Retrieve and aggregate the added locations.
+    if added_locations:
+        df_ref_added, df_hist_added = collect_gis_historical_data(config_data, added_locations)
+        df_aggregate_added = aggregate_historical_data(df_hist_added)
+        
+        df_ref = pd.concat([df_ref, df_ref_added], ignore_index=True)
+        df_hist = pd.concat([df_hist, df_hist_added], ignore_index=True)
+        df_aggregate = pd.concat([df_aggregate, df_aggregate_added], ignore_index=True)
+    
+    logging.info("Saving updated baseline data sets.")
+    
+    for df, key in zip((df_ref, df_hist, df_aggregate), file_name_keys):
+        df.to_csv(get_baseline_file_path(config_data, key), index=False)
+    
+    logging.info("Completed updating baseline data sets.")
@@ -0,0 +1,212 @@
+# Standard Python Library
+import functools
+import numpy as np
+import pandas as pd
+
+def format_signed_decimal(values):
+    """This function formats the values as one decimal place text with a '+'
+    sign for positive values e.g. '+9.2', '0.0' and '-5.3'. The distinct
+    values are formatted once in a lookup table and gathered for each row.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        The float values to be formatted.
+
+    Returns
+    -------
+    text : numpy.ndarray
+        The formatted values with object dtype.
+    """
+
+    # Initialising function variables
+    values = np.round(np.asarray(values, dtype=float), 1)
+    tenths = np.rint(values * 10).astype(np.int64)
+
+    if len(tenths)==0:
+        return np.empty(0, dtype=object)
+
+    # Determine the distinct values to be formatted. A dense range is used
+    # unless the values are sparse compared to the number of rows.
+    tenth_min = tenths.min()
+    tenth_max = tenths.max()
+
+    if tenth_max - tenth_min <= len(tenths):
+        table_tenths = np.arange(tenth_min, tenth_max + 1)
+        table_idx = tenths - tenth_min
+    else:
+        table_tenths, table_idx = np.unique(tenths, return_inverse=True)
+
+    # Formatting the lookup table and gathering the text of each row.
+    table = np.array(["%+.1f" % value if value>0 else "%.1f" % value for value in (table_tenths / 10).tolist()], dtype=object)
+    text = table[table_idx]
+
+    # Negative values rounded to zero keep their sign e.g. '-0.0'.
+    negative_zero = (tenths==0) & np.signbit(values)
+    text[negative_zero] = "-0.0"
+
+    return text
+
+def format_distinct_values(values):
+    """This function formats the values as text. Each distinct value is
+    formatted once and gathered for each row, which is faster than formatting
+    every row when the values are rounded or integers.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        The numeric values to be formatted.
+
+    Returns
+    -------
+    text : numpy.ndarray
+        The formatted values with object dtype.
+    """
+
+    table_values, table_idx = np.unique(values, return_inverse=True)
+    table = np.array([str(value) for value in table_values.tolist()], dtype=object)
+
+    return table[table_idx]
+
+def format_categorical(values):
+    """This function decodes categorical values to text by gathering the
+    category of each code.
+
+    Parameters
+    ----------
+    values : pandas.Categorical
+        The categorical values to be decoded.
+
+    Returns
+    -------
+    text : numpy.ndarray
+        The decoded values with object dtype.
+    """
+
+    return np.asarray(values.categories, dtype=object)[values.codes]
+
+@functools.lru_cache(maxsize=2)
+def get_time_of_day_table(suffix="Z"):
+    """This function returns the ISO8601 text of every second of the day
+    e.g. '07:20:51Z', indexed by the seconds since midnight.
+
+    Parameters
+    ----------
+    suffix : string, default is 'Z'
+        The text appended to each time.
+
+    Returns
+    -------
+    table : numpy.ndarray
+        The formatted times with object dtype.
+    """
+
+    seconds = np.arange(86400)
+
+    return np.array(["%02d:%02d:%02d%s" % (value + (suffix,)) for value in zip((seconds // 3600).tolist()
+                                                                ,(seconds // 60 % 60).tolist()
+                                                                ,(seconds % 60).tolist())], dtype=object)
+
+def format_utc_offset(offset):
+    """This function formats a UTC offset in seconds as ISO8601 text e.g.
+    '+11:00' and '-03:30'.
+
+    Parameters
+    ----------
+    offset : int
+        The UTC offset in seconds.
+
+    Returns
+    -------
+    text : string
+    """
+
+    return "%s%02d:%02d" % ("+" if offset>=0 else "-", abs(offset) // 3600, abs(offset) // 60 % 60)
+
+def format_timestamp(values, utc_offsets=None):
+    """This function formats int64 epoch seconds as ISO8601 text in UTC
+    e.g. '2011-01-23T07:20:51Z', or in local time with the UTC offset of each
+    value e.g. '2011-01-23T18:20:51+11:00'. The distinct days are formatted
+    once in a lookup table and joined with the time of day looked up in a
+    table of every second of the day.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        The epoch seconds to be formatted.
+    utc_offsets : numpy.ndarray, default is None
+        The UTC offset in seconds of each value. None formats in UTC.
+
+    Returns
+    -------
+    text : numpy.ndarray
+        The formatted values with object dtype.
+    """
+
+    # Initialising function variables
+    values = np.asarray(values, dtype=np.int64)
+
+    if utc_offsets is not None:
+        values = values + np.asarray(utc_offsets, dtype=np.int64)
+
+    days, seconds = np.divmod(values, 86400)
+
+    if len(days)==0:
+        return np.empty(0, dtype=object)
+
+    # Determine the distinct days to be formatted. A dense range is used
+    # unless the days are sparse compared to the number of rows.
+    day_min = days.min()
+    day_max = days.max()
+
+    if day_max - day_min <= len(days):
+        table_days = np.arange(day_min, day_max + 1)
+        table_idx = days - day_min
+    else:
+        table_days, table_idx = np.unique(days, return_inverse=True)
+
+    # Formatting the lookup table and gathering the text of each row.
+    table = np.datetime_as_string(table_days.astype("datetime64[D]"), unit="D").astype(object) + "T"
+
+    if utc_offsets is None:
+        return table[table_idx] + get_time_of_day_table()[seconds]
+
+    # Formatting the distinct UTC offsets once.
+    offset_values, offset_idx = np.unique(utc_offsets, return_inverse=True)
+    offset_table = np.array([format_utc_offset(offset) for offset in offset_values.tolist()], dtype=object)
+
+    return table[table_idx] + get_time_of_day_table(suffix="")[seconds] + offset_table[offset_idx]
+
+def format_output_data(output_data):
+    """This function formats the compact columns of output_data as text for
+    serialisation: the categorical columns e.g. the location, the epoch
+    timestamp e.g. '2011-01-23T07:20:51Z', or '2011-01-23T18:20:51+11:00'
+    with a 'UTC Offset' column, and the temperature with a sign e.g. '+9.2'.
+
+    Parameters
+    ----------
+    output_data : pandas.DataFrame
+        The simulated weather data.
+
+    Returns
+    -------
+    formatted_data : pandas.DataFrame
+    """
+
+    formatted_cols = {}
+
+    # Decoding the categorical columns e.g. location and conditions.
+    for col in output_data.columns:
+        if pd.api.types.is_categorical_dtype(output_data[col].dtype):
+            formatted_cols[col] = format_categorical(output_data[col].values)
+
+    # Formatting the epoch timestamp in ISO8601 format, in local time when
+    # the UTC offset of each timestamp is generated.
+    if "Local Time" in output_data and pd.api.types.is_integer_dtype(output_data["Local Time"].dtype):
+        formatted_cols["Local Time"] = format_timestamp(output_data["Local Time"].values
+                                                       ,output_data["UTC Offset"].values if "UTC Offset" in output_data else None)
+
+    # Formatting temperature data with a sign e.g. '+9.2'.
+    formatted_cols["Temperature"] = format_signed_decimal(output_data["Temperature"].values)
+
+    return output_data.assign(**formatted_cols)
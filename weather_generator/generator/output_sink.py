@@ -0,0 +1,482 @@
+# Standard Python Library
+import abc
+import io
+import logging.config
+import os
+import queue
+import socket
+import stat
+import sys
+import threading
+
+# Custom Python Library
+from common.config import LoggingConfig
+
+# Load logging.yaml file
+LoggingConfig.configure()
+
+# Maximum number of seconds an aborted sink waits for the batch being
+# written, which blocks while the consumer is not reading.
+ABORT_TIMEOUT = 5.0
+
+class OutputSink(io.RawIOBase):
+    """This class is the abstract binary output stream of the output writers,
+    which writes the data in batches on a background thread. The batches are
+    passed through a queue of at most buffer_size batches, so a slow consumer
+    blocks the writes, and in turn the generation, instead of growing the
+    memory used. The subclasses open the consumer end and write the batches
+    to it.
+    """
+
+    # Background writer thread, None until the sink is initialised.
+    __thread = None
+
+    def __new__(cls, *args, **kwargs):
+
+        # The io base classes do not check the abstract methods, so a sink
+        # missing them is rejected here before it opens its consumer end.
+        if cls.__abstractmethods__:
+            raise TypeError("Can't instantiate abstract class {} with abstract methods {}".format(cls.__name__, ", ".join(sorted(cls.__abstractmethods__))))
+
+        return super().__new__(cls)
+
+    def __init__(self, buffer_size=4, batch_size=1048576):
+        """
+        Parameters
+        ----------
+        buffer_size : int, default is 4
+            The maximum number of batches waiting to be written.
+        batch_size : int, default is 1048576
+            The number of bytes of a batch. The small writes are joined and
+            the large writes split into batches of batch_size bytes.
+        """
+
+        # Determine that the buffer and batch sizes are more than 0.
+        if buffer_size<1 or batch_size<1:
+            logging.error("The output sink buffer size or batch size is less than 1. Values: {}, {}.".format(buffer_size, batch_size))
+            raise ValueError
+
+        super().__init__()
+
+        self.batch_size = batch_size
+        self.bytes_written = 0
+        self.error = None
+        self.__error_raised = False
+        self.__aborted = False
+        self.__pending = bytearray()
+        self.__queue = queue.Queue(maxsize=buffer_size)
+        self.__thread = threading.Thread(target=self.__run, name=type(self).__name__, daemon=True)
+        self.__thread.start()
+
+    def __run(self):
+        """This function writes the batches of the queue until the end of the
+        output. After a failed write or an abort, the batches are discarded
+        so the writes do not block, and an aborted consumer end is closed
+        here as the batch write may still use it.
+        """
+
+        while True:
+            batch = self.__queue.get()
+
+            if batch is None:
+                break
+
+            if self.error is None and not self.__aborted:
+                try:
+                    self.write_batch(batch)
+                except Exception as error:
+                    self.error = error
+
+        if self.__aborted:
+            try:
+                self.abort_target()
+            except OSError as error:
+                logging.warning("Failed closing the aborted {}. Error: {}.".format(type(self).__name__, error))
+
+    def __check_error(self):
+        """This function raises the error of a failed batch write once.
+        """
+
+        if self.error is not None and not self.__error_raised:
+            self.__error_raised = True
+            logging.error("Failed writing the output data to the {}. Error: {}.".format(type(self).__name__, self.error))
+            raise self.error
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        """This function queues the data to be written, waiting while the
+        queue is full.
+
+        Parameters
+        ----------
+        data : bytes-like object
+            The data to be written.
+
+        Returns
+        -------
+        size : int
+            The number of bytes queued.
+        """
+
+        # The writes of an aborted output are discarded, e.g. the footer
+        # written when a Parquet writer is deleted.
+        if self.__aborted:
+            return memoryview(data).nbytes
+
+        self._checkClosed()
+        self.__check_error()
+
+        # The bytes objects are immutable, the other buffers are copied as
+        # the caller can reuse them.
+        copy = not isinstance(data, bytes)
+        data = memoryview(data).cast("B")
+        size = len(data)
+
+        # Small writes, e.g. the header or the Parquet pages, are joined in
+        # a batch.
+        if len(self.__pending) + size < self.batch_size:
+            self.__pending += data
+        else:
+            self.flush()
+
+            for start in range(0, size, self.batch_size):
+                batch = data[start:start + self.batch_size]
+                self.__queue.put(batch.tobytes() if copy else batch)
+
+        self.bytes_written += size
+
+        return size
+
+    def flush(self):
+        """This function queues the joined small writes.
+        """
+
+        if len(self.__pending)>0:
+            self.__queue.put(bytes(self.__pending))
+            self.__pending = bytearray()
+
+    def tell(self):
+        return self.bytes_written
+
+    def close(self):
+        """This function waits for the queued batches to be written and
+        closes the consumer end.
+        """
+
+        if self.closed:
+            return
+
+        # Closing a sink which failed to initialise e.g. on deletion.
+        if self.__thread is None:
+            super().close()
+            return
+
+        self.flush()
+        self.__queue.put(None)
+        self.__thread.join()
+        super().close()
+        self.close_target()
+        self.__check_error()
+
+    def abort(self):
+        """This function discards the queued batches and closes the consumer
+        end without completing the output, e.g. when the generation fails,
+        so an incomplete output is not mistaken for a complete one.
+        """
+
+        if self.closed:
+            return
+
+        if self.__thread is None:
+            super().close()
+            return
+
+        self.__aborted = True
+        self.__pending = bytearray()
+
+        # Emptying the queue, so the end of the output is queued without
+        # waiting for the consumer.
+        try:
+            while True:
+                self.__queue.get_nowait()
+        except queue.Empty:
+            pass
+
+        self.__queue.put(None)
+        self.__thread.join(ABORT_TIMEOUT)
+        super().close()
+
+        logging.warning("Aborted writing the output data to the {} after {} byte(s).".format(type(self).__name__, self.bytes_written))
+
+    @abc.abstractmethod
+    def write_batch(self, batch):
+        """This function writes a batch to the consumer end. It is run on
+        the background thread.
+
+        Parameters
+        ----------
+        batch : bytes-like object
+            The batch to be written.
+        """
+
+    @abc.abstractmethod
+    def close_target(self):
+        """This function closes the consumer end.
+        """
+
+    def abort_target(self):
+        """This function closes the consumer end of an aborted output. It is
+        run on the background thread.
+        """
+
+        self.close_target()
+
+class FileSink(OutputSink):
+    """This class writes the output data to a file.
+    """
+
+    def __init__(self, file_path, **kwargs):
+        """
+        Parameters
+        ----------
+        file_path : string
+            The output file path.
+        """
+
+        self.name = file_path
+        self.file = open(file_path, "wb", buffering=0)
+
+        super().__init__(**kwargs)
+
+    def write_batch(self, batch):
+        self.file.write(batch)
+
+    def close_target(self):
+        self.file.close()
+
+    def abort_target(self):
+        # Removing the incomplete output file.
+        self.file.close()
+        os.remove(self.name)
+
+class StdoutSink(OutputSink):
+    """This class writes the output data to the standard output, e.g. to be
+    piped to the consumer.
+    """
+
+    def __init__(self, **kwargs):
+
+        self.name = "standard output"
+        self.file = sys.stdout.buffer
+
+        super().__init__(**kwargs)
+
+    def write_batch(self, batch):
+        self.file.write(batch)
+
+    def close_target(self):
+        self.file.flush()
+
+class FifoSink(FileSink):
+    """This class writes the output data to a named pipe, which is created
+    when it does not exist. Opening the named pipe waits for the consumer to
+    open it for reading.
+    """
+
+    def __init__(self, file_path, **kwargs):
+        """
+        Parameters
+        ----------
+        file_path : string
+            The named pipe path.
+        """
+
+        # Determine that the named pipes are supported.
+        if not hasattr(os, "mkfifo"):
+            logging.error("Named pipes are not supported on this platform.")
+            raise ValueError
+
+        if not os.path.exists(file_path):
+            os.mkfifo(file_path)
+
+        # Determine that the path is a named pipe.
+        if not stat.S_ISFIFO(os.stat(file_path).st_mode):
+            logging.error("The output sink path is not a named pipe ({}).".format(file_path))
+            raise ValueError
+
+        logging.info("Waiting for the consumer to open the named pipe {}.".format(file_path))
+
+        super().__init__(file_path, **kwargs)
+
+    def abort_target(self):
+        # The named pipe is kept for the consumer.
+        self.close_target()
+
+class UnixSocketSink(OutputSink):
+    """This class writes the output data to the consumer listening on a Unix
+    domain stream socket.
+    """
+
+    def __init__(self, file_path, **kwargs):
+        """
+        Parameters
+        ----------
+        file_path : string
+            The socket path.
+        """
+
+        # Determine that the Unix domain sockets are supported.
+        if not hasattr(socket, "AF_UNIX"):
+            logging.error("Unix domain sockets are not supported on this platform.")
+            raise ValueError
+
+        self.name = file_path
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+
+        try:
+            self.socket.connect(file_path)
+        except OSError:
+            self.socket.close()
+            logging.error("Failed connecting to the Unix domain socket {}.".format(file_path))
+            raise
+
+        super().__init__(**kwargs)
+
+    def write_batch(self, batch):
+        self.socket.sendall(batch)
+
+    def close_target(self):
+        # Signalling the end of the output data to the consumer.
+        try:
+            self.socket.shutdown(socket.SHUT_WR)
+        except OSError:
+            pass
+
+        self.socket.close()
+
+class BufferSink(io.RawIOBase):
+    """This class keeps the output data in memory until it is taken, e.g. to
+    be sent in the chunks of a streamed response.
+    """
+
+    def __init__(self):
+
+        super().__init__()
+
+        self.name = "memory"
+        self.bytes_written = 0
+        self.__buffers = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        """This function keeps a copy of the data.
+
+        Parameters
+        ----------
+        data : bytes-like object
+            The data to be written.
+
+        Returns
+        -------
+        size : int
+            The number of bytes written.
+        """
+
+        data = bytes(data)
+        self.__buffers.append(data)
+        self.bytes_written += len(data)
+
+        return len(data)
+
+    def tell(self):
+        return self.bytes_written
+
+    def take(self):
+        """This function returns the data written since the last call and
+        clears it.
+
+        Returns
+        -------
+        data : bytes
+        """
+
+        data = b"".join(self.__buffers)
+        self.__buffers = []
+
+        return data
+
+# Valid output sinks.
+OUTPUT_SINKS = {"file": FileSink
+               ,"stdout": StdoutSink
+               ,"fifo": FifoSink
+               ,"socket": UnixSocketSink}
+
+def get_output_sink_name(config_data, sink_name=None):
+    """This function returns the output sink name selected in config.yaml or
+    the sink_name override.
+
+    Parameters
+    ----------
+    config_data : dict
+        The configuration data.
+    sink_name : string, default is None
+        The output sink name overriding the output_sink in config.yaml.
+
+    Returns
+    -------
+    sink_name : string
+    """
+
+    if sink_name is None:
+        sink_name = config_data["simulation"].get("output_sink", "file")
+
+    if sink_name not in OUTPUT_SINKS:
+        logging.error("Invalid output sink ({}). Please check config.yaml file.".format(sink_name))
+        raise ValueError
+
+    return sink_name
+
+def open_output_sink(config_data, file_path, sink_name=None, sink_path=None):
+    """This function opens the output sink selected in config.yaml.
+
+    Parameters
+    ----------
+    config_data : dict
+        The configuration data.
+    file_path : string
+        The output data file path of the file sink.
+    sink_name : string, default is None
+        The output sink name overriding the output_sink in config.yaml.
+    sink_path : string, default is None
+        The named pipe or socket path overriding the output_sink_path in
+        config.yaml, or the file path of the file sink.
+
+    Returns
+    -------
+    sink : OutputSink
+    """
+
+    # Initialising function variables
+    sink_name = get_output_sink_name(config_data, sink_name)
+    sink_options = {"buffer_size": config_data["simulation"].get("output_sink_buffer", 4)
+                   ,"batch_size": config_data["simulation"].get("output_sink_batch_size", 1048576)}
+
+    if sink_path is None:
+        sink_path = config_data["simulation"].get("output_sink_path")
+
+    if sink_name=="stdout":
+        return StdoutSink(**sink_options)
+
+    if sink_name=="file":
+        return FileSink(sink_path or file_path, **sink_options)
+
+    # Determine that the named pipe or socket path is supplied.
+    if sink_path is None:
+        logging.error("The output sink path of the {} output sink is not supplied. Please check config.yaml file.".format(sink_name))
+        raise ValueError
+
+    return OUTPUT_SINKS[sink_name](sink_path, **sink_options)
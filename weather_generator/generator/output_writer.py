@@ -0,0 +1,443 @@
+# Standard Python Library
+import gzip
+import logging.config
+import os
+import pandas as pd
+
+# Custom Python Library
+from common.config import LoggingConfig
+from common.utils import get_city
+from generator.output_formatter import format_distinct_values, format_output_data
+
+# Load logging.yaml file
+LoggingConfig.configure()
+
+# Buffer size of the output file stream.
+BUFFER_SIZE = 8 * 1024 * 1024
+
+# File name extension of each output compression.
+COMPRESSION_EXTENSIONS = {"none": ""
+                         ,"gzip": ".gz"
+                         ,"zstd": ".zst"}
+
+# File name extension of each columnar output format.
+FORMAT_EXTENSIONS = {"parquet": ".parquet"
+                    ,"arrow": ".arrow"}
+
+def import_pyarrow():
+    """This function imports the pyarrow library used by the columnar output
+    formats.
+
+    Returns
+    -------
+    pa : module
+    """
+
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet
+        import pyarrow.ipc
+    except ImportError:
+        logging.error("The pyarrow library is required for the parquet and arrow output formats.")
+        raise
+
+    return pa
+
+def compress_stream(stream, compression="none"):
+    """This function wraps the binary output stream with the optional
+    compression. Closing the returned stream closes the output stream.
+
+    Parameters
+    ----------
+    stream : file object
+        The binary output stream.
+    compression : string, default is 'none'
+        The output compression. Valid values are none, gzip and zstd.
+
+    Returns
+    -------
+    stream : file object
+    """
+
+    if compression=="none":
+        return stream
+
+    elif compression=="gzip":
+        compressed_stream = gzip.GzipFile(fileobj=stream, mode="wb", compresslevel=6)
+
+        # The gzip stream only closes the file objects it opened itself.
+        compressed_stream.myfileobj = stream
+
+        return compressed_stream
+
+    elif compression=="zstd":
+        try:
+            import zstandard
+        except ImportError:
+            logging.error("The zstandard library is required for zstd output compression.")
+            raise
+
+        return zstandard.ZstdCompressor().stream_writer(stream)
+
+    logging.error("Invalid output compression ({}). Please check config.yaml file.".format(compression))
+    raise ValueError
+
+def open_output_stream(file_path, compression="none"):
+    """This function opens the binary output file stream with the optional
+    compression.
+
+    Parameters
+    ----------
+    file_path : string
+        The output file path.
+    compression : string, default is 'none'
+        The output compression. Valid values are none, gzip and zstd.
+
+    Returns
+    -------
+    stream : file object
+    """
+
+    # Determine that the compression is valid before creating the file.
+    if compression not in COMPRESSION_EXTENSIONS:
+        logging.error("Invalid output compression ({}). Please check config.yaml file.".format(compression))
+        raise ValueError
+
+    return compress_stream(open(file_path, "wb", buffering=BUFFER_SIZE), compression)
+
+class PandasCsvWriter(object):
+    """This class writes the simulated weather data in the output csv format
+    using DataFrame.to_csv.
+    """
+
+    def __init__(self, config_data, stream=None):
+        """
+        Parameters
+        ----------
+        config_data : dict
+            The configuration data.
+        stream : file object, default is None
+            The binary output stream. Without a stream, the writer can only
+            encode the data.
+        """
+
+        self.stream = stream
+        self.delimiter = config_data["simulation"]["output_delimiter"]
+        self.output_cols = config_data["simulation"]["output_columns"]
+
+        # Writing the header once at the start of the output.
+        if stream is not None and config_data["simulation"]["output_header"]:
+            self.stream.write((self.delimiter.join(self.output_cols) + os.linesep).encode("utf-8"))
+
+    def encode(self, output_data):
+        """This function serialises the simulated weather data.
+
+        Parameters
+        ----------
+        output_data : pandas.DataFrame
+            The simulated weather data.
+
+        Returns
+        -------
+        data : bytes
+        """
+
+        return format_output_data(output_data)[self.output_cols].to_csv(None
+                                                                        ,sep=self.delimiter
+                                                                        ,header=False
+                                                                        ,index=False).encode("utf-8")
+
+    def write_encoded(self, data):
+        """This function writes the serialised simulated weather data.
+
+        Parameters
+        ----------
+        data : bytes
+            The data returned by the encode method.
+        """
+
+        self.stream.write(data)
+
+    def write(self, output_data):
+        """This function serialises and writes the simulated weather data.
+
+        Parameters
+        ----------
+        output_data : pandas.DataFrame
+            The simulated weather data.
+        """
+
+        self.write_encoded(self.encode(output_data))
+
+    def close(self):
+        """This function flushes and closes the output stream.
+        """
+
+        self.stream.close()
+
+class FastCsvWriter(PandasCsvWriter):
+    """This class writes the simulated weather data in the output csv format
+    by converting each column to text once and joining the rows in a single
+    block, which is several times faster than DataFrame.to_csv for the fixed
+    output layout.
+    """
+
+    def encode(self, output_data):
+        """This function serialises the simulated weather data.
+
+        Parameters
+        ----------
+        output_data : pandas.DataFrame
+            The simulated weather data.
+
+        Returns
+        -------
+        data : bytes
+        """
+
+        if len(output_data)==0:
+            return b""
+
+        formatted_data = format_output_data(output_data)
+
+        # Converting each column to a list of text.
+        columns = []
+
+        for col in self.output_cols:
+            values = formatted_data[col].values
+
+            if values.dtype!=object:
+                values = format_distinct_values(values)
+
+            columns.append(values.tolist())
+
+        # Joining the columns and rows in a single block.
+        rows = map(self.delimiter.join, zip(*columns))
+
+        return (os.linesep.join(rows) + os.linesep).encode("utf-8")
+
+class ParquetWriter(object):
+    """This class writes the simulated weather data in the Parquet format with
+    typed columns. The chunks are buffered until a full row group of
+    output_row_group_size data points can be written.
+    """
+
+    def __init__(self, config_data, stream=None):
+        """
+        Parameters
+        ----------
+        config_data : dict
+            The configuration data.
+        stream : file object, default is None
+            The binary output stream. Without a stream, the writer can only
+            encode the data.
+        """
+
+        self.pa = import_pyarrow()
+        self.stream = stream
+        self.output_cols = config_data["simulation"]["output_columns"]
+        self.compression = config_data["simulation"].get("output_compression", "none")
+        self.row_group_size = config_data["simulation"].get("output_row_group_size", 1000000)
+        self.locations = [get_city(loc) for loc in config_data["location"]]
+        self.conditions = config_data["simulation"]["condition"]
+        self.schema = self.__get_schema()
+        self.writer = None
+        self.__pending_tables = []
+        self.__pending_rows = 0
+
+        if stream is not None:
+            self.writer = self.open_writer()
+
+    def __get_schema(self):
+        """This function returns the arrow schema of the output columns.
+
+        Returns
+        -------
+        schema : pyarrow.Schema
+        """
+
+        field_types = {"Location": self.pa.dictionary(self.pa.int8(), self.pa.string())
+                      ,"Position": self.pa.string()
+                      ,"Local Time": self.pa.timestamp("s", tz="UTC")
+                      ,"Conditions": self.pa.dictionary(self.pa.int8(), self.pa.string())
+                      ,"Temperature": self.pa.float32()
+                      ,"Pressure": self.pa.float32()
+                      ,"Humidity": self.pa.int8()}
+
+        # Determine that every output column has a type.
+        if len(set(self.output_cols).difference(set(field_types)))!=0:
+            logging.error("Output column(s) without a columnar type: {}.".format(set(self.output_cols).difference(set(field_types))))
+            raise ValueError
+
+        return self.pa.schema([(col, field_types[col]) for col in self.output_cols])
+
+    def open_writer(self):
+        """This function opens the Parquet file writer on the output stream.
+
+        Returns
+        -------
+        writer : pyarrow.parquet.ParquetWriter
+        """
+
+        return self.pa.parquet.ParquetWriter(self.stream, self.schema, compression=self.compression)
+
+    def encode(self, output_data):
+        """This function converts the simulated weather data to an arrow
+        table with the typed columns.
+
+        Parameters
+        ----------
+        output_data : pandas.DataFrame
+            The simulated weather data.
+
+        Returns
+        -------
+        table : pyarrow.Table
+        """
+
+        typed_data = pd.DataFrame({"Location": pd.Categorical(output_data["Location"], categories=self.locations)
+                                  ,"Position": output_data["Position"].astype(str)
+                                  ,"Local Time": pd.to_datetime(output_data["Local Time"].values, unit="s", utc=True)
+                                  ,"Conditions": pd.Categorical(output_data["Conditions"], categories=self.conditions)
+                                  ,"Temperature": output_data["Temperature"].astype("float32")
+                                  ,"Pressure": output_data["Pressure"].astype("float32")
+                                  ,"Humidity": output_data["Humidity"].astype("int8")})
+
+        return self.pa.Table.from_pandas(typed_data[self.output_cols], schema=self.schema, preserve_index=False)
+
+    def write_encoded(self, table):
+        """This function buffers the arrow table and writes the full row
+        groups.
+
+        Parameters
+        ----------
+        table : pyarrow.Table
+            The table returned by the encode method.
+        """
+
+        self.__pending_tables.append(table)
+        self.__pending_rows += table.num_rows
+
+        if self.__pending_rows >= self.row_group_size:
+            self.__flush(self.__pending_rows // self.row_group_size * self.row_group_size)
+
+    def __flush(self, number_rows):
+        """This function writes number_rows buffered data points and keeps
+        the remaining data points buffered.
+
+        Parameters
+        ----------
+        number_rows : int
+            The number of buffered data points to be written.
+        """
+
+        table = self.pa.concat_tables(self.__pending_tables)
+
+        if number_rows>0:
+            self.writer.write_table(table.slice(0, number_rows), row_group_size=self.row_group_size)
+
+        self.__pending_tables = [table.slice(number_rows)]
+        self.__pending_rows = table.num_rows - number_rows
+
+    def write(self, output_data):
+        """This function converts and writes the simulated weather data.
+
+        Parameters
+        ----------
+        output_data : pandas.DataFrame
+            The simulated weather data.
+        """
+
+        self.write_encoded(self.encode(output_data))
+
+    def close(self):
+        """This function writes the buffered data points and closes the
+        output stream.
+        """
+
+        if self.__pending_rows>0:
+            self.__flush(self.__pending_rows)
+
+        self.writer.close()
+        self.stream.close()
+
+class ArrowWriter(ParquetWriter):
+    """This class writes the simulated weather data in the Arrow IPC file
+    format with typed columns, in record batches of at most
+    output_row_group_size data points.
+    """
+
+    def open_writer(self):
+        """This function opens the Arrow IPC file writer on the output stream.
+
+        Returns
+        -------
+        writer : pyarrow.ipc.RecordBatchFileWriter
+        """
+
+        # Arrow IPC supports the zstd and lz4 buffer compression only.
+        if self.compression not in ("none", "zstd"):
+            logging.error("Invalid arrow output compression ({}). Valid values are none and zstd.".format(self.compression))
+            raise ValueError
+
+        options = self.pa.ipc.IpcWriteOptions(compression=None if self.compression=="none" else self.compression)
+
+        return self.pa.ipc.new_file(self.stream, self.schema, options=options)
+
+    def write_encoded(self, table):
+        """This function writes the arrow table.
+
+        Parameters
+        ----------
+        table : pyarrow.Table
+            The table returned by the encode method.
+        """
+
+        self.writer.write_table(table, max_chunksize=self.row_group_size)
+
+    def close(self):
+        """This function closes the output stream.
+        """
+
+        self.writer.close()
+        self.stream.close()
+
+# Valid csv output writers.
+OUTPUT_WRITERS = {"pandas": PandasCsvWriter
+                 ,"fast": FastCsvWriter}
+
+# Valid columnar output writers.
+FORMAT_WRITERS = {"parquet": ParquetWriter
+                 ,"arrow": ArrowWriter}
+
+def get_output_writer(config_data, stream=None):
+    """This function returns the output writer of the output format and
+    writer selected in config.yaml.
+
+    Parameters
+    ----------
+    config_data : dict
+        The configuration data.
+    stream : file object, default is None
+        The binary output stream.
+
+    Returns
+    -------
+    writer : PandasCsvWriter, FastCsvWriter, ParquetWriter or ArrowWriter
+    """
+
+    output_format = config_data["simulation"].get("output_format", "csv")
+    writer_name = config_data["simulation"].get("output_writer", "pandas")
+
+    if output_format in FORMAT_WRITERS:
+        return FORMAT_WRITERS[output_format](config_data, stream=stream)
+
+    elif output_format!="csv":
+        logging.error("Invalid output format ({}). Please check config.yaml file.".format(output_format))
+        raise ValueError
+
+    if writer_name not in OUTPUT_WRITERS:
+        logging.error("Invalid output writer ({}). Please check config.yaml file.".format(writer_name))
+        raise ValueError
+
+    return OUTPUT_WRITERS[writer_name](config_data, stream=stream)
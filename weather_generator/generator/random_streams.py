@@ -0,0 +1,184 @@
+# Standard Python Library
+import logging.config
+import numpy as np
+
+# Custom Python Library
+from common.config import LoggingConfig
+
+# Load logging.yaml file
+LoggingConfig.configure()
+
+# Random streams of the simulated weather data. New streams are appended so
+# the existing streams keep their seed.
+STREAM_NAMES = ("location"
+               ,"timestamp"
+               ,"condition"
+               ,"temperature"
+               ,"pressure"
+               ,"humidity"
+               ,"latitude"
+               ,"longitude")
+
+class RandomStreams(object):
+    """This class holds an independent PCG64 random stream per simulated
+    variable, spawned from the master seed. Every stream draws one double
+    per data point, so the draws of a data point only depend on its position
+    and any chunk of the data can be generated on its own by advancing the
+    streams to the position of its first data point.
+    """
+
+    def __init__(self, seed, names=STREAM_NAMES):
+        """
+        Parameters
+        ----------
+        seed : int
+            The master seed.
+        names : tuple, default is STREAM_NAMES
+            The names of the random streams.
+        """
+
+        # Determine that the seed is not negative.
+        if seed<0:
+            logging.error("The seed is less than 0. Value: {}.".format(seed))
+            raise ValueError
+
+        self.seed = seed
+        self.names = tuple(names)
+        self.__seed_sequences = dict(zip(self.names, np.random.SeedSequence(seed).spawn(len(self.names))))
+
+    def get_generator(self, name, offset=0):
+        """This function returns the random generator of a stream advanced by
+        offset draws.
+
+        Parameters
+        ----------
+        name : string
+            The name of the random stream.
+        offset : int, default is 0
+            The number of draws to skip e.g. the position of the first data
+            point of a chunk.
+
+        Returns
+        -------
+        generator : numpy.random.Generator
+        """
+
+        bit_generator = np.random.PCG64(self.__seed_sequences[name])
+        bit_generator.advance(offset)
+
+        return np.random.Generator(bit_generator)
+
+    def random(self, name, offset, size):
+        """This function returns the uniform doubles in [0, 1) of a stream
+        for the data points from offset to offset + size.
+
+        Parameters
+        ----------
+        name : string
+            The name of the random stream.
+        offset : int
+            The position of the first data point.
+        size : int
+            The number of data points.
+
+        Returns
+        -------
+        values : numpy.ndarray
+        """
+
+        return self.get_generator(name, offset).random(size)
+
+    def normal(self, name, offset, size):
+        """This function returns the standard normal values of a stream for
+        the data points from offset to offset + size. Each value is drawn
+        from two doubles with the Box-Muller transform, so the stream keeps
+        a fixed number of draws per data point.
+
+        Parameters
+        ----------
+        name : string
+            The name of the random stream.
+        offset : int
+            The position of the first data point.
+        size : int
+            The number of data points.
+
+        Returns
+        -------
+        values : numpy.ndarray
+        """
+
+        values = self.get_generator(name, 2 * offset).random(2 * size)
+
+        return np.sqrt(-2.0 * np.log1p(-values[0::2])) * np.cos(2.0 * np.pi * values[1::2])
+
+    def get_chunk_streams(self, offset, size):
+        """This function returns the random streams of the data points from
+        offset to offset + size.
+
+        Parameters
+        ----------
+        offset : int
+            The position of the first data point of the chunk.
+        size : int
+            The number of data points of the chunk.
+
+        Returns
+        -------
+        chunk_streams : ChunkStreams
+        """
+
+        return ChunkStreams(self, offset, size)
+
+class ChunkStreams(object):
+    """This class draws one value per data point of a chunk from the random
+    streams advanced to the position of its first data point.
+    """
+
+    def __init__(self, random_streams, offset, size):
+        """
+        Parameters
+        ----------
+        random_streams : RandomStreams
+            The random streams of the simulated weather data.
+        offset : int
+            The position of the first data point of the chunk.
+        size : int
+            The number of data points of the chunk.
+        """
+
+        self.random_streams = random_streams
+        self.offset = offset
+        self.size = size
+
+    def random(self, name):
+        """This function returns the uniform doubles in [0, 1) of a stream for
+        the data points of the chunk.
+
+        Parameters
+        ----------
+        name : string
+            The name of the random stream.
+
+        Returns
+        -------
+        values : numpy.ndarray
+        """
+
+        return self.random_streams.random(name, self.offset, self.size)
+
+    def normal(self, name):
+        """This function returns the standard normal values of a stream for
+        the data points of the chunk.
+
+        Parameters
+        ----------
+        name : string
+            The name of the random stream.
+
+        Returns
+        -------
+        values : numpy.ndarray
+        """
+
+        return self.random_streams.normal(name, self.offset, self.size)
@@ -0,0 +1,77 @@
+# Standard Python Library
+import collections
+import logging.config
+import threading
+import rasterio as rio
+
+# Custom Python Library
+from common.config import LoggingConfig
+
+# Load logging.yaml file
+LoggingConfig.configure()
+
+class RasterPool(object):
+    """This class keeps a pool of open rasterio datasets so the elevation tif
+    files are opened once instead of on every lookup. The least recently used
+    dataset is closed above max_open datasets.
+    """
+
+    def __init__(self, max_open=4):
+        """
+        Parameters
+        ----------
+        max_open : int, default is 4
+            The maximum number of open datasets.
+        """
+
+        # Determine that max_open is more than 0.
+        if max_open<1:
+            logging.error("The maximum number of open datasets is less than 1. Value: {}.".format(max_open))
+            raise ValueError
+
+        self.max_open = max_open
+        self.__datasets = collections.OrderedDict()
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+
+        return len(self.__datasets)
+
+    def get(self, file_path):
+        """This function returns the open dataset of a tif file, opening it
+        when it is not in the pool.
+
+        Parameters
+        ----------
+        file_path : string
+            The tif file path.
+
+        Returns
+        -------
+        dataset : rasterio.io.DatasetReader
+        """
+
+        with self.__lock:
+            if file_path in self.__datasets:
+                self.__datasets.move_to_end(file_path)
+                return self.__datasets[file_path]
+
+            logging.info("Opening elevation file {}.".format(file_path))
+            dataset = rio.open(file_path)
+            self.__datasets[file_path] = dataset
+
+            # Close the least recently used datasets.
+            while len(self.__datasets) > self.max_open:
+                _, lru_dataset = self.__datasets.popitem(last=False)
+                lru_dataset.close()
+
+            return dataset
+
+    def close(self):
+        """This function closes every dataset of the pool.
+        """
+
+        with self.__lock:
+            while self.__datasets:
+                _, dataset = self.__datasets.popitem()
+                dataset.close()
@@ -0,0 +1,69 @@
+# Standard Python Library
+import logging.config
+import pandas as pd
+
+# Custom Python Library
+from common.config import LoggingConfig
+
+# Load logging.yaml file
+LoggingConfig.configure()
+
+class RecordBuffer(object):
+    """This class collects records in one list per column and builds the
+    data frame once at the end. Appending a record is O(1), unlike
+    DataFrame.append which copies the whole frame on every record.
+    """
+
+    def __init__(self, columns):
+        """
+        Parameters
+        ----------
+        columns : list
+            The column names of the records.
+        """
+
+        self.columns = list(columns)
+        self.__values = [[] for _ in self.columns]
+
+    def __len__(self):
+
+        return len(self.__values[0]) if self.__values else 0
+
+    def append(self, *record):
+        """This function appends a record to the buffer.
+
+        Parameters
+        ----------
+        *record
+            The values of the record in the order of columns.
+        """
+
+        # Determine that the record has a value for each column.
+        if len(record)!=len(self.columns):
+            logging.error("The record has {} value(s) for {} column(s).".format(len(record), len(self.columns)))
+            raise ValueError
+
+        for values, value in zip(self.__values, record):
+            values.append(value)
+
+    def extend(self, records):
+        """This function appends the records to the buffer.
+
+        Parameters
+        ----------
+        records : iterable
+            The records, each in the order of columns.
+        """
+
+        for record in records:
+            self.append(*record)
+
+    def to_frame(self):
+        """This function builds the data frame of the buffered records.
+
+        Returns
+        -------
+        df : pandas.DataFrame
+        """
+
+        return pd.DataFrame(dict(zip(self.columns, self.__values)), columns=self.columns)
@@ -0,0 +1,227 @@
+# Standard Python Library
+import hashlib
+import json
+import logging.config
+import os
+import sqlite3
+import threading
+import time
+
+# Custom Python Library
+from common.config import LoggingConfig
+from common.utils import get_file_path
+
+# Load logging.yaml file
+LoggingConfig.configure()
+
+class ResponseCache(object):
+    """This class is a persistent SQLite cache of the geocode and forecast
+    responses. The entries are content-addressed by the SHA-256 hash of the
+    request key e.g. the coordinate, date and units of a forecast. Entries
+    older than ttl_days are expired and the least recently used entries are
+    evicted above max_entries.
+    """
+
+    def __init__(self, file_path=None, ttl_days=None, max_entries=None, cache_only=False):
+        """
+        Parameters
+        ----------
+        file_path : string, default is None
+            The SQLite database file path. None disables the cache.
+        ttl_days : float, default is None
+            The number of days an entry is valid. None means no expiry.
+        max_entries : int, default is None
+            The maximum number of entries. None means unlimited.
+        cache_only : bool, default is False
+            Whether to fail on a cache miss instead of sending the request.
+        """
+
+        self.file_path = file_path
+        self.ttl = None if ttl_days is None else ttl_days * 86400
+        self.max_entries = max_entries
+        self.cache_only = cache_only
+        self.hits = 0
+        self.misses = 0
+        self.__lock = threading.Lock()
+        self.__connection = None
+
+        if file_path is not None:
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+            self.__connection = sqlite3.connect(file_path, check_same_thread=False)
+            self.__connection.execute("CREATE TABLE IF NOT EXISTS responses "
+                                      "(key TEXT PRIMARY KEY, kind TEXT, created REAL, accessed REAL, value TEXT)")
+            self.__connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+            self.__connection.commit()
+            self.evict()
+
+    @classmethod
+    def from_config(cls, config_data):
+        """This function returns the response cache of the gis cache
+        configuration data.
+
+        Parameters
+        ----------
+        config_data : dict
+            The gis cache configuration data.
+
+        Returns
+        -------
+        cache : ResponseCache
+        """
+
+        if not config_data["enabled"]:
+            return cls(cache_only=config_data["cache_only"])
+
+        file_path = get_file_path(folder_name="data"
+                                 ,subdirectory=config_data["subdirectory"]
+                                 ,file_name=config_data["file_name"])
+
+        return cls(file_path=file_path
+                  ,ttl_days=config_data["ttl_days"]
+                  ,max_entries=config_data["max_entries"]
+                  ,cache_only=config_data["cache_only"])
+
+    @staticmethod
+    def get_key(key_parts):
+        """This function returns the content address of a request key.
+
+        Parameters
+        ----------
+        key_parts : list
+            The JSON serialisable parts of the request key.
+
+        Returns
+        -------
+        key : string
+        """
+
+        return hashlib.sha256(json.dumps(key_parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def get(self, key_parts):
+        """This function returns the cached response of a request key.
+
+        Parameters
+        ----------
+        key_parts : list
+            The JSON serialisable parts of the request key.
+
+        Returns
+        -------
+        value : object
+            The cached response or None when it is not cached or expired.
+        """
+
+        if self.__connection is None:
+            return None
+
+        key = self.get_key(key_parts)
+        now = time.time()
+
+        with self.__lock:
+            row = self.__connection.execute("SELECT created, value FROM responses WHERE key = ?", (key,)).fetchone()
+
+            if row is None or (self.ttl is not None and now - row[0] > self.ttl):
+                return None
+
+            self.__connection.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self.__connection.commit()
+
+        return json.loads(row[1])
+
+    def set(self, key_parts, value):
+        """This function caches the response of a request key.
+
+        Parameters
+        ----------
+        key_parts : list
+            The JSON serialisable parts of the request key. The first part is
+            stored as the kind of the response.
+        value : object
+            The JSON serialisable response.
+        """
+
+        if self.__connection is None:
+            return
+
+        now = time.time()
+
+        with self.__lock:
+            self.__connection.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)"
+                                     ,(self.get_key(key_parts), str(key_parts[0]), now, now, json.dumps(value)))
+            self.__connection.commit()
+
+    def fetch(self, key_parts, func, *args, **kwargs):
+        """This function returns the cached response of a request key, or
+        sends the request and caches its response.
+
+        Parameters
+        ----------
+        key_parts : list
+            The JSON serialisable parts of the request key.
+        func : callable
+            The function sending the request and returning a JSON
+            serialisable response.
+        *args, **kwargs
+            The arguments of func.
+
+        Returns
+        -------
+        value : object
+        """
+
+        value = self.get(key_parts)
+
+        # The requests are fetched from several threads.
+        with self.__lock:
+            if value is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if value is not None:
+            return value
+
+        if self.cache_only:
+            logging.error("Response is not cached in cache-only mode. Request: {}.".format(key_parts))
+            raise RuntimeError
+
+        value = func(*args, **kwargs)
+
+        if value is not None:
+            self.set(key_parts, value)
+
+        return value
+
+    def evict(self):
+        """This function deletes the expired entries and the least recently
+        used entries above max_entries.
+        """
+
+        if self.__connection is None:
+            return
+
+        with self.__lock:
+            if self.ttl is not None:
+                self.__connection.execute("DELETE FROM responses WHERE created < ?", (time.time() - self.ttl,))
+
+            if self.max_entries is not None:
+                self.__connection.execute("DELETE FROM responses WHERE key IN "
+                                          "(SELECT key FROM responses ORDER BY accessed DESC LIMIT -1 OFFSET ?)"
+                                         ,(self.max_entries,))
+
+            self.__connection.commit()
+
+    def close(self):
+        """This function evicts the entries and closes the database.
+        """
+
+        if self.__connection is None:
+            return
+
+        self.evict()
+
+        logging.info("Response cache hits: {}, misses: {}.".format(self.hits, self.misses))
+
+        self.__connection.close()
+        self.__connection = None
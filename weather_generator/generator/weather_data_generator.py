@@ -1,30 +1,114 @@
 # Standard Python Library
-import calendar
+import copy
 import datetime
+import collections
 import logging.config
+import multiprocessing
 import numpy as np
 import os
 import pandas as pd
-import random
 from dateutil import tz
 
 # Custom Python Library
 from common.config import LoggingConfig
-from generator.generate_baseline_data import get_gis_historical_data, aggregate_gis_historical_data
+from common.logging_utils import ProgressLogger
+from common.profiler import StageProfiler
 from common.utils import get_file_path, get_config, get_city
+from generator.elevation_index import ElevationIndex
+from generator.output_formatter import format_distinct_values, format_output_data
+from generator.random_streams import RandomStreams
+from generator.weather_model import MultivariateNormalWeatherModel, get_weather_model_class
+from generator.weather_series import SERIES_FREQUENCIES, WeatherSeries
+from generator.output_sink import open_output_sink
+from generator.output_writer import COMPRESSION_EXTENSIONS, FORMAT_EXTENSIONS, compress_stream, get_output_writer
 
 # Load logging.yaml file
-logging.config.dictConfig(LoggingConfig.logging_config)
+LoggingConfig.configure()
+
+# WeatherDataGen instance and output writer used by the worker processes
+# of the process pool.
+_worker_generator = None
+_worker_writer = None
+
+def _init_worker(generator):
+    """This function initialises a worker process of the process pool with
+    the WeatherDataGen instance to generate the chunks from.
+
+    Parameters
+    ----------
+    generator : WeatherDataGen
+        The weather data generator instance.
+    """
+    
+    global _worker_generator, _worker_writer
+    _worker_generator = generator
+    _worker_writer = get_output_writer(generator.config_data)
+    
+    # The copied profiler holds the stages recorded by the parent process,
+    # e.g. init, which the worker would otherwise return with its chunks.
+    generator.profiler = StageProfiler(enabled=generator.profiler.enabled, trace_memory=generator.profiler.trace_memory)
+
+def _generate_worker_chunk(chunk):
+    """This function generates a chunk in a worker process and returns it
+    serialised by the output writer, with the profiler records of the chunk.
+
+    Parameters
+    ----------
+    chunk : tuple
+        The position of the first data point and the number of data points
+        of the chunk.
+
+    Returns
+    -------
+    data : bytes
+    records : dict
+        The profiler records of the chunk, or None when profiling is
+        disabled.
+    """
+    
+    chunk_start, number_data = chunk
+    profiler = _worker_generator.profiler
+    output_data = _worker_generator.generate_chunk(chunk_start, number_data)
+    
+    with profiler.stage("encode_output", number_data):
+        data = _worker_writer.encode(output_data)
+    
+    return data, profiler.drain() if profiler.enabled else None
 
 class WeatherDataGen(object):
     """This class generates the weather data based on the baseline
     historical data.
     """
 
-    def __init__(self, number_simulated_data, generate_baseline_flag=False):
+    def __init__(self, number_simulated_data, generate_baseline_flag=False, seed=None, local_time=None, profiler=None):
 
         logging.info("Initialising WeatherDataGen class.")
         
+        # Initialising the stage profiler, which records nothing by default.
+        self.profiler = StageProfiler() if profiler is None else profiler
+        
+        with self.profiler.stage("init"):
+            self.__initialise(number_simulated_data, generate_baseline_flag, seed, local_time)
+        
+        logging.info("Completed initialising WeatherDataGen class.")
+        
+    def __initialise(self, number_simulated_data, generate_baseline_flag, seed, local_time):
+        """This function reads the configuration and baseline data sets and
+        builds the baseline lookup data.
+
+        Parameters
+        ----------
+        number_simulated_data : int
+            The number of data points to be generated.
+        generate_baseline_flag : bool
+            Flag if new baseline data is generated.
+        seed : int
+            The master seed, or None for the seed in config.yaml.
+        local_time : bool
+            Flag if the local time mode is used, or None for the local_time
+            in config.yaml.
+        """
+        
         # Determine that number_simulated_data is more than 0.
         if number_simulated_data<1:
             logging.error("The number of simulated data is less than 1. Value: {}.".format(number_simulated_data))
@@ -34,12 +118,42 @@ class WeatherDataGen(object):
         self.config_data = get_config()
         self.__number_simulated_data = number_simulated_data
         self.__generate_baseline_flag = generate_baseline_flag
+        self.__seed = self.config_data["simulation"].get("seed") if seed is None else seed
+        self.__seed = np.random.SeedSequence().entropy if self.__seed is None else self.__seed
+        self.__random_streams = RandomStreams(self.__seed)
         self.__locations = [get_city(loc) for loc in self.config_data["location"]]
         self.__output_cols = self.config_data["simulation"]["output_columns"]
+        self.__local_time = self.config_data["simulation"].get("local_time", False) if local_time is None else local_time
+        self.__mode = self.config_data["simulation"].get("mode", "random")
+        self.__weather_model_class = get_weather_model_class(self.config_data)
         self.__date_start_orig = self.config_data["simulation"]["date_start"]
         self.__date_end_orig = self.config_data["simulation"]["date_end"]
-        self.__date_start = datetime.datetime.combine(self.__date_start_orig, datetime.time.min).timestamp()
-        self.__date_end = datetime.datetime.combine(self.__date_end_orig, datetime.time.min).timestamp()
+        self.__date_start = int(datetime.datetime.combine(self.__date_start_orig, datetime.time.min).timestamp())
+        self.__date_end = int(datetime.datetime.combine(self.__date_end_orig, datetime.time.min).timestamp())
+        self.__position_jitter = self.config_data["simulation"].get("position_jitter", 0.0)
+        
+        # Determine that the mode is valid. The time series are generated with
+        # the multivariate normal weather model.
+        if self.__mode=="timeseries":
+            self.__series_step = self.__get_series_step()
+            self.__series_steps = (self.__date_end - self.__date_start) // self.__series_step
+            self.__weather_model_class = MultivariateNormalWeatherModel
+            
+            # The number of simulated data is capped at the end of the series.
+            if self.__number_simulated_data > self.__series_steps * len(self.__locations):
+                logging.info("Capping the number of simulated data at the {} time series data points.".format(self.__series_steps * len(self.__locations)))
+                self.__number_simulated_data = self.__series_steps * len(self.__locations)
+        
+        elif self.__mode!="random":
+            logging.error("Invalid mode ({}). Please check config.yaml file.".format(self.__mode))
+            raise ValueError
+        
+        self.__aggregate_cols = self.__weather_model_class.aggregate_cols
+        
+        # Determine that position_jitter is not negative.
+        if self.__position_jitter<0:
+            logging.error("The position jitter is less than 0. Value: {}.".format(self.__position_jitter))
+            raise ValueError
         
         # Get the baseline reference and aggregate file path.
         self.__output_base_reference_file_path = get_file_path(folder_name="data"
@@ -49,15 +163,20 @@ class WeatherDataGen(object):
                                                 ,subdirectory=self.config_data["gis"]["output_subdirectory"]
                                                 ,file_name=self.config_data["gis"]["output_base_aggregate_file_name"])
         
+        logging.info("Using master seed {}.".format(self.__seed))
+        
         logging.info("Checking if the baseline data set exists.")
         
-        # Checking if the baseline data set exists.
+        # Checking if the baseline data set exists. The baseline module is
+        # imported on use as its GIS and network libraries are slow to import.
         if self.__generate_baseline_flag:
+            from generator.generate_baseline_data import get_gis_historical_data, aggregate_gis_historical_data
             get_gis_historical_data()
             aggregate_gis_historical_data()
             
         elif not os.path.exists(self.__output_base_reference_file_path) or not os.path.exists(self.__output_base_aggregate_file_path):
             logging.info("Baseline data set does not exists. Generating baseline data.")
+            from generator.generate_baseline_data import get_gis_historical_data, aggregate_gis_historical_data
             get_gis_historical_data()
             aggregate_gis_historical_data()
         
@@ -73,123 +192,365 @@ class WeatherDataGen(object):
         self.__aggregate_data = pd.read_csv(self.__output_base_aggregate_file_path)
         logging.info("Completed reading baseline aggregate data.")
         
-        logging.info("Initialising output_data data frame.")
-        
-        # Check if the location in the config file reconfiles with the baseline data.
-        if len(set(self.__reference_data["Location"]).difference(set(self.__locations)))!=0:
-            logging.info("Baseline data set does not exists. Generating baseline data.")
-            get_gis_historical_data()
+        # Check if the location in the config file reconciles with the baseline data.
+        # Only the added and removed locations are processed.
+        if len(set(self.__reference_data["Location"]).symmetric_difference(set(self.__locations)))!=0:
+            logging.info("Baseline data set does not match the config.yaml locations. Updating baseline data.")
+            from generator.generate_baseline_data import update_gis_historical_data
+            update_gis_historical_data()
+            
+            logging.info("Reading updated baseline data sets.")
+            self.__reference_data = pd.read_csv(self.__output_base_reference_file_path)
+            self.__aggregate_data = pd.read_csv(self.__output_base_aggregate_file_path)
+            logging.info("Completed reading updated baseline data sets.")
+        
+        # Check if the baseline aggregate data has the weather model columns.
+        # The aggregate data of an earlier version is re-aggregated from the
+        # baseline historical data.
+        if len(set(self.__aggregate_cols).difference(self.__aggregate_data.columns))!=0:
+            logging.info("Baseline aggregate data is missing weather model columns. Aggregating baseline data.")
+            from generator.generate_baseline_data import aggregate_gis_historical_data
             aggregate_gis_historical_data()
+            self.__aggregate_data = pd.read_csv(self.__output_base_aggregate_file_path)
+        
+        logging.info("Initialising output_data data frame.")
         
         # Initialising output_data dataframe.
         self.output_data = pd.DataFrame(columns=self.__output_cols)
         
-        logging.info("Completed initialising WeatherDataGen class.")
+        # Initialising baseline lookup data.
+        self.__build_lookup_data()
         
-    def __generate_location(self):
-        """This function generates n random location to be simulated.
+        # Initialising the elevation index of the random positions.
+        if self.__position_jitter>0:
+            self.__elevation_index = ElevationIndex.from_config(self.config_data["gis"])
+        
+    def __build_lookup_data(self):
+        """This function builds dense lookup arrays of the baseline reference
+        and aggregate data indexed by location code and month, where the
+        location code is the position of the location in the config.yaml.
         """
         
-        logging.info("Generating {} random location(s).".format(self.__number_simulated_data))
+        logging.info("Building baseline lookup data.")
         
-        # Randomly generate location list.
-        self.output_data["Location"] = np.random.choice(self.__locations, self.__number_simulated_data)
+        # Initialising the location code of the baseline data.
+        location_codes = {loc: code for code, loc in enumerate(self.__locations)}
+        reference_codes = self.__reference_data["Location"].map(location_codes)
+        aggregate_codes = self.__aggregate_data["Location"].map(location_codes)
         
-        logging.info("Completed generating {} random location(s).".format(self.__number_simulated_data))
-    
-    def __merge_ref_data(self):
-        """This function merges the output data with baseline reference data.
+        # Determine that every location has baseline reference data.
+        if len(set(self.__locations).difference(set(self.__reference_data["Location"])))!=0:
+            logging.error("Baseline reference data is missing location(s): {}.".format(set(self.__locations).difference(set(self.__reference_data["Location"]))))
+            raise ValueError
+        
+        # Build the position categories and the position code lookup array
+        # indexed by location code.
+        position_lookup = np.empty(len(self.__locations), dtype=object)
+        valid = reference_codes.notna().values
+        position_lookup[reference_codes[valid].astype(int).values] = self.__reference_data.loc[valid, "Position"].values
+        self.__position_categories, self.__position_lookup = np.unique(position_lookup.astype(str), return_inverse=True)
+        
+        # Build the coordinate lookup array indexed by location code.
+        self.__coordinate_lookup = np.full((len(self.__locations), 2), np.nan)
+        self.__coordinate_lookup[reference_codes[valid].astype(int).values] = self.__reference_data.loc[valid, ["Latitude", "Longitude"]].values
+        
+        # Build the aggregate lookup array indexed by location code and month.
+        self.__aggregate_lookup = np.full((len(self.__locations), 13, len(self.__aggregate_cols)), np.nan)
+        valid = aggregate_codes.notna().values
+        self.__aggregate_lookup[aggregate_codes[valid].astype(int).values
+                               ,self.__aggregate_data.loc[valid, "Month"].astype(int).values] = self.__aggregate_data.loc[valid, self.__aggregate_cols].values
+        
+        # Build the timezone lookup array indexed by location code.
+        if self.__local_time:
+            timezone_lookup = np.empty(len(self.__locations), dtype=object)
+            valid = reference_codes.notna().values
+            timezone_lookup[reference_codes[valid].astype(int).values] = self.__reference_data.loc[valid, "Timezone"].values
+            self.__timezones, self.__timezone_lookup = np.unique(timezone_lookup.astype(str), return_inverse=True)
+            self.__tzinfos = [tz.gettz(timezone) for timezone in self.__timezones]
+            
+            # Determine that every timezone is valid.
+            if None in self.__tzinfos:
+                logging.error("Invalid timezone(s) in baseline reference data: {}.".format([timezone for timezone, tzinfo in zip(self.__timezones, self.__tzinfos) if tzinfo is None]))
+                raise ValueError
+        
+        # Determine that every location has baseline aggregate data for every month.
+        if np.isnan(self.__aggregate_lookup[:, 1:]).any():
+            logging.error("Baseline aggregate data is missing location and month data. Please regenerate the baseline data.")
+            raise ValueError
+        
+        # Initialising the weather model. The time series leave the variance
+        # within the day to the diurnal cycle.
+        if self.__mode=="timeseries":
+            self.__weather_model = self.__weather_model_class(self.config_data, self.__aggregate_lookup
+                                                             ,within_day=self.__series_step>=SERIES_FREQUENCIES["daily"])
+            self.__weather_series = WeatherSeries(self.__weather_model, self.__random_streams
+                                                 ,self.__coordinate_lookup[:, 1], self.__series_step
+                                                 ,self.config_data["simulation"].get("autocorrelation", 0.7))
+        else:
+            self.__weather_model = self.__weather_model_class(self.config_data, self.__aggregate_lookup)
+        
+        logging.info("Completed building baseline lookup data.")
+        
+    def clone(self, number_simulated_data, seed=None):
+        """This function returns a copy of the generator of another number
+        of data points and master seed. The copy shares the configuration,
+        baseline lookup data and weather model, so it is created without
+        reading the baseline data sets again, and generates the same data as
+        a new generator of the same seed.
+
+        Parameters
+        ----------
+        number_simulated_data : int
+            The number of data points to be generated.
+        seed : int, default is None
+            The master seed, or None for the seed in config.yaml.
+
+        Returns
+        -------
+        generator : WeatherDataGen
         """
         
-        logging.info("Merging the output data with baseline reference data.")
+        # Determine that number_simulated_data is more than 0.
+        if number_simulated_data<1:
+            logging.error("The number of simulated data is less than 1. Value: {}.".format(number_simulated_data))
+            raise ValueError
+        
+        # The output_data dataframe is replaced by each generated chunk.
+        generator = copy.copy(self)
+        generator.profiler = StageProfiler()
+        generator.__number_simulated_data = number_simulated_data
+        generator.__seed = self.config_data["simulation"].get("seed") if seed is None else seed
+        generator.__seed = np.random.SeedSequence().entropy if generator.__seed is None else generator.__seed
+        generator.__random_streams = RandomStreams(generator.__seed)
         
-        # Merging the output data with baseline reference data.
-        self.output_data = pd.merge(self.output_data.drop(["Position"], axis=1)
-                                   ,self.__reference_data
-                                   ,how="inner", on="Location")
+        # The time series of the copy are drawn from its own random streams.
+        if self.__mode=="timeseries":
+            generator.__number_simulated_data = min(number_simulated_data, self.__series_steps * len(self.__locations))
+            generator.__weather_series = self.__weather_series.copy(generator.__random_streams)
         
-        logging.info("Completed merging the output data with baseline reference data.")
-                                   
-    def __merge_aggregate_data(self):
-        """This function merges the output data with baseline aggregate data.
+        return generator
+        
+    @property
+    def seed(self):
+        """The master seed of the simulated weather data.
         """
         
-        logging.info("Merging the output data with baseline aggregate data.")
+        return self.__seed
         
-        # Merging the output data with baseline aggregate data.
-        self.output_data = pd.merge(self.output_data
-                                   ,self.__aggregate_data
-                                   ,how="inner", on=["Location", "Month"])
+    @property
+    def number_simulated_data(self):
+        """The number of data points to be generated.
+        """
         
-        logging.info("Completed merging the output data with baseline aggregate data.")
+        return self.__number_simulated_data
         
-    def __generate_timestamp(self):
-        """This function generates random timestamp in ISO8601 format.
+    def __get_series_step(self):
+        """This function returns the time step in seconds of the time series
+        frequency selected in config.yaml.
+
+        Returns
+        -------
+        step : int
         """
         
-        logging.info("Generating timestamp data for the output data between {} and {}.".format(self.__date_start_orig, self.__date_end_orig))
+        frequency = self.config_data["simulation"].get("timeseries_frequency", "hourly")
+        
+        if frequency not in SERIES_FREQUENCIES:
+            logging.error("Invalid time series frequency ({}). Please check config.yaml file.".format(frequency))
+            raise ValueError
+        
+        return SERIES_FREQUENCIES[frequency]
+        
+    def __generate_series_index(self, chunk_start, number_data):
+        """This function generates the location and timestamp of the time
+        series data points of a chunk, ordered by time step and location.
+
+        Parameters
+        ----------
+        chunk_start : int
+            The position of the first data point of the chunk.
+        number_data : int
+            The number of data points to be generated.
+        """
+        
+        logging.debug("Generating {} time series location(s) and timestamp(s).".format(number_data))
+        
+        position = np.arange(chunk_start, chunk_start + number_data, dtype=np.int64)
+        location_code = position % len(self.__locations)
+        
+        self.output_data["Location"] = pd.Categorical.from_codes(location_code, categories=self.__locations)
+        self.output_data["Location_Code"] = location_code
+        self.__set_timestamp(self.__date_start + position // len(self.__locations) * self.__series_step)
+        
+        logging.debug("Completed generating {} time series location(s) and timestamp(s).".format(number_data))
+        
+    def __generate_location(self, number_data):
+        """This function generates n random location to be simulated.
+
+        Parameters
+        ----------
+        number_data : int
+            The number of data points to be generated.
+        """
+        
+        logging.debug("Generating {} random location(s).".format(number_data))
+        
+        # Randomly generate location list.
+        location_code = (self.__chunk_streams.random("location") * len(self.__locations)).astype(np.int64)
+        self.output_data["Location"] = pd.Categorical.from_codes(location_code, categories=self.__locations)
+        self.output_data["Location_Code"] = location_code
+        
+        logging.debug("Completed generating {} random location(s).".format(number_data))
+    
+    def __lookup_baseline_data(self):
+        """This function updates the output data with the baseline reference
+        data of each location from the lookup arrays. The baseline aggregate
+        data is looked up by the weather model.
+        """
+        
+        logging.debug("Looking up the baseline reference data of the output data.")
+        
+        location_code = self.output_data["Location_Code"].values
+        
+        # Gathering the baseline reference data.
+        self.output_data["Position"] = pd.Categorical.from_codes(self.__position_lookup[location_code], categories=self.__position_categories)
+        
+        logging.debug("Completed looking up the baseline reference data of the output data.")
+        
+    def __generate_timestamp(self, number_data):
+        """This function generates random timestamp as int64 epoch seconds.
+        The timestamp is formatted in ISO8601 format when the output data is
+        serialised. In local time mode, the UTC offset of each timestamp in
+        the timezone of its location is generated and the month is taken
+        from the local date.
+
+        Parameters
+        ----------
+        number_data : int
+            The number of data points to be generated.
+        """
+        
+        logging.debug("Generating timestamp data for the output data between {} and {}.".format(self.__date_start_orig, self.__date_end_orig))
         
         # Randomly generate timestamp data.
-        temp_tz = np.random.randint(self.__date_start, self.__date_end, size=self.__number_simulated_data)
-        temp_tz = pd.to_datetime(temp_tz, unit="s", utc=True).strftime("%Y-%m-%dT%H:%M:%SZ")
+        self.__set_timestamp(self.__date_start + (self.__chunk_streams.random("timestamp") * (self.__date_end - self.__date_start)).astype(np.int64))
+        
+        logging.debug("Completed generating timestamp data for the output data.")
+        
+    def __set_timestamp(self, temp_tz):
+        """This function updates the output data with the timestamp, the UTC
+        offset in local time mode and the month.
+
+        Parameters
+        ----------
+        temp_tz : numpy.ndarray
+            The timestamp of each data point as epoch seconds.
+        """
         
         # Updating the output data with the timestamp.
         self.output_data["Local Time"] = temp_tz
-        self.output_data["Month"] = pd.to_datetime(self.output_data["Local Time"], utc=True).dt.month
         
-        logging.info("Completed generating timestamp data for the output data.")
+        if self.__local_time:
+            utc_offset = self.__get_utc_offset(temp_tz)
+            self.output_data["UTC Offset"] = utc_offset
+            temp_tz = temp_tz + utc_offset
         
-    def __generate_weather_variables(self):
-        """This function generates the weather variables and updates
-        output_data variable.
-        """
+        self.output_data["Month"] = (temp_tz.astype("datetime64[s]").astype("datetime64[M]").astype(np.int64) % 12 + 1).astype(np.int8)
+        
+    def __get_utc_offset(self, timestamps):
+        """This function returns the UTC offset of each timestamp in the
+        timezone of its location, including daylight saving time. The
+        timestamps are grouped by timezone and each timezone is converted
+        once.
+
+        Parameters
+        ----------
+        timestamps : numpy.ndarray
+            The epoch seconds of the output data.
 
-        # Initialiase weather variable data.
+        Returns
+        -------
+        utc_offset : numpy.ndarray
+            The UTC offset in seconds.
+        """
         
-        logging.info("Initialising weather variable data.")
+        timezone_code = self.__timezone_lookup[self.output_data["Location_Code"].values]
+        utc_offset = np.zeros(len(timestamps), dtype=np.int32)
+        
+        for code, tzinfo in enumerate(self.__tzinfos):
+            rows = np.flatnonzero(timezone_code==code)
+            
+            if len(rows)==0:
+                continue
+            
+            local_time = pd.to_datetime(timestamps[rows], unit="s", utc=True).tz_convert(tzinfo).tz_localize(None)
+            utc_offset[rows] = local_time.values.astype("datetime64[s]").astype(np.int64) - timestamps[rows]
         
-        condition_value = self.config_data["simulation"]["condition"]
-        condition_dict = dict(zip(np.arange(1,len(condition_value)+1),condition_value))
-        conditions = np.random.randint(1, len(condition_value), size=self.__number_simulated_data)
+        return utc_offset
         
-        temperature = np.random.uniform(low=0.0, high=1.0, size=self.__number_simulated_data)
-        pressure = np.random.uniform(low=0.0, high=1.0, size=self.__number_simulated_data).round(1)
-        humidity = np.random.uniform(low=0.0, high=1.0, size=self.__number_simulated_data)
+    def __generate_weather_variables(self, number_data):
+        """This function generates the weather variables with the weather
+        model selected in config.yaml and updates output_data variable.
 
-        logging.info("Completed initialising weather variable data.")
+        Parameters
+        ----------
+        number_data : int
+            The number of data points to be generated.
+        """
 
-        # Generating weather condition data and updating the output data dataframe.
-        logging.info("Generating weather condition data.")
-        
-        self.output_data["Conditions"] = conditions
-        self.output_data["Conditions"] = self.output_data.Conditions.map(condition_dict)
+        # Generating weather variable data.
+        logging.debug("Generating {} weather variable data with the {}.".format(number_data, type(self.__weather_model).__name__))
+        
+        if self.__mode=="timeseries":
+            condition_code, temperature, pressure, humidity = self.__weather_series.sample(self.__chunk_streams.offset
+                                                                                           ,self.output_data["Location_Code"].values
+                                                                                           ,self.output_data["Month"].values
+                                                                                           ,self.output_data["Local Time"].values)
+        else:
+            condition_code, temperature, pressure, humidity = self.__weather_model.sample(self.output_data["Location_Code"].values
+                                                                                          ,self.output_data["Month"].values
+                                                                                          ,self.__chunk_streams)
 
-        logging.info("Completed updating the output data with the generated weather condition data.")
+        logging.debug("Completed generating weather variable data.")
 
-        # Generating temperature data and updating the output data dataframe.
-        logging.info("Generating temperature data.")
+        # Updating the output data dataframe.
+        logging.debug("Updating the output data with the generated weather variable data.")
         
-        self.output_data["Temperature"] = self.output_data["T_avg_min"] + self.output_data["T_avg_range"] * temperature
-        self.output_data["Temperature"] = self.output_data["Temperature"].round(1)
-        self.output_data.loc[self.output_data["Temperature"]>0, "Temperature"] = "+" + self.output_data[self.output_data["Temperature"]>0]["Temperature"].astype(str)
+        self.output_data["Conditions"] = pd.Categorical.from_codes(condition_code, categories=self.config_data["simulation"]["condition"])
+        self.output_data["Temperature"] = temperature
+        self.output_data["Pressure"] = pressure
+        self.output_data["Humidity"] = humidity
 
-        logging.info("Completed updating the output data with the generated temperature data.")
+        logging.debug("Completed updating the output data with the generated weather variable data.")
         
-        # Generating pressure data and updating the output data dataframe.
-        logging.info("Generating pressure data.")
-        
-        self.output_data["Pressure"] = self.output_data["P_min"] + self.output_data["P_range"] * pressure
-        self.output_data["Pressure"] = self.output_data["Pressure"].round(1)
+    def __generate_position(self, number_data):
+        """This function generates a random position around the location of
+        each data point, within position_jitter degrees of latitude and
+        longitude, with the elevation looked up in the elevation index.
 
-        logging.info("Completed updating the output data with the generated pressure data.")
+        Parameters
+        ----------
+        number_data : int
+            The number of data points to be generated.
+        """
         
-        # Generating humidity data and updating the output data dataframe.
-        logging.info("Generating humidity data.")
+        logging.debug("Generating {} random position(s) within {} degree(s) of the location.".format(number_data, self.__position_jitter))
         
-        self.output_data["Humidity"] = self.output_data["H_min"] + self.output_data["H_range"] * humidity
-        self.output_data["Humidity"] = self.output_data["Humidity"].astype("int")
-
-        logging.info("Completed updating the output data with the generated humidity data.")
+        # Randomly generate the coordinates around the location.
+        coordinates = self.__coordinate_lookup[self.output_data["Location_Code"].values]
+        lat_offset = (2.0 * self.__chunk_streams.random("latitude") - 1.0) * self.__position_jitter
+        lon_offset = (2.0 * self.__chunk_streams.random("longitude") - 1.0) * self.__position_jitter
+        lat = np.clip(coordinates[:, 0] + lat_offset, -90.0, 90.0).round(2)
+        lon = ((coordinates[:, 1] + lon_offset + 180.0) % 360.0 - 180.0).round(2)
+        elev = self.__elevation_index.lookup(lat, lon)
+        
+        # Updating the output data with the position e.g. '-33.85,151.22,2'.
+        # Each distinct position is formatted once as a category.
+        positions, position_codes = np.unique(np.column_stack([lat, lon, elev]), axis=0, return_inverse=True)
+        position_categories = format_distinct_values(positions[:, 0]) + "," + format_distinct_values(positions[:, 1]) + "," + format_distinct_values(positions[:, 2].astype(np.int64))
+        self.output_data["Position"] = pd.Categorical.from_codes(position_codes.ravel(), categories=position_categories)
+        
+        logging.debug("Completed generating {} random position(s).".format(number_data))
         
     def __finalise_output(self):
         """This function cleanses the output_data layout.
@@ -197,46 +558,349 @@ class WeatherDataGen(object):
 
         # Finalising output_data layout.
         
-        logging.info("Finalising output_data layout.")
+        logging.debug("Finalising output_data layout.")
         
-        self.output_data = self.output_data[self.__output_cols]
+        # The UTC offset is kept to format the local time.
+        if self.__local_time:
+            self.output_data = self.output_data[self.__output_cols + ["UTC Offset"]]
+        else:
+            self.output_data = self.output_data[self.__output_cols]
         
-        logging.info("Completed finalising output_data layout.")
+        logging.debug("Completed finalising output_data layout.")
         
-    def save_output(self):
-        """This function saves the output_data in the data folder.
+    def generate_chunk(self, chunk_start, number_data):
+        """This function runs the private methods to simulate number_data
+        weather data points and stores them in the output_data dataframe.
+        The random streams are advanced to chunk_start, so the chunk holds
+        the same data points for any chunk size and can be generated in any
+        process.
+
+        Parameters
+        ----------
+        chunk_start : int
+            The position of the first data point of the chunk in the
+            simulated weather data.
+        number_data : int
+            The number of data points to be generated.
+
+        Returns
+        -------
+        output_data : pandas.DataFrame
         """
+        
+        # Initialising the chunk random streams and output_data dataframe.
+        self.__chunk_streams = self.__random_streams.get_chunk_streams(chunk_start, number_data)
+        self.output_data = pd.DataFrame(columns=self.__output_cols)
+        
+        # Running the private methods to simulated weather data.
+        with self.profiler.chunk(chunk_start, number_data):
+            if self.__mode=="timeseries":
+                with self.profiler.stage("generate_series_index", number_data):
+                    self.__generate_series_index(chunk_start, number_data)
+            else:
+                with self.profiler.stage("generate_location", number_data):
+                    self.__generate_location(number_data)
+                
+                with self.profiler.stage("generate_timestamp", number_data):
+                    self.__generate_timestamp(number_data)
+            
+            with self.profiler.stage("lookup_baseline_data", number_data):
+                self.__lookup_baseline_data()
+            
+            with self.profiler.stage("generate_weather_variables", number_data):
+                self.__generate_weather_variables(number_data)
+            
+            if self.__position_jitter>0:
+                with self.profiler.stage("generate_position", number_data):
+                    self.__generate_position(number_data)
+            
+            with self.profiler.stage("finalise_output", number_data):
+                self.__finalise_output()
+        
+        return self.output_data
+        
+    def format_output(self, output_data=None):
+        """This function formats the categorical, timestamp and numeric
+        columns of output_data as text for serialisation. The output_data
+        dataframe itself keeps the compact representation.
+
+        Parameters
+        ----------
+        output_data : pandas.DataFrame, default is the output_data attribute
+            The simulated weather data.
 
-        # Initialise variable
+        Returns
+        -------
+        formatted_data : pandas.DataFrame
+        """
+        
+        if output_data is None:
+            output_data = self.output_data
+        
+        return format_output_data(output_data)
+        
+    def __get_output_file_path(self):
+        """This function returns the output data file path including the
+        extension of the columnar output format or csv output compression.
+
+        Returns
+        -------
+        file_path : string
+        """
+        
         file_path = get_file_path(folder_name="data"
                                  ,subdirectory=self.config_data["simulation"]["output_subdirectory"]
                                  ,file_name=self.config_data["simulation"]["output_data"])
+        output_format = self.config_data["simulation"].get("output_format", "csv")
+        
+        # Columnar output formats replace the csv file extension.
+        if output_format in FORMAT_EXTENSIONS:
+            return os.path.splitext(file_path)[0] + FORMAT_EXTENSIONS[output_format]
+        
+        extension = COMPRESSION_EXTENSIONS.get(self.config_data["simulation"].get("output_compression", "none"), "")
+        
+        if not file_path.endswith(extension):
+            file_path = file_path + extension
+        
+        return file_path
+        
+    def __open_output_writer(self, sink=None, sink_path=None):
+        """This function opens the output writer and output sink selected in
+        config.yaml.
+
+        Parameters
+        ----------
+        sink : string, default is None
+            The output sink name overriding the output_sink in config.yaml.
+        sink_path : string, default is None
+            The output sink path overriding the output_sink_path in
+            config.yaml.
+
+        Returns
+        -------
+        writer : PandasCsvWriter, FastCsvWriter, ParquetWriter or ArrowWriter
+        output_sink : OutputSink
+            The output sink of the writer, aborted when the output is not
+            completed.
+        """
+        
+        output_sink = open_output_sink(self.config_data, self.__get_output_file_path(), sink, sink_path)
+        
+        # Columnar output formats compress the data within the file.
+        if self.config_data["simulation"].get("output_format", "csv") in FORMAT_EXTENSIONS:
+            stream = output_sink
+        else:
+            stream = compress_stream(output_sink
+                                    ,compression=self.config_data["simulation"].get("output_compression", "none"))
+        
+        try:
+            return get_output_writer(self.config_data, stream=stream), output_sink
+        except Exception:
+            output_sink.abort()
+            raise
+        
+    def save_output(self, sink=None, sink_path=None):
+        """This function saves the output_data in the data folder, or writes
+        it to the output sink selected in config.yaml.
+
+        Parameters
+        ----------
+        sink : string, default is None
+            The output sink name overriding the output_sink in config.yaml.
+        sink_path : string, default is None
+            The output sink path overriding the output_sink_path in
+            config.yaml.
+        """
+
+        writer, output_sink = self.__open_output_writer(sink, sink_path)
         
         # Saving output_data in a csv file.
         
-        logging.info("Saving output_data in {}.".format(file_path))
+        logging.info("Saving output_data in {}.".format(output_sink.name))
+        
+        try:
+            with self.profiler.stage("save_output", len(self.output_data)):
+                writer.write(self.output_data)
+            
+            writer.close()
+        except BaseException:
+            output_sink.abort()
+            raise
+        
+        logging.info("Completed saving output_data in {}.".format(output_sink.name))
+
+    def save_output_iter(self, chunk_size, workers=1, sink=None, sink_path=None):
+        """This function generates the simulated weather data in chunks and
+        appends each chunk to the output file in the data folder, or to the
+        output sink selected in config.yaml, so the memory used does not grow
+        with number_simulated_data. The output sink writes in the background
+        and blocks the generation while its buffer is full. With more than
+        one worker, the chunks are generated in a process pool and written
+        in order, giving the same output for any number of workers.
+
+        Parameters
+        ----------
+        chunk_size : int
+            The maximum number of data points generated and saved at a time.
+        workers : int, default is 1
+            The number of processes generating the chunks.
+        sink : string, default is None
+            The output sink name overriding the output_sink in config.yaml.
+        sink_path : string, default is None
+            The output sink path overriding the output_sink_path in
+            config.yaml.
+
+        Returns
+        -------
+        report : dict
+            The stage profiler report.
+        """
+        
+        # Determine that workers is more than 0.
+        if workers<1:
+            logging.error("The number of workers is less than 1. Value: {}.".format(workers))
+            raise ValueError
+
+        writer, output_sink = self.__open_output_writer(sink, sink_path)
+        
+        # Saving each output_data chunk in a csv file.
+        
+        logging.info("Saving output_data in {} in chunks of {} using {} worker(s).".format(output_sink.name, chunk_size, workers))
+        
+        # The output sink is aborted when the generation fails or is
+        # interrupted, which stops its writer thread and discards the
+        # incomplete output instead of completing it.
+        try:
+            if workers==1:
+                for output_data in self.generate_iter(chunk_size):
+                    with self.profiler.stage("save_output", len(output_data)):
+                        writer.write(output_data)
+            else:
+                for data, records in self.__generate_parallel(chunk_size, workers):
+                    if records is not None:
+                        self.profiler.merge(records)
+                    
+                    with self.profiler.stage("write_output"):
+                        writer.write_encoded(data)
+            
+            writer.close()
+        except BaseException:
+            output_sink.abort()
+            raise
         
-        self.output_data.to_csv(file_path
-                        ,sep=self.config_data["simulation"]["output_delimiter"]
-                        ,header=self.config_data["simulation"]["output_header"]
-                        ,index=False)
+        logging.info("Completed saving output_data in {}.".format(output_sink.name))
         
-        logging.info("Completed saving output_data in {}.".format(file_path))
+        return self.profiler.report()
 
     def generate(self):
         """This function runs the simulated weather data and save in 
         the output_data dataframe.
+
+        Returns
+        -------
+        report : dict
+            The stage profiler report.
         """
     
         logging.info("Running weather data generation.")
         
-        # Running the private methods to simulated weather data.
-        self.__generate_location()
-        self.__merge_ref_data()
-        self.__generate_timestamp()
-        self.__merge_aggregate_data()
-        self.__generate_weather_variables()
-        self.__finalise_output()
+        self.generate_chunk(0, self.__number_simulated_data)
+        
+        logging.info("Completed running weather data generation.")
+        
+        return self.profiler.report()
+
+    def generate_iter(self, chunk_size):
+        """This function runs the simulated weather data in chunks of at most
+        chunk_size data points. The output_data dataframe only holds the
+        current chunk.
+
+        Parameters
+        ----------
+        chunk_size : int
+            The maximum number of data points generated at a time.
+
+        Yields
+        ------
+        output_data : pandas.DataFrame
+            The simulated weather data chunk.
+        """
+    
+        logging.info("Running weather data generation in chunks of {}.".format(chunk_size))
+        
+        progress = ProgressLogger("Generating simulated weather data", self.__number_simulated_data, unit="data point(s)")
+        
+        for chunk_start, number_data in self.__get_chunks(chunk_size):
+            
+            logging.debug("Generating chunk at data point {} of {} data points.".format(chunk_start, number_data))
+            
+            yield self.generate_chunk(chunk_start, number_data)
+            
+            progress.update(number_data)
         
         logging.info("Completed running weather data generation.")
 
+    def __get_chunks(self, chunk_size):
+        """This function splits number_simulated_data into chunks of at most
+        chunk_size data points.
+
+        Parameters
+        ----------
+        chunk_size : int
+            The maximum number of data points of a chunk.
+
+        Returns
+        -------
+        chunks : list of tuple
+            The position of the first data point and the number of data
+            points of each chunk.
+        """
+        
+        # Determine that chunk_size is more than 0.
+        if chunk_size<1:
+            logging.error("The chunk size is less than 1. Value: {}.".format(chunk_size))
+            raise ValueError
+        
+        return [(chunk_start, min(chunk_size, self.__number_simulated_data - chunk_start))
+                for chunk_start in range(0, self.__number_simulated_data, chunk_size)]
+
+    def __generate_parallel(self, chunk_size, workers):
+        """This function generates the chunks in a process pool and returns
+        them in order serialised by the output writer. At most two chunks
+        per worker are pending at a time to keep the memory used bounded.
+
+        Parameters
+        ----------
+        chunk_size : int
+            The maximum number of data points of a chunk.
+        workers : int
+            The number of processes generating the chunks.
+
+        Yields
+        ------
+        data : bytes
+        records : dict
+            The profiler records of the chunk, or None when profiling is
+            disabled.
+        """
+    
+        logging.info("Running weather data generation in chunks of {} using {} workers.".format(chunk_size, workers))
+        
+        pending = collections.deque()
+        progress = ProgressLogger("Generating simulated weather data", self.__number_simulated_data, unit="data point(s)")
+        
+        with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(self,)) as pool:
+            for chunk in self.__get_chunks(chunk_size):
+                pending.append((chunk[1], pool.apply_async(_generate_worker_chunk, (chunk,))))
+                
+                if len(pending)>=2*workers:
+                    number_data, result = pending.popleft()
+                    yield result.get()
+                    progress.update(number_data)
+            
+            while pending:
+                number_data, result = pending.popleft()
+                yield result.get()
+                progress.update(number_data)
+        
+        logging.info("Completed running weather data generation.")
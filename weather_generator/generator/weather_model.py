@@ -0,0 +1,234 @@
+# Standard Python Library
+import logging.config
+import numpy as np
+
+# Custom Python Library
+from common.config import LoggingConfig
+
+# Load logging.yaml file
+LoggingConfig.configure()
+
+# Weather variables of the multivariate normal model in the order of its
+# mean and covariance columns.
+WEATHER_VARIABLES = ("Temperature", "Pressure", "Humidity")
+
+# Mean and covariance columns of the baseline aggregate data.
+MEAN_COLS = ["T_mean", "P_mean", "H_mean"]
+COVARIANCE_COLS = [["T_var", "TP_cov", "TH_cov"]
+                  ,["TP_cov", "P_var", "PH_cov"]
+                  ,["TH_cov", "PH_cov", "H_var"]]
+
+class UniformWeatherModel(object):
+    """This class draws each weather variable independently and uniformly
+    between the monthly minimum and maximum of the location, and the
+    condition uniformly among the valid conditions.
+    """
+
+    # Baseline aggregate columns of the model parameters.
+    aggregate_cols = ["T_avg_min", "T_avg_range", "H_min", "H_range", "P_min", "P_range"]
+
+    def __init__(self, config_data, aggregate_lookup):
+        """
+        Parameters
+        ----------
+        config_data : dict
+            The configuration data.
+        aggregate_lookup : numpy.ndarray
+            The aggregate_cols of each location code and month.
+        """
+
+        self.conditions = config_data["simulation"]["condition"]
+        self.aggregate_lookup = aggregate_lookup
+
+    def sample(self, location_code, month, streams):
+        """This function draws the weather variables of each data point.
+
+        Parameters
+        ----------
+        location_code : numpy.ndarray
+            The location code of each data point.
+        month : numpy.ndarray
+            The month of each data point.
+        streams : ChunkStreams
+            The random streams of the chunk.
+
+        Returns
+        -------
+        condition_code : numpy.ndarray
+            The position of the condition of each data point in conditions.
+        temperature : numpy.ndarray
+        pressure : numpy.ndarray
+        humidity : numpy.ndarray
+        """
+
+        t_min, t_range, h_min, h_range, p_min, p_range = np.moveaxis(self.aggregate_lookup[location_code, month], -1, 0)
+
+        condition_code = (streams.random("condition") * len(self.conditions)).astype(np.int64)
+        temperature = (t_min + t_range * streams.random("temperature")).round(1)
+        pressure = (p_min + p_range * streams.random("pressure").round(1)).round(1)
+        humidity = (h_min + h_range * streams.random("humidity")).astype(np.int8)
+
+        return condition_code, temperature, pressure, humidity
+
+class MultivariateNormalWeatherModel(UniformWeatherModel):
+    """This class draws the weather variables of each location and month from
+    a multivariate normal distribution fitted to the baseline historical
+    data, so the temperature, pressure and humidity are correlated. The
+    sample covariance is shrunk towards its diagonal as it is estimated from
+    few samples, and the mean is shifted by the condition of the data point.
+    """
+
+    aggregate_cols = MEAN_COLS + ["T_var", "P_var", "H_var", "TP_cov", "TH_cov", "PH_cov", "T_day_var"]
+
+    def __init__(self, config_data, aggregate_lookup, within_day=True):
+        """
+        Parameters
+        ----------
+        config_data : dict
+            The configuration data.
+        aggregate_lookup : numpy.ndarray
+            The aggregate_cols of each location code and month.
+        within_day : bool, default is True
+            Flag if the temperature variance includes the variance within the
+            day. Otherwise the variance within the day is left to a diurnal
+            cycle of diurnal_amplitude.
+        """
+
+        super().__init__(config_data, aggregate_lookup)
+
+        shrinkage = config_data["simulation"].get("covariance_shrinkage", 0.5)
+        condition_shift = config_data["simulation"].get("condition_shift") or {}
+
+        # Determine that the shrinkage intensity is between 0 and 1.
+        if not 0<=shrinkage<=1:
+            logging.error("The covariance shrinkage is not between 0 and 1. Value: {}.".format(shrinkage))
+            raise ValueError
+
+        # Determine that the condition shifts are of valid conditions.
+        if len(set(condition_shift).difference(self.conditions))!=0:
+            logging.error("Invalid condition shift condition(s): {}. Please check config.yaml file.".format(set(condition_shift).difference(self.conditions)))
+            raise ValueError
+
+        # Build the flat location and month lookup of the mean and of the
+        # covariance square root.
+        cols = {col: idx for idx, col in enumerate(self.aggregate_cols)}
+        parameters = aggregate_lookup.reshape(-1, len(self.aggregate_cols))
+        parameters = np.nan_to_num(parameters)
+        covariance = parameters[:, [[cols[col] for col in row] for row in COVARIANCE_COLS]]
+
+        if within_day:
+            covariance[:, 0, 0] += parameters[:, cols["T_day_var"]]
+
+        diagonal = covariance * np.eye(len(WEATHER_VARIABLES))
+        covariance = (1 - shrinkage) * covariance + shrinkage * diagonal
+
+        eigenvalues, eigenvectors = np.linalg.eigh(covariance)
+        self.mean = parameters[:, [cols[col] for col in MEAN_COLS]]
+        self.scale = eigenvectors * np.sqrt(np.clip(eigenvalues, 0, None))[:, np.newaxis, :]
+
+        # The amplitude of a diurnal temperature cycle with the variance
+        # within the day.
+        self.diurnal_amplitude = np.sqrt(2 * parameters[:, cols["T_day_var"]])
+
+        # The condition shifts are centred so the mean over the conditions
+        # is the fitted mean.
+        self.condition_shift = np.array([[condition_shift.get(condition, {}).get(variable, 0.0) for variable in WEATHER_VARIABLES]
+                                         for condition in self.conditions], dtype=float)
+        self.condition_shift -= self.condition_shift.mean(axis=0)
+        self.months = aggregate_lookup.shape[1]
+
+    def sample(self, location_code, month, streams):
+        """This function draws the weather variables of each data point.
+
+        Parameters
+        ----------
+        location_code : numpy.ndarray
+            The location code of each data point.
+        month : numpy.ndarray
+            The month of each data point.
+        streams : ChunkStreams
+            The random streams of the chunk.
+
+        Returns
+        -------
+        condition_code : numpy.ndarray
+            The position of the condition of each data point in conditions.
+        temperature : numpy.ndarray
+        pressure : numpy.ndarray
+        humidity : numpy.ndarray
+        """
+
+        condition_code = (streams.random("condition") * len(self.conditions)).astype(np.int64)
+        normal = [streams.normal(name) for name in ("temperature", "pressure", "humidity")]
+
+        return (condition_code, ) + self.transform(location_code * self.months + month, condition_code, normal)
+
+    def transform(self, lookup_code, condition_code, normal, diurnal=None):
+        """This function transforms independent standard normal values into
+        the weather variables of each data point.
+
+        Parameters
+        ----------
+        lookup_code : numpy.ndarray
+            The location code times the number of months plus the month of
+            each data point.
+        condition_code : numpy.ndarray
+            The position of the condition of each data point in conditions.
+        normal : list
+            The temperature, pressure and humidity standard normal values.
+        diurnal : numpy.ndarray, default is None
+            The diurnal cycle of each data point between -1 and 1, added to
+            the temperature in units of diurnal_amplitude.
+
+        Returns
+        -------
+        temperature : numpy.ndarray
+        pressure : numpy.ndarray
+        humidity : numpy.ndarray
+        """
+
+        values = []
+
+        # Correlating the standard normal values with the covariance square
+        # root, one row of the 3 x 3 matrix at a time.
+        for idx in range(len(WEATHER_VARIABLES)):
+            value = self.mean[lookup_code, idx] + self.condition_shift[condition_code, idx]
+
+            for jdx in range(len(WEATHER_VARIABLES)):
+                value += self.scale[lookup_code, idx, jdx] * normal[jdx]
+
+            values.append(value)
+
+        if diurnal is not None:
+            values[0] += self.diurnal_amplitude[lookup_code] * diurnal
+
+        temperature = values[0].round(1)
+        pressure = np.clip(values[1], 0, None).round(1)
+        humidity = np.clip(values[2].round(), 0, 100).astype(np.int8)
+
+        return temperature, pressure, humidity
+
+# Valid weather models.
+WEATHER_MODELS = {"uniform": UniformWeatherModel
+                 ,"mvnormal": MultivariateNormalWeatherModel}
+
+def get_weather_model_class(config_data):
+    """This function returns the weather model class selected in config.yaml.
+
+    Parameters
+    ----------
+    config_data : dict
+        The configuration data.
+
+    Returns
+    -------
+    model_class : UniformWeatherModel or MultivariateNormalWeatherModel
+    """
+
+    model_name = config_data["simulation"].get("weather_model", "uniform")
+
+    if model_name not in WEATHER_MODELS:
+        logging.error("Invalid weather model ({}). Please check config.yaml file.".format(model_name))
+        raise ValueError
+
+    return WEATHER_MODELS[model_name]
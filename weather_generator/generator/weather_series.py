@@ -0,0 +1,303 @@
+# Standard Python Library
+import logging.config
+import copy
+import math
+import numpy as np
+
+# Custom Python Library
+from common.config import LoggingConfig
+
+# Load logging.yaml file
+LoggingConfig.configure()
+
+# Time step in seconds of each time series frequency.
+SERIES_FREQUENCIES = {"hourly": 3600
+                     ,"daily": 86400}
+
+# Number of time steps of the blocks the autocorrelated series are computed
+# in. Every block starts its own series a warmup of time steps before the
+# block.
+SERIES_BLOCK_STEPS = 16384
+
+# Largest weight of the values before the warmup on the first value of a
+# block.
+SERIES_TOLERANCE = 1e-9
+
+# Hour of the maximum temperature of the diurnal cycle in local solar time.
+PEAK_HOUR = 15
+
+# Coefficients of the rational approximations of the inverse standard
+# normal cumulative distribution function by P. J. Acklam.
+ACKLAM_A = (-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02
+           ,1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00)
+ACKLAM_B = (-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02
+           ,6.680131188771972e+01, -1.328068155288572e+01)
+ACKLAM_C = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00
+           ,-2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00)
+ACKLAM_D = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00
+           ,3.754408661907416e+00)
+
+def normal_ppf(probability):
+    """This function returns the inverse of the standard normal cumulative
+    distribution function, with the approximation of P. J. Acklam refined by
+    a step of Halley's method to double precision.
+
+    Parameters
+    ----------
+    probability : float
+        The probability between 0 and 1 exclusive.
+
+    Returns
+    -------
+    value : float
+    """
+
+    # Determine that the probability is between 0 and 1 exclusive.
+    if not 0<probability<1:
+        logging.error("The probability is not between 0 and 1. Value: {}.".format(probability))
+        raise ValueError
+
+    def polynomial(coefficients, x):
+        return sum(coefficient * x ** (len(coefficients) - 1 - idx) for idx, coefficient in enumerate(coefficients))
+
+    if probability<0.02425:
+        q = math.sqrt(-2 * math.log(probability))
+        value = polynomial(ACKLAM_C, q) / (polynomial(ACKLAM_D, q) * q + 1)
+    elif probability>1 - 0.02425:
+        q = math.sqrt(-2 * math.log(1 - probability))
+        value = -polynomial(ACKLAM_C, q) / (polynomial(ACKLAM_D, q) * q + 1)
+    else:
+        q = probability - 0.5
+        r = q * q
+        value = polynomial(ACKLAM_A, r) * q / (polynomial(ACKLAM_B, r) * r + 1)
+
+    # Refining the approximation with the exact cumulative distribution.
+    error = 0.5 * math.erfc(-value / math.sqrt(2)) - probability
+    u = error * math.sqrt(2 * math.pi) * math.exp(value * value / 2)
+
+    return value - u / (1 + value * u / 2)
+
+def get_sub_block_size(phi):
+    """This function returns the number of steps of the sub-blocks of the
+    AR(1) filter, which keeps the inverse powers of phi below 1e200.
+
+    Parameters
+    ----------
+    phi : float
+        The autocorrelation of consecutive steps between 0 and 1.
+
+    Returns
+    -------
+    sub_block_size : int
+    """
+
+    return max(1, int(min(256, 200 / -math.log10(phi)))) if 0<phi<1 else 256
+
+def ar1_filter(innovations, phi, state=None):
+    """This function returns the AR(1) series x of innovations e along the
+    first axis, where x[0] = e[0] and x[k] = phi * x[k - 1] + e[k]. The
+    recursion is vectorized within sub-blocks of steps as a cumulative sum.
+
+    Parameters
+    ----------
+    innovations : numpy.ndarray
+        The innovations of each step along the first axis.
+    phi : float
+        The autocorrelation of consecutive steps between 0 and 1.
+    state : numpy.ndarray, default is None
+        The value of the step before the first innovation, continuing a
+        series at the end of one of its sub-blocks, or None to start it.
+
+    Returns
+    -------
+    values : numpy.ndarray
+    """
+
+    if phi==0:
+        return innovations.copy()
+
+    sub_block_size = get_sub_block_size(phi)
+    powers = (phi ** np.arange(sub_block_size)).reshape((-1, ) + (1, ) * (innovations.ndim - 1))
+    values = np.empty_like(innovations)
+    state = np.zeros(innovations.shape[1:]) if state is None else state
+
+    for start in range(0, len(innovations), sub_block_size):
+        block = innovations[start:start + sub_block_size]
+        block_powers = powers[:len(block)]
+        values[start:start + len(block)] = block_powers * (phi * state + np.cumsum(block / block_powers, axis=0))
+        state = values[start + len(block) - 1]
+
+    return values
+
+class WeatherSeries(object):
+    """This class generates contiguous time series of the weather variables
+    of every location, ordered by time step and location. Each location and
+    variable follows a stationary AR(1) series of standard normal values,
+    which the multivariate normal weather model correlates and scales, and
+    the temperature follows a diurnal cycle in hourly series.
+
+    The data point of location l at time step k is the data point
+    k * number_locations + l of the random streams, and the series of a
+    block of SERIES_BLOCK_STEPS time steps starts at a fixed warmup before
+    the block. So any time steps of the series can be generated on their own
+    and the output does not depend on the chunk size. The state of each
+    series at the end of the last chunk is kept, so the next chunks of the
+    block continue the series instead of repeating the warmup.
+    """
+
+    def __init__(self, model, random_streams, longitudes, step, autocorrelation):
+        """
+        Parameters
+        ----------
+        model : MultivariateNormalWeatherModel
+            The weather model of the variables without the variance within
+            the day.
+        random_streams : RandomStreams
+            The random streams of the simulated weather data.
+        longitudes : numpy.ndarray
+            The longitude of each location code.
+        step : int
+            The time step in seconds.
+        autocorrelation : float
+            The autocorrelation of the series one day apart.
+        """
+
+        # Determine that the autocorrelation is between 0 and 1.
+        if not 0<=autocorrelation<1:
+            logging.error("The autocorrelation is not between 0 and 1. Value: {}.".format(autocorrelation))
+            raise ValueError
+
+        self.model = model
+        self.random_streams = random_streams
+        self.longitudes = np.asarray(longitudes, dtype=float)
+        self.number_locations = len(self.longitudes)
+        self.step = step
+        self.phi = autocorrelation ** (step / SERIES_FREQUENCIES["daily"])
+        self.warmup = int(math.ceil(math.log(SERIES_TOLERANCE) / math.log(self.phi))) if self.phi>0 else 0
+
+        # The conditions are the equal probability intervals of a standard
+        # normal series, in the order of their temperature shift so a change
+        # of condition shifts the temperature the least.
+        self.condition_thresholds = np.array([normal_ppf(idx / len(model.conditions))
+                                              for idx in range(1, len(model.conditions))])
+        self.condition_order = np.argsort(model.condition_shift[:, 0], kind="stable")
+        self.sub_block_size = get_sub_block_size(self.phi)
+        self.series_states = {}
+
+    def copy(self, random_streams):
+        """This function returns a copy of the weather series drawn from other
+        random streams.
+
+        Parameters
+        ----------
+        random_streams : RandomStreams
+            The random streams of the copy.
+
+        Returns
+        -------
+        weather_series : WeatherSeries
+        """
+
+        weather_series = copy.copy(self)
+        weather_series.random_streams = random_streams
+        weather_series.series_states = {}
+
+        return weather_series
+
+    def get_series(self, name, step_start, step_end):
+        """This function returns the standard normal AR(1) series of a random
+        stream of every location between two time steps.
+
+        Parameters
+        ----------
+        name : string
+            The name of the random stream.
+        step_start : int
+            The first time step.
+        step_end : int
+            The time step after the last time step.
+
+        Returns
+        -------
+        series : numpy.ndarray
+            The series with the time steps as rows and the location codes as
+            columns.
+        """
+
+        series = np.empty((step_end - step_start, self.number_locations))
+
+        for block in range(step_start // SERIES_BLOCK_STEPS, (step_end - 1) // SERIES_BLOCK_STEPS + 1):
+            block_start = max(step_start, block * SERIES_BLOCK_STEPS)
+            block_end = min(step_end, (block + 1) * SERIES_BLOCK_STEPS)
+            warmup_start = max(0, block * SERIES_BLOCK_STEPS - self.warmup)
+            filter_start = warmup_start
+            state = None
+
+            # Continuing the series of the block from the end of the last
+            # chunk. The series is continued at the end of a sub-block of the
+            # filter, which gives the same values as filtering from the
+            # warmup.
+            series_state = self.series_states.get(name)
+
+            if series_state is not None and series_state[0]==block and series_state[1]<=block_start:
+                _, filter_start, state = series_state
+
+            # The first value is drawn from the stationary distribution.
+            innovations = self.random_streams.normal(name
+                                                    ,filter_start * self.number_locations
+                                                    ,(block_end - filter_start) * self.number_locations).reshape(-1, self.number_locations)
+            innovations[1 if filter_start==warmup_start else 0:] *= math.sqrt(1 - self.phi ** 2)
+
+            values = ar1_filter(innovations, self.phi, state)
+            series[block_start - step_start:block_end - step_start] = values[block_start - filter_start:]
+
+            # Keeping the state at the end of the last whole sub-block.
+            state_start = warmup_start + (block_end - warmup_start) // self.sub_block_size * self.sub_block_size
+
+            if state_start>filter_start:
+                self.series_states[name] = (block, state_start, values[state_start - filter_start - 1].copy())
+
+        return series
+
+    def sample(self, chunk_start, location_code, month, timestamps):
+        """This function generates the weather variables of the data points
+        of a chunk.
+
+        Parameters
+        ----------
+        chunk_start : int
+            The position of the first data point of the chunk.
+        location_code : numpy.ndarray
+            The location code of each data point.
+        month : numpy.ndarray
+            The month of each data point.
+        timestamps : numpy.ndarray
+            The timestamp of each data point as epoch seconds.
+
+        Returns
+        -------
+        condition_code : numpy.ndarray
+            The position of the condition of each data point in conditions.
+        temperature : numpy.ndarray
+        pressure : numpy.ndarray
+        humidity : numpy.ndarray
+        """
+
+        # Initialising function variables
+        number_data = len(location_code)
+        step_start = chunk_start // self.number_locations
+        step_end = (chunk_start + number_data - 1) // self.number_locations + 1
+        rows = slice(chunk_start - step_start * self.number_locations, chunk_start - step_start * self.number_locations + number_data)
+
+        condition_series = self.get_series("condition", step_start, step_end).ravel()[rows]
+        condition_code = self.condition_order[np.searchsorted(self.condition_thresholds, condition_series)]
+        normal = [self.get_series(name, step_start, step_end).ravel()[rows] for name in ("temperature", "pressure", "humidity")]
+
+        # The diurnal cycle is in local solar time of the location longitude.
+        diurnal = None
+
+        if self.step<SERIES_FREQUENCIES["daily"]:
+            solar_hour = (timestamps % 86400) / 3600 + self.longitudes[location_code] / 15
+            diurnal = np.cos(2 * np.pi * (solar_hour - PEAK_HOUR) / 24)
+
+        return (condition_code, ) + self.model.transform(location_code * self.model.months + month, condition_code, normal, diurnal)
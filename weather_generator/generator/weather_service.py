@@ -0,0 +1,417 @@
+# Standard Python Library
+import asyncio
+import logging.config
+import os
+import signal
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+# Custom Python Library
+from common.config import LoggingConfig
+from generator.output_sink import BufferSink
+from generator.output_writer import get_output_writer
+
+# Load logging.yaml file
+LoggingConfig.configure()
+
+# Content type of each output format of the responses.
+CONTENT_TYPES = {"csv": "text/csv; charset=utf-8"
+                ,"parquet": "application/vnd.apache.parquet"
+                ,"arrow": "application/vnd.apache.arrow.file"}
+
+# Number of data points of the first chunk of a response. The next chunks
+# double up to the chunk size, so the first data points are sent without
+# waiting for a full chunk.
+FIRST_CHUNK_SIZE = 1024
+
+# Maximum number of bytes of the request line and headers.
+MAX_REQUEST_SIZE = 65536
+
+# Reason phrase of each response status.
+STATUS_REASONS = {200: "OK"
+                 ,400: "Bad Request"
+                 ,404: "Not Found"
+                 ,405: "Method Not Allowed"}
+
+class WeatherService(object):
+    """This class serves the simulated weather data over HTTP on a TCP or Unix
+    domain socket. The configuration and baseline data sets are read once by
+    the WeatherDataGen instance, and each request generates its data points
+    from a copy of it on a pool of worker threads. The response is streamed
+    in chunks as they are generated, and a slow client blocks the generation
+    of its request. The requests are
+
+        GET /generate?rows=<rows>&seed=<seed>&format=<csv|parquet|arrow>
+        GET /health
+
+    The same seed gives the same data points as run.py.
+    """
+
+    def __init__(self, generator, workers=4, chunk_size=None, max_rows=None):
+        """
+        Parameters
+        ----------
+        generator : WeatherDataGen
+            The weather data generator the requests are copied from.
+        workers : int, default is 4
+            The number of threads generating the requested data points.
+        chunk_size : int, default is None
+            The maximum number of data points generated at a time. Defaults
+            to chunk_size in config.yaml.
+        max_rows : int, default is None
+            The maximum number of data points of a request, or None for no
+            maximum.
+        """
+
+        # Determine that workers is more than 0.
+        if workers<1:
+            logging.error("The number of workers is less than 1. Value: {}.".format(workers))
+            raise ValueError
+
+        self.generator = generator
+        self.config_data = generator.config_data
+        self.chunk_size = chunk_size or self.config_data["simulation"]["chunk_size"]
+        self.max_rows = max_rows
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="WeatherService")
+
+    def get_chunks(self, number_data):
+        """This function splits the data points of a request into chunks of
+        FIRST_CHUNK_SIZE data points doubling up to chunk_size.
+
+        Parameters
+        ----------
+        number_data : int
+            The number of data points of the request.
+
+        Returns
+        -------
+        chunks : list of tuple
+            The position of the first data point and the number of data
+            points of each chunk.
+        """
+
+        chunks = []
+        chunk_start = 0
+        chunk_size = min(FIRST_CHUNK_SIZE, self.chunk_size)
+
+        while chunk_start<number_data:
+            chunks.append((chunk_start, min(chunk_size, number_data - chunk_start)))
+            chunk_start += chunk_size
+            chunk_size = min(2 * chunk_size, self.chunk_size)
+
+        return chunks
+
+    def parse_query(self, query):
+        """This function returns the parameters of a generate request.
+
+        Parameters
+        ----------
+        query : string
+            The query string of the request URL.
+
+        Returns
+        -------
+        number_data : int
+            The number of data points.
+        seed : int
+            The master seed, or None for the seed in config.yaml.
+        output_format : string
+            The output format.
+        """
+
+        params = {key: values[-1] for key, values in urllib.parse.parse_qs(query, keep_blank_values=True).items()}
+        output_format = params.get("format", self.config_data["simulation"].get("output_format", "csv"))
+
+        try:
+            number_data = int(params["rows"])
+            seed = int(params["seed"]) if params.get("seed", "")!="" else None
+        except (KeyError, ValueError):
+            raise ValueError("The rows parameter is required and the rows and seed parameters are integers.")
+
+        if number_data<1:
+            raise ValueError("The rows parameter is less than 1.")
+
+        if self.max_rows is not None and number_data>self.max_rows:
+            raise ValueError("The rows parameter is more than {}.".format(self.max_rows))
+
+        if seed is not None and seed<0:
+            raise ValueError("The seed parameter is negative.")
+
+        if output_format not in CONTENT_TYPES:
+            raise ValueError("Invalid format ({}). Valid values are {}.".format(output_format, ", ".join(CONTENT_TYPES)))
+
+        return number_data, seed, output_format
+
+    def open_writer(self, output_format):
+        """This function opens the output writer of the output format on a
+        memory output sink.
+
+        Parameters
+        ----------
+        output_format : string
+            The output format.
+
+        Returns
+        -------
+        writer : PandasCsvWriter, FastCsvWriter, ParquetWriter or ArrowWriter
+        sink : BufferSink
+        """
+
+        config_data = dict(self.config_data, simulation=dict(self.config_data["simulation"], output_format=output_format))
+        sink = BufferSink()
+
+        return get_output_writer(config_data, stream=sink), sink
+
+    @staticmethod
+    def write_chunk(generator, writer, sink, chunk):
+        """This function generates and serialises a chunk. It is run on the
+        worker threads.
+
+        Parameters
+        ----------
+        generator : WeatherDataGen
+            The weather data generator of the request.
+        writer : PandasCsvWriter, FastCsvWriter, ParquetWriter or ArrowWriter
+            The output writer of the request.
+        sink : BufferSink
+            The memory output sink of the writer.
+        chunk : tuple
+            The position of the first data point and the number of data
+            points of the chunk, or None to close the writer.
+
+        Returns
+        -------
+        data : bytes
+            The serialised data to be sent.
+        """
+
+        if chunk is None:
+            writer.close()
+        else:
+            writer.write(generator.generate_chunk(*chunk))
+
+        return sink.take()
+
+    @staticmethod
+    async def send(stream_writer, data, chunked=True):
+        """This function sends data to the client, waiting while the send
+        buffer is full.
+
+        Parameters
+        ----------
+        stream_writer : asyncio.StreamWriter
+            The client stream.
+        data : bytes
+            The data to be sent.
+        chunked : bool, default is True
+            Flag if the data is sent as a chunk of the chunked transfer
+            encoding.
+        """
+
+        if chunked and len(data)>0:
+            stream_writer.writelines([b"%x\r\n" % len(data), data, b"\r\n"])
+        elif not chunked:
+            stream_writer.write(data)
+
+        await stream_writer.drain()
+
+    async def send_headers(self, stream_writer, status, content_type, headers=None, content_length=None):
+        """This function sends the status line and headers of a response.
+
+        Parameters
+        ----------
+        stream_writer : asyncio.StreamWriter
+            The client stream.
+        status : int
+            The response status.
+        content_type : string
+            The content type of the response body.
+        headers : dict, default is None
+            The additional headers.
+        content_length : int, default is None
+            The length of the response body, or None for the chunked transfer
+            encoding.
+        """
+
+        lines = ["HTTP/1.1 {} {}".format(status, STATUS_REASONS[status])
+                ,"Content-Type: {}".format(content_type)
+                ,"Connection: close"]
+
+        if content_length is None:
+            lines.append("Transfer-Encoding: chunked")
+        else:
+            lines.append("Content-Length: {}".format(content_length))
+
+        lines.extend("{}: {}".format(key, value) for key, value in (headers or {}).items())
+
+        await self.send(stream_writer, ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"), chunked=False)
+
+    async def send_text(self, stream_writer, status, text):
+        """This function sends a plain text response.
+
+        Parameters
+        ----------
+        stream_writer : asyncio.StreamWriter
+            The client stream.
+        status : int
+            The response status.
+        text : string
+            The response body.
+        """
+
+        body = (text + "\n").encode("utf-8")
+
+        await self.send_headers(stream_writer, status, "text/plain; charset=utf-8", content_length=len(body))
+        await self.send(stream_writer, body, chunked=False)
+
+    async def stream_data(self, stream_writer, number_data, seed, output_format):
+        """This function streams the simulated weather data of a request.
+        The next chunk is generated while the previous chunk is sent.
+
+        Parameters
+        ----------
+        stream_writer : asyncio.StreamWriter
+            The client stream.
+        number_data : int
+            The number of data points.
+        seed : int
+            The master seed, or None for the seed in config.yaml.
+        output_format : string
+            The output format.
+        """
+
+        # Initialising function variables
+        loop = asyncio.get_event_loop()
+        generator = self.generator.clone(number_data, seed)
+        writer, sink = self.open_writer(output_format)
+        chunks = self.get_chunks(generator.number_simulated_data) + [None]
+
+        await self.send_headers(stream_writer, 200, CONTENT_TYPES[output_format]
+                               ,headers={"X-Seed": generator.seed, "X-Rows": generator.number_simulated_data})
+
+        future = loop.run_in_executor(self.executor, self.write_chunk, generator, writer, sink, chunks[0])
+
+        for chunk in chunks[1:]:
+            data = await future
+            future = loop.run_in_executor(self.executor, self.write_chunk, generator, writer, sink, chunk)
+
+            await self.send(stream_writer, data)
+
+        await self.send(stream_writer, await future)
+        await self.send(stream_writer, b"0\r\n\r\n", chunked=False)
+
+    async def handle(self, stream_reader, stream_writer):
+        """This function handles a client connection of one request.
+
+        Parameters
+        ----------
+        stream_reader : asyncio.StreamReader
+            The client request stream.
+        stream_writer : asyncio.StreamWriter
+            The client response stream.
+        """
+
+        start_time = time.perf_counter()
+
+        try:
+            request = await stream_reader.readuntil(b"\r\n\r\n")
+            request_line = request.split(b"\r\n", 1)[0].decode("latin-1").split(" ")
+            url = urllib.parse.urlsplit(request_line[1] if len(request_line)==3 else "")
+
+            if len(request_line)!=3:
+                await self.send_text(stream_writer, 400, "Invalid request line.")
+            elif url.path not in ("/generate", "/health"):
+                await self.send_text(stream_writer, 404, "Valid paths are /generate and /health.")
+            elif request_line[0]!="GET":
+                await self.send_text(stream_writer, 405, "Valid method is GET.")
+            elif url.path=="/health":
+                await self.send_text(stream_writer, 200, "OK")
+            else:
+                try:
+                    number_data, seed, output_format = self.parse_query(url.query)
+                except ValueError as error:
+                    logging.warning("Invalid generate request ({}). {}".format(url.query, error))
+                    await self.send_text(stream_writer, 400, str(error))
+                else:
+                    await self.stream_data(stream_writer, number_data, seed, output_format)
+
+                    logging.info("Served {} data point(s) of seed {} in {} format in {:.3f} seconds.".format(number_data, seed, output_format
+                                                                                                           ,time.perf_counter() - start_time))
+
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError) as error:
+            logging.warning("Client connection closed before the end of the request. Error: {}.".format(error or type(error).__name__))
+
+        finally:
+            stream_writer.close()
+
+            # Python 3.6 has no wait_closed on the client stream.
+            if hasattr(stream_writer, "wait_closed"):
+                try:
+                    await stream_writer.wait_closed()
+                except ConnectionError:
+                    pass
+
+    async def start(self, host="127.0.0.1", port=8080, unix_socket=None):
+        """This function starts listening on a TCP port, or on a Unix domain
+        socket.
+
+        Parameters
+        ----------
+        host : string, default is '127.0.0.1'
+            The host address.
+        port : int, default is 8080
+            The TCP port, or 0 for any free port.
+        unix_socket : string, default is None
+            The Unix domain socket path, used instead of the TCP port.
+
+        Returns
+        -------
+        server : asyncio.Server
+        """
+
+        if unix_socket is not None:
+            server = await asyncio.start_unix_server(self.handle, path=unix_socket, limit=MAX_REQUEST_SIZE)
+        else:
+            server = await asyncio.start_server(self.handle, host, port, limit=MAX_REQUEST_SIZE)
+
+        logging.info("Serving simulated weather data on {}.".format(unix_socket or "http://{}:{}".format(*server.sockets[0].getsockname()[:2])))
+
+        return server
+
+    async def serve(self, host="127.0.0.1", port=8080, unix_socket=None):
+        """This function serves the requests until the process is interrupted
+        or terminated.
+
+        Parameters
+        ----------
+        host : string, default is '127.0.0.1'
+            The host address.
+        port : int, default is 8080
+            The TCP port.
+        unix_socket : string, default is None
+            The Unix domain socket path, used instead of the TCP port.
+        """
+
+        loop = asyncio.get_event_loop()
+        server = await self.start(host, port, unix_socket)
+        stop = asyncio.Event()
+
+        for signal_number in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signal_number, stop.set)
+            except (NotImplementedError, RuntimeError):
+                pass
+
+        try:
+            await stop.wait()
+        finally:
+            server.close()
+            await server.wait_closed()
+
+        self.executor.shutdown(wait=True)
+
+        if unix_socket is not None and os.path.exists(unix_socket):
+            os.remove(unix_socket)
+
+        logging.info("Stopped serving simulated weather data.")
@@ -1,14 +1,23 @@
 # Standard Python Library
 import argparse
+import cProfile
+import json
 import logging.config
+import os
+import sys
 import time
 
 # Custom Python Library
 from common.config import LoggingConfig
+from common.import_profiler import report_import_times
+from common.logging_utils import set_console_stream
+from common.profiler import StageProfiler
+from common.utils import get_config
+from generator.output_sink import get_output_sink_name
 from generator.weather_data_generator import WeatherDataGen
 
 # Load logging.yaml file
-logging.config.dictConfig(LoggingConfig.logging_config)
+LoggingConfig.configure()
 
 if __name__ == "__main__":
     """This is the main class that runs the rest of the
@@ -20,9 +29,9 @@ if __name__ == "__main__":
     
     parser.add_argument(
         "--number_simulated_data"
-       ,help = "The number weather data to be generated."
+       ,help = "The number weather data to be generated. Required unless --profile_import is set."
        ,type = int
-       ,required = True 
+       ,default = None
     )
     
     parser.add_argument(
@@ -32,28 +41,146 @@ if __name__ == "__main__":
        ,default = "False"
     )
     
+    parser.add_argument(
+        "--chunk_size"
+       ,help = "The maximum number of weather data generated and saved at a time. Defaults to chunk_size in config.yaml."
+       ,type = int
+       ,default = None
+    )
+    
+    parser.add_argument(
+        "--workers"
+       ,help = "The number of processes generating the weather data chunks."
+       ,type = int
+       ,default = 1
+    )
+    
+    parser.add_argument(
+        "--seed"
+       ,help = "The master seed of the simulated weather data. The same seed gives the same output for any chunk size and number of workers."
+       ,type = int
+       ,default = None
+    )
+    
+    parser.add_argument(
+        "--output_sink", "--output-sink"
+       ,help = "The output sink of the simulated weather data: file, stdout, fifo or socket. Defaults to output_sink in config.yaml."
+       ,type = str
+       ,default = None
+    )
+    
+    parser.add_argument(
+        "--output_sink_path", "--output-sink-path"
+       ,help = "The output file, named pipe or Unix domain socket path. Defaults to output_sink_path in config.yaml."
+       ,type = str
+       ,default = None
+    )
+    
+    parser.add_argument(
+        "--profile_import", "--profile-import"
+       ,help = "Report the import time of run.py and of each package it imports, then exit."
+       ,action = "store_true"
+    )
+    
+    parser.add_argument(
+        "--profile"
+       ,help = "Print the JSON report of the time, rows per second and peak memory of each stage and chunk, or write it to the given file."
+       ,nargs = "?"
+       ,const = "-"
+       ,default = None
+    )
+    
+    parser.add_argument(
+        "--profile_memory", "--profile-memory"
+       ,help = "Trace the peak memory allocated during each stage with tracemalloc in the --profile report."
+       ,action = "store_true"
+    )
+    
+    parser.add_argument(
+        "--profile_output", "--profile-output"
+       ,help = "The file the cProfile statistics of the run are dumped to."
+       ,type = str
+       ,default = None
+    )
+    
     # Parse the input arguments.
     args = parser.parse_args()
     arguments = args.__dict__
     
+    # Report the import time in a new interpreter and exit.
+    if arguments.pop("profile_import"):
+        report_import_times("run")
+        sys.exit(0)
+    
+    if arguments["number_simulated_data"] is None:
+        parser.error("the following arguments are required: --number_simulated_data")
+    
     number_simulated_data=arguments.pop("number_simulated_data")
+    chunk_size=arguments.pop("chunk_size")
+    workers=arguments.pop("workers")
+    seed=arguments.pop("seed")
+    output_sink=get_output_sink_name(get_config(), arguments.pop("output_sink"))
+    output_sink_path=arguments.pop("output_sink_path")
+    profile_output=arguments.pop("profile_output")
+    profile_report=arguments.pop("profile")
+    
+    if profile_report is None and arguments["profile_memory"]:
+        profile_report = "-"
+    
+    profiler = StageProfiler(enabled=profile_report is not None
+                            ,trace_memory=arguments.pop("profile_memory"))
     
     if arguments.pop("generate_baseline_flag").lower() in ("yes", "true", "t", "y", "1"):
         generate_baseline_flag = True
     else:
         generate_baseline_flag = False
     
+    # The console log is moved to the standard error so it is not mixed with
+    # the output data.
+    if output_sink=="stdout":
+        set_console_stream(sys.stderr)
+    
     # Start the data pipeline execution.
     start_time = time.time()
     
     logging.info("Running weather data generator with number_simulated_data: {} and generate_baseline_flag: {}.".format(number_simulated_data, generate_baseline_flag))
     
+    if profile_output is not None:
+        profile = cProfile.Profile()
+        profile.enable()
+    
     wdg = WeatherDataGen(number_simulated_data=number_simulated_data
-                        ,generate_baseline_flag=generate_baseline_flag)
-    wdg.generate()
+                        ,generate_baseline_flag=generate_baseline_flag
+                        ,seed=seed
+                        ,profiler=profiler)
+    
+    if chunk_size is None:
+        chunk_size = wdg.config_data["simulation"]["chunk_size"]
+    
+    # Generate and save the output_data in a csv file in chunks.
+    try:
+        report = wdg.save_output_iter(chunk_size=chunk_size, workers=workers, sink=output_sink, sink_path=output_sink_path)
+    except (BrokenPipeError, ConnectionResetError):
+        logging.error("The consumer closed the {} output sink before the end of the output data.".format(output_sink))
+        
+        # Discard the standard output flushed on exit.
+        if output_sink=="stdout":
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        
+        sys.exit(1)
+    
+    if profile_output is not None:
+        profile.disable()
+        profile.dump_stats(profile_output)
+        logging.info("Saved cProfile statistics in {}.".format(profile_output))
     
-    # Save the output_data in a csv file.
-    wdg.save_output()
+    if profile_report=="-":
+        print(json.dumps(report, indent=2), file=sys.stderr if output_sink=="stdout" else sys.stdout)
+    elif profile_report is not None:
+        with open(profile_report, "w") as file:
+            json.dump(report, file, indent=2)
+        
+        logging.info("Saved profile report in {}.".format(profile_report))
     
     elapsed_time = time.time() - start_time
     
@@ -0,0 +1,84 @@
+# Standard Python Library
+import argparse
+import asyncio
+import logging.config
+
+# Custom Python Library
+from common.config import LoggingConfig
+from common.utils import get_config
+from generator.weather_data_generator import WeatherDataGen
+from generator.weather_service import WeatherService
+
+# Load logging.yaml file
+LoggingConfig.configure()
+
+if __name__ == "__main__":
+    """This is the main class that runs the weather data generator service,
+    which reads the configuration and baseline data sets once and serves the
+    simulated weather data over HTTP until it is interrupted.
+    """
+
+    # Initialise the argument parser.
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument(
+        "--host"
+       ,help = "The host address of the service. Defaults to host in the service key of config.yaml."
+       ,type = str
+       ,default = None
+    )
+
+    parser.add_argument(
+        "--port"
+       ,help = "The TCP port of the service. Defaults to port in the service key of config.yaml."
+       ,type = int
+       ,default = None
+    )
+
+    parser.add_argument(
+        "--unix_socket", "--unix-socket"
+       ,help = "The Unix domain socket path of the service, used instead of the TCP port. Defaults to unix_socket in the service key of config.yaml."
+       ,type = str
+       ,default = None
+    )
+
+    parser.add_argument(
+        "--workers"
+       ,help = "The number of threads generating the requested weather data. Defaults to workers in the service key of config.yaml."
+       ,type = int
+       ,default = None
+    )
+
+    parser.add_argument(
+        "--chunk_size"
+       ,help = "The maximum number of weather data generated at a time. Defaults to chunk_size in config.yaml."
+       ,type = int
+       ,default = None
+    )
+
+    # Parse the input arguments.
+    args = parser.parse_args()
+    service_config = get_config().get("service") or {}
+
+    host = args.host or service_config.get("host", "127.0.0.1")
+    port = service_config.get("port", 8080) if args.port is None else args.port
+    unix_socket = args.unix_socket or service_config.get("unix_socket")
+    workers = args.workers or service_config.get("workers", 4)
+
+    logging.info("Starting weather data generator service.")
+
+    # The configuration and baseline data sets are read once, and each
+    # request is generated from a copy of the generator.
+    wdg = WeatherDataGen(number_simulated_data=1)
+    service = WeatherService(wdg
+                            ,workers=workers
+                            ,chunk_size=args.chunk_size
+                            ,max_rows=service_config.get("max_rows"))
+
+    # asyncio.run is not used as it requires Python 3.7.
+    loop = asyncio.new_event_loop()
+
+    try:
+        loop.run_until_complete(service.serve(host=host, port=port, unix_socket=unix_socket))
+    finally:
+        loop.close()
@@ -119,7 +119,7 @@ class DataTestCase(unittest.TestCase):
         """Checks if the local time is in ISO8601 format.
         """
         
-        for value in self.generator.output_data["Local Time"]:
+        for value in self.generator.format_output()["Local Time"]:
             self.assertTrue(datetime.datetime.strptime(value, "%Y-%m-%dT%H:%M:%SZ"))
 
 if __name__ == '__main__':
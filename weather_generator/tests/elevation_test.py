@@ -0,0 +1,171 @@
+# Standard Python Library
+import numpy as np
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+import unittest.mock
+import rasterio as rio
+from rasterio.transform import from_bounds
+
+# Custom Python Library
+from generator.elevation_index import ElevationIndex, build_elevation_index
+from generator import generate_baseline_data
+from generator.generate_baseline_data import get_elevation_batch, get_grid_ids
+from generator.raster_pool import RasterPool
+from common.utils import get_config
+
+def write_elevation_tiles(config_data, size=360):
+    """This function writes synthetic elevation tif files for every grid_id
+    of config_data with size x size pixels.
+
+    Parameters
+    ----------
+    config_data : dict
+        The gis configuration data with input_subdirectory as the tif folder.
+    size : int, default is 360
+        The number of rows and columns of each tif file.
+    """
+
+    for lat_value in config_data["latitude_condition"].values():
+        for lon_value in config_data["longitude_condition"].values():
+            grid_id = lon_value["grid_lon"] + lat_value["grid_lat"]
+            transform = from_bounds(lon_value["min_lon"], lat_value["min_lat"]
+                                   ,lon_value["max_lon"], lat_value["max_lat"], size, size)
+            band = (np.add.outer(np.arange(size), np.arange(size)) + ord(grid_id[0]) * int(grid_id[1])) % 256
+
+            with rio.open(os.path.join(config_data["input_subdirectory"], config_data["input_file_name"].format(grid_id=grid_id))
+                         ,"w", driver="GTiff", height=size, width=size, count=1
+                         ,dtype="uint8", crs="EPSG:4326", transform=transform) as file:
+                file.write(band.astype("uint8"), 1)
+
+class ElevationTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+
+        cls.directory = tempfile.mkdtemp()
+        cls.config_data = dict(get_config()["gis"], input_subdirectory=cls.directory)
+        write_elevation_tiles(cls.config_data)
+
+    @classmethod
+    def tearDownClass(cls):
+
+        shutil.rmtree(cls.directory)
+
+    def test_get_grid_ids(self):
+        """Checks if the get_grid_ids method returns the grid_id of each
+        coordinate, with boundary coordinates in the last condition.
+        """
+
+        grid_ids = get_grid_ids(self.config_data, [-33.87, 39.9, 0.0, 51.51], [151.21, 116.4, -90.0, -0.13])
+
+        self.assertEqual(grid_ids.tolist(), ["D2", "D1", "B2", "B1"])
+
+        with self.assertRaises(ValueError):
+            get_grid_ids(self.config_data, [-33.87, 91.0], [151.21, 0.0])
+
+    def test_get_elevation_batch(self):
+        """Checks if the get_elevation_batch method returns the same elevation
+        as sampling each coordinate with rasterio.
+        """
+
+        random_state = np.random.RandomState(0)
+        coords = np.column_stack([random_state.uniform(-89.9, 89.9, 2000), random_state.uniform(-179.9, 179.9, 2000)])
+        elevs = get_elevation_batch(coords, self.config_data)
+
+        for (lat, lon), elev in list(zip(coords, elevs))[:200]:
+            grid_id = get_grid_ids(self.config_data, [lat], [lon])[0]
+
+            with rio.open(os.path.join(self.directory, self.config_data["input_file_name"].format(grid_id=grid_id))) as file:
+                self.assertEqual(elev, next(file.sample([(lon, lat)]))[0])
+
+    def test_get_elevation_batch_far_apart(self):
+        """Checks if the get_elevation_batch method reads far apart
+        coordinates of a tile in small windows instead of the window bounding
+        them.
+        """
+
+        coords = [(-89.9, 90.1), (-0.1, 179.9), (-0.2, 179.8)]
+        windows = []
+        read = rio.io.DatasetReader.read
+
+        def read_window(dataset, *args, **kwargs):
+            windows.append(kwargs["window"])
+            return read(dataset, *args, **kwargs)
+
+        with unittest.mock.patch.object(generate_baseline_data, "MAX_WINDOW_PIXELS", 100) \
+            ,unittest.mock.patch.object(generate_baseline_data, "CLUSTER_CELL_PIXELS", 8) \
+            ,unittest.mock.patch.object(rio.io.DatasetReader, "read", read_window):
+            elevs = get_elevation_batch(coords, self.config_data)
+
+        with rio.open(os.path.join(self.directory, self.config_data["input_file_name"].format(grid_id="D2"))) as file:
+            self.assertEqual(elevs.tolist(), [value[0] for value in file.sample([(lon, lat) for lat, lon in coords])])
+
+        self.assertEqual(len(windows), 2)
+        self.assertTrue(all(window.width * window.height<=100 for window in windows))
+
+    def test_raster_pool_lru(self):
+        """Checks if the raster pool keeps max_open datasets open and closes
+        the least recently used dataset.
+        """
+
+        pool = RasterPool(max_open=2)
+        file_paths = [os.path.join(self.directory, self.config_data["input_file_name"].format(grid_id=grid_id)) for grid_id in ("A1", "B1", "C1")]
+        dataset = pool.get(file_paths[0])
+
+        self.assertIs(pool.get(file_paths[0]), dataset)
+
+        pool.get(file_paths[1])
+        pool.get(file_paths[2])
+
+        self.assertEqual(len(pool), 2)
+        self.assertTrue(dataset.closed)
+
+        pool.close()
+
+class ElevationIndexTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+
+        cls.directory = tempfile.mkdtemp()
+        cls.config_data = dict(get_config()["gis"], input_subdirectory=cls.directory)
+        write_elevation_tiles(cls.config_data)
+        build_elevation_index(cls.config_data, os.path.join(cls.directory, "index"))
+        cls.index = ElevationIndex(os.path.join(cls.directory, "index"))
+
+    @classmethod
+    def tearDownClass(cls):
+
+        shutil.rmtree(cls.directory)
+
+    def test_lookup(self):
+        """Checks if the elevation index returns the same elevation as the
+        get_elevation_batch method, including the tile boundaries.
+        """
+
+        random_state = np.random.RandomState(1)
+        lats = np.concatenate([random_state.uniform(-90, 90, 5000), [0.0, 90.0, -90.0, 0.0]])
+        lons = np.concatenate([random_state.uniform(-180, 180, 5000), [-90.0, 180.0, -180.0, 0.0]])
+
+        np.testing.assert_array_equal(self.index.lookup(lats, lons)
+                                     ,get_elevation_batch(np.column_stack([lats, lons]), self.config_data))
+
+        with self.assertRaises(ValueError):
+            self.index.lookup([91.0], [0.0])
+
+    def test_pickle(self):
+        """Checks if pickling the elevation index, as the process pool does,
+        excludes the memory-mapped tiles.
+        """
+
+        self.index.lookup([-33.87], [151.21])
+        data = pickle.dumps(self.index)
+
+        self.assertLess(len(data), 10000)
+        self.assertEqual(pickle.loads(data).lookup([-33.87], [151.21]).tolist(), self.index.lookup([-33.87], [151.21]).tolist())
+
+if __name__ == '__main__':
+    unittest.main()
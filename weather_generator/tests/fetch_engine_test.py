@@ -0,0 +1,153 @@
+# Standard Python Library
+import datetime
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+import requests
+from geopy.geocoders import Nominatim
+
+# Custom Python Library
+from generator.fetch_engine import FetchEngine, TokenBucket
+from generator.generate_baseline_data import fetch_forecast, get_historical_sample
+from generator.response_cache import ResponseCache
+from common.utils import get_config
+
+class StubHandler(BaseHTTPRequestHandler):
+    """This class stands in for the Dark Sky and Nominatim APIs.
+    """
+
+    flaky_failures = 0
+
+    def do_GET(self):
+
+        if self.path.startswith("/forecast/"):
+            body = {"timezone": "Australia/Sydney"
+                   ,"daily": {"data": [{"temperatureMin": 18.7
+                                       ,"temperatureMax": 21.61
+                                       ,"humidity": 0.81
+                                       ,"pressure": 1014.27}]}}
+
+        elif self.path.startswith("/search"):
+            body = [{"lat": "-33.8548157", "lon": "151.2164539", "display_name": "Sydney, Australia"}]
+
+        elif self.path.startswith("/flaky") and StubHandler.flaky_failures>0:
+            StubHandler.flaky_failures -= 1
+            self.send_response(500)
+            self.end_headers()
+            return
+
+        else:
+            body = {"status": "ok"}
+
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+class StubServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+def get_json(url):
+    response = requests.get(url)
+    response.raise_for_status()
+
+    return response.json()
+
+class FetchEngineTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+
+        cls.server = StubServer(("127.0.0.1", 0), StubHandler)
+        cls.url = "http://127.0.0.1:{}".format(cls.server.server_port)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+
+        self.config_data = get_config()
+
+    def test_request_retries(self):
+        """Checks if the request method retries failed requests and counts
+        every attempt in the request budget.
+        """
+        StubHandler.flaky_failures = 2
+        engine = FetchEngine(max_retries=3, backoff_base=0.01)
+
+        self.assertEqual(engine.request(get_json, self.url + "/flaky"), {"status": "ok"})
+        self.assertEqual(engine.budget.used, 3)
+
+    def test_request_budget(self):
+        """Checks if the request method stops once the request budget is
+        exhausted.
+        """
+        StubHandler.flaky_failures = 10
+        engine = FetchEngine(max_retries=5, backoff_base=0.01, request_budget=2)
+
+        with self.assertRaises(RuntimeError):
+            engine.request(get_json, self.url + "/flaky")
+
+    def test_token_bucket_rate(self):
+        """Checks if the token bucket limits the request rate.
+        """
+        bucket = TokenBucket(rate=50, capacity=1)
+        start_time = time.monotonic()
+
+        for _ in range(11):
+            bucket.acquire()
+
+        self.assertGreaterEqual(time.monotonic() - start_time, 0.19)
+
+    def test_map_order(self):
+        """Checks if the map method returns the results in order.
+        """
+        engine = FetchEngine(concurrency=4)
+
+        self.assertEqual(engine.map(lambda x: x * 2, range(20)), [x * 2 for x in range(20)])
+
+    def test_fetch_forecast(self):
+        """Checks if the fetch_forecast method retrieves the historical
+        forecast from the forecast_url.
+        """
+        config_data = dict(self.config_data, gis=dict(self.config_data["gis"], forecast_url=self.url + "/forecast/{api_key}/{lat},{lon},{time}?units=si"))
+        forecast = fetch_forecast(config_data, -33.85, 151.22, datetime.datetime(2011, 1, 23, 7, 20, 51, 15))
+
+        self.assertEqual(forecast["daily"]["data"][0]["temperatureMin"], 18.7)
+
+    def test_get_historical_sample(self):
+        """Checks if the get_historical_sample method retrieves a sample of
+        the month from the stub server.
+        """
+        config_data = dict(self.config_data, gis=dict(self.config_data["gis"], forecast_url=self.url + "/forecast/{api_key}/{lat},{lon},{time}?units=si"))
+        date_gen, temp_min, temp_max, humidity, pressure, timezone = get_historical_sample(config_data, FetchEngine(), ResponseCache()
+                                                                                          ,"Sydney, Australia", -33.85, 151.22, 2, 0)
+
+        self.assertEqual(date_gen.month, 2)
+        self.assertEqual((temp_min, humidity, timezone), (18.7, 81.0, "Australia/Sydney"))
+
+    def test_geocode(self):
+        """Checks if the geocode requests can be sent to the geocode_domain.
+        """
+        engine = FetchEngine()
+        geolocator = Nominatim(user_agent="toy_data_generator_test"
+                              ,domain="127.0.0.1:{}".format(self.server.server_port)
+                              ,scheme="http")
+        loc_data = engine.request(geolocator.geocode, "Sydney, Australia")
+
+        self.assertAlmostEqual(loc_data.latitude, -33.8548157)
+
+if __name__ == '__main__':
+    unittest.main()
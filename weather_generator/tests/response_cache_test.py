@@ -0,0 +1,78 @@
+# Standard Python Library
+import os
+import tempfile
+import time
+import unittest
+
+# Custom Python Library
+from generator.response_cache import ResponseCache
+
+class ResponseCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.directory.name, "cache", "responses.sqlite")
+        self.requests = []
+
+    def tearDown(self):
+
+        self.directory.cleanup()
+
+    def request(self, value):
+
+        self.requests.append(value)
+
+        return {"value": value}
+
+    def test_fetch_cached(self):
+        """Checks if the fetch method only sends the request on a cache miss,
+        including across cache instances.
+        """
+        cache = ResponseCache(self.file_path)
+        cache.fetch(["forecast", -33.85, 151.22, "2011-01-23T07:20:51"], self.request, 1)
+        cache.close()
+        
+        cache = ResponseCache(self.file_path)
+        value = cache.fetch(["forecast", -33.85, 151.22, "2011-01-23T07:20:51"], self.request, 2)
+        cache.close()
+
+        self.assertEqual(value, {"value": 1})
+        self.assertEqual(self.requests, [1])
+
+    def test_ttl_expiry(self):
+        """Checks if the expired entries are not returned.
+        """
+        cache = ResponseCache(self.file_path, ttl_days=0.1 / 86400)
+        cache.set(["geocode", "Sydney, Australia"], {"latitude": -33.85})
+        time.sleep(0.2)
+
+        self.assertIsNone(cache.get(["geocode", "Sydney, Australia"]))
+
+    def test_max_entries_eviction(self):
+        """Checks if the least recently used entries are evicted above
+        max_entries.
+        """
+        cache = ResponseCache(self.file_path, max_entries=2)
+
+        for idx in range(3):
+            cache.set(["geocode", idx], {"latitude": idx})
+            time.sleep(0.01)
+
+        cache.evict()
+
+        self.assertIsNone(cache.get(["geocode", 0]))
+        self.assertEqual(cache.get(["geocode", 2]), {"latitude": 2})
+
+    def test_cache_only_miss(self):
+        """Checks if a cache miss fails in cache-only mode.
+        """
+        cache = ResponseCache(self.file_path, cache_only=True)
+
+        with self.assertRaises(RuntimeError):
+            cache.fetch(["geocode", "Sydney, Australia"], self.request, 1)
+
+        self.assertEqual(self.requests, [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,13 +1,37 @@
 # Standard Python Library
+import asyncio
+import copy
 import datetime
+import logging.handlers
+import numpy as np
 import os
 import pandas as pd
+import shutil
+import socket
+import sys
+import tempfile
+import threading
 import unittest
+import unittest.mock
+from dateutil import parser, tz
 
 # Custom Python Library
-from generator.generate_baseline_data import get_elevation_data
+from generator.elevation_index import ElevationIndex
+from generator.generate_baseline_data import aggregate_historical_data, fit_weather_model, get_baseline_file_path, get_elevation_data
+from generator.output_formatter import format_signed_decimal, format_timestamp
+from generator.random_streams import RandomStreams
+from generator.record_buffer import RecordBuffer
+from generator.output_sink import FileSink, OutputSink, UnixSocketSink, open_output_sink
+from generator.output_writer import FastCsvWriter, PandasCsvWriter, ParquetWriter, get_output_writer
 from generator.weather_data_generator import WeatherDataGen
-from common.utils import get_file_path, get_config, get_city
+from generator.weather_model import MultivariateNormalWeatherModel
+from generator.weather_series import WeatherSeries, ar1_filter, normal_ppf
+from generator.weather_service import WeatherService
+from common.profiler import StageProfiler
+from common.import_profiler import get_import_times
+from common.logging_utils import ProgressLogger, QueueListenerHandler
+from common.utils import get_file_path, get_config, get_city, reload_config
+from tests.elevation_test import write_elevation_tiles
 
 class TransformTestCase(unittest.TestCase):
 
@@ -41,6 +65,366 @@ class TransformTestCase(unittest.TestCase):
         """
         self.assertTrue(get_city("Sydney, Australia")=="Sydney")
 
+    def test_weather_data_generator_lazy_imports(self):
+        """Checks if importing the weather data generator does not import
+        the GIS and network libraries used to build the baseline data, and
+        missing import times are an error.
+        """
+        
+        imported_packages = set(name.split(".")[0] for name, self_time, cumulative_time, depth in get_import_times("generator.weather_data_generator"))
+        
+        self.assertIn("pandas", imported_packages)
+        self.assertEqual(imported_packages.intersection({"rasterio", "forecastio", "geopy", "requests"}), set())
+        
+        # An interpreter without the importtime option reports no import
+        # times.
+        with unittest.mock.patch("subprocess.run", return_value=unittest.mock.Mock(returncode=0, stderr="")):
+            with self.assertRaises(RuntimeError):
+                get_import_times("generator.weather_data_generator")
+
+    def test_get_config_cache(self):
+        """Checks if the get_config method returns a copy of the cached
+        configuration data and parses the file again once it is edited.
+        """
+        
+        file_name = "test_config_cache.yaml"
+        file_path = get_file_path(file_name=file_name, folder_name="config")
+        
+        try:
+            with open(file_path, "w") as file:
+                file.write("chunk_size: 10\n")
+            
+            config_data = get_config(file_name=file_name)
+            config_data["chunk_size"] = 20
+            
+            self.assertEqual(get_config(file_name=file_name), {"chunk_size": 10})
+            
+            with open(file_path, "w") as file:
+                file.write("chunk_size: 300\n")
+            
+            self.assertEqual(get_config(file_name=file_name), {"chunk_size": 300})
+            
+            reload_config(file_name=file_name)
+            
+            self.assertEqual(get_config(file_name=file_name), {"chunk_size": 300})
+        
+        finally:
+            os.remove(file_path)
+            reload_config(file_name=file_name)
+
+    def test_aggregate_historical_data_subset(self):
+        """Checks if aggregating the historical data of a subset of locations,
+        as the incremental baseline update does, matches the aggregate data
+        of every location.
+        """
+        
+        df_hist = pd.read_csv(get_baseline_file_path(self.config_data, "output_base_historical_file_name"))
+        locations = sorted(df_hist["Location"].unique())[:2]
+        
+        df_aggregate = aggregate_historical_data(df_hist)
+        df_aggregate_subset = aggregate_historical_data(df_hist[df_hist["Location"].isin(locations)])
+        
+        pd.testing.assert_frame_equal(df_aggregate[df_aggregate["Location"].isin(locations)].reset_index(drop=True)
+                                     ,df_aggregate_subset.reset_index(drop=True))
+
+    def test_fit_weather_model(self):
+        """Checks if the fitted weather model covariance matches the sample
+        covariance of the historical data, with the temperature variance
+        within the day apart.
+        """
+        
+        df_hist = pd.read_csv(get_baseline_file_path(self.config_data, "output_base_historical_file_name"))
+        df_hist = pd.concat([df_hist, df_hist.assign(Pressure=df_hist["Pressure"] + 1.5, Humidity=df_hist["Humidity"] / 2)])
+        df_model = fit_weather_model(df_hist).set_index(["Location", "Month"])
+        
+        df_sample = df_hist[(df_hist["Location"]=="Sydney") & (df_hist["Month"]==1)]
+        df_daily = pd.DataFrame({"T": (df_sample["Temperature_Min"] + df_sample["Temperature_Max"]) / 2
+                                ,"P": df_sample["Pressure"]
+                                ,"H": df_sample["Humidity"]})
+        covariance = df_daily.cov()
+        day_variance = ((df_sample["Temperature_Max"] - df_sample["Temperature_Min"]) ** 2 / 12).mean()
+        
+        self.assertAlmostEqual(df_model.loc[("Sydney", 1), "T_var"], covariance.loc["T", "T"])
+        self.assertAlmostEqual(df_model.loc[("Sydney", 1), "T_day_var"], day_variance)
+        self.assertAlmostEqual(df_model.loc[("Sydney", 1), "PH_cov"], covariance.loc["P", "H"])
+        self.assertAlmostEqual(df_model.loc[("Sydney", 1), "H_mean"], df_daily["H"].mean())
+
+    def test_multivariate_normal_weather_model(self):
+        """Checks if the multivariate normal weather model draws the fitted
+        covariance without shrinkage and shifts the mean by condition.
+        """
+        
+        config_data = copy.deepcopy(self.config_data)
+        config_data["simulation"]["covariance_shrinkage"] = 0.0
+        config_data["simulation"]["condition_shift"] = {"Rain": {"Pressure": -6.0}}
+        
+        # One location and month with a mean and covariance of
+        # MultivariateNormalWeatherModel.aggregate_cols.
+        aggregate_lookup = np.array([[[15.0, 1010.0, 60.0, 3.0, 9.0, 25.0, 3.0, -4.0, 6.0, 1.0]]])
+        model = MultivariateNormalWeatherModel(config_data, aggregate_lookup)
+        number_data = 200000
+        condition_code, temperature, pressure, humidity = model.sample(np.zeros(number_data, dtype=np.int64)
+                                                                      ,np.zeros(number_data, dtype=np.int64)
+                                                                      ,RandomStreams(7).get_chunk_streams(0, number_data))
+        conditions = np.array(config_data["simulation"]["condition"])[condition_code]
+        values = np.column_stack([temperature, pressure, humidity]) - model.condition_shift[condition_code]
+        
+        self.assertEqual(set(conditions), set(config_data["simulation"]["condition"]))
+        self.assertAlmostEqual(pressure[conditions=="Rain"].mean() - pressure[conditions!="Rain"].mean(), -6.0, delta=0.1)
+        np.testing.assert_allclose(values.mean(axis=0), [15.0, 1010.0, 60.0], atol=0.1)
+        np.testing.assert_allclose(np.cov(values, rowvar=False), [[4.0, 3.0, -4.0], [3.0, 9.0, 6.0], [-4.0, 6.0, 25.0]], atol=0.3)
+
+    def test_normal_ppf(self):
+        """Checks if the inverse standard normal cumulative distribution
+        function matches the reference quantiles to double precision.
+        """
+        
+        for probability, quantile in ((0.5, 0.0), (0.975, 1.959963984540054), (0.1, -1.2815515655446004)
+                                     ,(0.01, -2.3263478740408408), (1e-6, -4.753424308822899)):
+            self.assertAlmostEqual(normal_ppf(probability), quantile, places=12)
+        
+        with self.assertRaises(ValueError):
+            normal_ppf(1.0)
+
+    def test_ar1_filter(self):
+        """Checks if the vectorized AR(1) filter matches the AR(1) recursion
+        across its sub-blocks.
+        """
+        
+        innovations = np.random.RandomState(2).normal(size=(600, 3))
+        values = innovations.copy()
+        
+        for idx in range(1, len(values)):
+            values[idx] = 0.95 * values[idx - 1] + innovations[idx]
+        
+        np.testing.assert_allclose(ar1_filter(innovations, 0.95), values, atol=1e-9)
+        np.testing.assert_allclose(ar1_filter(innovations, 0.0), innovations)
+
+    def test_queue_listener_handler(self):
+        """Checks if the queue listener handler passes the log records above
+        the level of each handler, and writes the pending records on close.
+        """
+        
+        info_handler = logging.handlers.BufferingHandler(100)
+        error_handler = logging.handlers.BufferingHandler(100)
+        error_handler.setLevel(logging.ERROR)
+        queue_handler = QueueListenerHandler([info_handler, error_handler])
+        logger = logging.getLogger("test_queue_listener_handler")
+        logger.propagate = False
+        logger.addHandler(queue_handler)
+        
+        try:
+            logger.info("info")
+            logger.error("error")
+        finally:
+            logger.removeHandler(queue_handler)
+            queue_handler.close()
+        
+        self.assertEqual([record.getMessage() for record in info_handler.buffer], ["info", "error"])
+        self.assertEqual([record.getMessage() for record in error_handler.buffer], ["error"])
+
+    def test_queue_listener_handler_fork(self):
+        """Checks if the queue listener handler of a forked child process
+        writes the log records synchronously, and closes without stopping
+        the listener thread of the parent process.
+        """
+        
+        handler = logging.handlers.BufferingHandler(100)
+        queue_handler = QueueListenerHandler([handler])
+        listener = queue_handler.listener
+        record = logging.makeLogRecord({"msg": "child", "levelno": logging.INFO})
+        
+        try:
+            with unittest.mock.patch("os.getpid", return_value=queue_handler.pid + 1):
+                queue_handler.handle(record)
+                self.assertEqual(handler.buffer, [record])
+                queue_handler.close()
+            
+            self.assertIsNone(queue_handler.listener)
+            self.assertTrue(listener._thread.is_alive())
+        finally:
+            listener.stop()
+            queue_handler.close()
+
+    def test_progress_logger(self):
+        """Checks if the progress logger logs at most once per interval and
+        once all the items are done.
+        """
+        
+        progress = ProgressLogger("Testing", 100, interval=3600)
+        
+        with self.assertLogs(level="INFO") as logs:
+            for _ in range(100):
+                progress.update()
+            
+            progress.update()
+        
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn("completed 100 item(s)", logs.records[0].getMessage())
+
+    def test_record_buffer_to_frame(self):
+        """Checks if the record buffer builds the data frame of the appended
+        records with numeric columns.
+        """
+        
+        buffer = RecordBuffer(["Location", "Month", "Humidity"])
+        buffer.append("Sydney", 1, 81.0)
+        buffer.extend([("Sydney", 2, 64.0), ("Beijing", 1, 32.5)])
+        
+        df = buffer.to_frame()
+        
+        self.assertEqual(list(df.columns), ["Location", "Month", "Humidity"])
+        self.assertEqual(df["Month"].tolist(), [1, 2, 1])
+        self.assertEqual(df["Humidity"].dtype, float)
+        
+        with self.assertRaises(ValueError):
+            buffer.append("Sydney", 3)
+
+    def test_random_streams_offset(self):
+        """Checks if a random stream advanced to an offset returns the same
+        draws as the stream drawn from the start, and if the streams are
+        independent.
+        """
+        
+        streams = RandomStreams(89)
+        values = streams.random("temperature", 0, 100)
+        
+        self.assertEqual(streams.random("temperature", 40, 60).tolist(), values[40:].tolist())
+        self.assertEqual(RandomStreams(89).random("temperature", 0, 100).tolist(), values.tolist())
+        self.assertNotEqual(streams.random("humidity", 0, 100).tolist(), values.tolist())
+        
+        with self.assertRaises(ValueError):
+            RandomStreams(-1)
+        
+    def test_format_signed_decimal(self):
+        """Checks if the format_signed_decimal method formats the values with
+        one decimal place and a '+' sign for positive values.
+        """
+        text = format_signed_decimal([9.24, -5.3, 0.0, -0.04, 12.0])
+        
+        self.assertEqual(list(text), ["+9.2", "-5.3", "0.0", "-0.0", "+12.0"])
+
+    def test_format_timestamp(self):
+        """Checks if the format_timestamp method formats the epoch seconds in
+        ISO8601 format for dense and sparse days.
+        """
+        
+        text = format_timestamp([1295767251, 1295767251 + 86399, -1, 0])
+        
+        self.assertEqual(list(text), ["2011-01-23T07:20:51Z", "2011-01-24T07:20:50Z", "1969-12-31T23:59:59Z", "1970-01-01T00:00:00Z"])
+        self.assertEqual(list(format_timestamp([0, 1545730200])), ["1970-01-01T00:00:00Z", "2018-12-25T09:30:00Z"])
+
+    def test_format_timestamp_utc_offsets(self):
+        """Checks if the format_timestamp method formats the epoch seconds in
+        local time with the UTC offset.
+        """
+        
+        text = format_timestamp([1295767251, 1295767251, 1295767251], utc_offsets=[39600, -12600, 0])
+        
+        self.assertEqual(list(text), ["2011-01-23T18:20:51+11:00", "2011-01-23T03:50:51-03:30", "2011-01-23T07:20:51+00:00"])
+
+    def test_fast_csv_writer_encode(self):
+        """Checks if the FastCsvWriter encodes the same bytes as the
+        PandasCsvWriter.
+        """
+        wdg = WeatherDataGen(number_simulated_data=100)
+        wdg.generate()
+        
+        self.assertEqual(FastCsvWriter(self.config_data).encode(wdg.output_data)
+                        ,PandasCsvWriter(self.config_data).encode(wdg.output_data))
+
+    def test_file_sink_batches(self):
+        """Checks if the file sink writes the small and large writes in
+        order, including the reused write buffers, and the abstract sink
+        cannot be created.
+        """
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, "output.csv")
+            sink = FileSink(file_path, buffer_size=1, batch_size=8)
+            buffer = bytearray(b"0123456789abcdef")
+            
+            sink.write(b"abc")
+            sink.write(buffer)
+            buffer[:] = b"x" * len(buffer)
+            sink.write(b"de")
+            sink.close()
+            
+            with open(file_path, "rb") as file:
+                self.assertEqual(file.read(), b"abc0123456789abcdefde")
+            
+            self.assertEqual(sink.tell(), 21)
+        
+        with self.assertRaises(ValueError):
+            open_output_sink(self.config_data, file_path, sink_name="fifo", sink_path=None)
+        
+        with self.assertRaises(TypeError):
+            OutputSink()
+
+    @unittest.skipUnless(hasattr(socket, "AF_UNIX"), "Unix domain sockets are not supported.")
+    def test_unix_socket_sink(self):
+        """Checks if the Unix domain socket sink sends the data to the
+        consumer and signals the end of the data.
+        """
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            socket_path = os.path.join(temp_dir, "output.sock")
+            server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            server.bind(socket_path)
+            server.listen(1)
+            received = []
+            
+            def consume():
+                connection, _ = server.accept()
+                
+                with connection:
+                    while True:
+                        data = connection.recv(4096)
+                        
+                        if not data:
+                            break
+                        
+                        received.append(data)
+            
+            consumer = threading.Thread(target=consume)
+            consumer.start()
+            
+            sink = UnixSocketSink(socket_path, buffer_size=2, batch_size=1000)
+            
+            for _ in range(100):
+                sink.write(b"x" * 999)
+            
+            sink.close()
+            consumer.join()
+            server.close()
+        
+        self.assertEqual(b"".join(received), b"x" * 99900)
+
+    def test_parquet_writer_row_groups(self):
+        """Checks if the ParquetWriter writes the chunks in full row groups
+        with the typed columns.
+        """
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            self.skipTest("pyarrow is not installed.")
+        
+        config_data = dict(self.config_data, simulation=dict(self.config_data["simulation"], output_row_group_size=4))
+        wdg = WeatherDataGen(number_simulated_data=10)
+        
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, "output.parquet")
+            writer = ParquetWriter(config_data, stream=open(file_path, "wb"))
+            
+            for output_data in wdg.generate_iter(chunk_size=3):
+                writer.write(output_data)
+            
+            writer.close()
+            parquet_file = pq.ParquetFile(file_path)
+            
+            self.assertEqual([parquet_file.metadata.row_group(idx).num_rows for idx in range(parquet_file.num_row_groups)], [4, 4, 2])
+            self.assertEqual(str(parquet_file.schema_arrow.field("Humidity").type), "int8")
+
     def test_get_elevation_data(self):
         """Checks if the get_elevation_data method is able to extract the
         elevation for Adelaide, Australia (-34.9281805,138.5999312).
@@ -55,6 +439,163 @@ class TransformTestCase(unittest.TestCase):
         
         self.assertEqual(len(wdg.output_data), 10)
 
+    def test_weather_data_generator_profile(self):
+        """Checks if the profiler reports the rows of each generation stage
+        and chunk, a disabled profiler reports nothing, and the profiler
+        works without the resource module.
+        """
+        
+        report = WeatherDataGen(number_simulated_data=10, profiler=StageProfiler(enabled=True)).generate()
+        
+        self.assertEqual(report["stages"]["init"]["calls"], 1)
+        self.assertEqual(report["stages"]["generate_location"]["rows"], 10)
+        self.assertEqual(report["stages"]["generate_weather_variables"]["rows"], 10)
+        self.assertEqual([(chunk["chunk_start"], chunk["rows"]) for chunk in report["chunks"]], [(0, 10)])
+        self.assertEqual(WeatherDataGen(number_simulated_data=10).generate()["stages"], {})
+        
+        # The stages and chunks report how much the peak resident set size
+        # grew while they ran, which is at most the peak of the run.
+        for record in list(report["stages"].values()) + report["chunks"]:
+            self.assertTrue(0 <= record["peak_rss_growth_bytes"] <= report["peak_rss_bytes"])
+        
+        # Without the resource module and psutil e.g. on Windows, the peak
+        # resident set size is not reported.
+        with unittest.mock.patch("common.profiler.resource", None), unittest.mock.patch.dict(sys.modules, {"psutil": None}):
+            report = WeatherDataGen(number_simulated_data=10, profiler=StageProfiler(enabled=True)).generate()
+        
+        self.assertIsNone(report["peak_rss_bytes"])
+        self.assertIsNone(report["stages"]["generate_location"]["peak_rss_growth_bytes"])
+        self.assertEqual(report["stages"]["generate_location"]["rows"], 10)
+
+    def test_weather_data_generator_profile_workers(self):
+        """Checks if the profiler of the save_output_iter method with several
+        workers reports the init stage of the parent process once, and the
+        stages of every chunk.
+        """
+        
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        
+        wdg = WeatherDataGen(number_simulated_data=10, profiler=StageProfiler(enabled=True))
+        report = wdg.save_output_iter(chunk_size=3, workers=3, sink="file", sink_path=os.path.join(directory, "output.csv"))
+        
+        self.assertEqual(report["stages"]["init"]["calls"], 1)
+        self.assertEqual(report["stages"]["generate_location"]["rows"], 10)
+        self.assertEqual(report["stages"]["encode_output"]["calls"], 4)
+        self.assertEqual(len(report["chunks"]), 4)
+
+    def test_weather_service(self):
+        """Checks if the service streams the same data points as the
+        generator for concurrent requests, and rejects invalid requests.
+        """
+        
+        wdg = WeatherDataGen(number_simulated_data=1)
+        service = WeatherService(wdg, workers=2, chunk_size=1500)
+        
+        async def request(target):
+            stream_reader, stream_writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+            stream_writer.write("GET {} HTTP/1.1\r\nHost: localhost\r\n\r\n".format(target).encode("latin-1"))
+            response = await stream_reader.read()
+            stream_writer.close()
+            
+            head, body = response.split(b"\r\n\r\n", 1)
+            data = b""
+            
+            # Decoding the chunked transfer encoding.
+            while b"Transfer-Encoding: chunked" in head:
+                size, body = body.split(b"\r\n", 1)
+                
+                if int(size, 16)==0:
+                    break
+                
+                data += body[:int(size, 16)]
+                body = body[int(size, 16) + 2:]
+            
+            return head.split(b"\r\n", 1)[0], data
+        
+        async def run_requests():
+            nonlocal server
+            server = await service.start(port=0)
+            
+            try:
+                return await asyncio.gather(request("/generate?rows=5000&seed=1"), request("/generate?rows=2000&seed=2")
+                                           ,request("/generate?rows=0"), request("/weather"))
+            finally:
+                server.close()
+                await server.wait_closed()
+        
+        server = None
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        responses = loop.run_until_complete(run_requests())
+        writer = get_output_writer(self.config_data)
+        
+        for (status, data), (number_data, seed) in zip(responses[:2], ((5000, 1), (2000, 2))):
+            self.assertEqual(status, b"HTTP/1.1 200 OK")
+            self.assertEqual(data, writer.encode(WeatherDataGen(number_simulated_data=number_data, seed=seed).generate_chunk(0, number_data)))
+        
+        self.assertEqual(responses[2][0], b"HTTP/1.1 400 Bad Request")
+        self.assertEqual(responses[3][0], b"HTTP/1.1 404 Not Found")
+        self.assertEqual(service.get_chunks(5000), [(0, 1024), (1024, 1500), (2524, 1500), (4024, 976)])
+
+    def test_weather_data_generator_local_time(self):
+        """Checks if the local time mode formats each timestamp in the
+        timezone of its location, including daylight saving time.
+        """
+        
+        reference_data = pd.read_csv(get_baseline_file_path(self.config_data, "output_base_reference_file_name"))
+        timezones = dict(zip(reference_data["Location"], reference_data["Timezone"]))
+        
+        wdg = WeatherDataGen(number_simulated_data=500, seed=3, local_time=True)
+        wdg.generate()
+        formatted_data = wdg.format_output()
+        
+        for location, timestamp, text in zip(formatted_data["Location"], wdg.output_data["Local Time"], formatted_data["Local Time"]):
+            local_time = parser.isoparse(text)
+            
+            self.assertEqual(local_time.timestamp(), timestamp)
+            self.assertEqual(local_time.utcoffset(), datetime.datetime.fromtimestamp(timestamp, tz.gettz(timezones[location])).utcoffset())
+
+    def test_weather_series_chunks(self):
+        """Checks if the series generated in consecutive chunks, continuing
+        the state of the last chunk, and in chunks out of order are the same
+        as the series generated at once.
+        """
+        
+        model = unittest.mock.Mock(conditions=["Sunny", "Rain"], condition_shift=np.zeros((2, 3)))
+        weather_series = WeatherSeries(model, RandomStreams(3), [0.0, 90.0, -120.0], 3600, 0.9)
+        expected = weather_series.copy(RandomStreams(3)).get_series("temperature", 0, 40000)
+        bounds = [0, 1, 700, 1024, 16383, 16390, 17000, 33000, 40000]
+        
+        series = np.concatenate([weather_series.get_series("temperature", start, end) for start, end in zip(bounds[:-1], bounds[1:])])
+        
+        np.testing.assert_array_equal(series, expected)
+        np.testing.assert_array_equal(weather_series.get_series("temperature", 500, 900), expected[500:900])
+        np.testing.assert_array_equal(weather_series.copy(RandomStreams(3)).get_series("temperature", 20000, 21000), expected[20000:21000])
+
+    def test_weather_data_generator_timeseries(self):
+        """Checks if the timeseries mode generates the hourly series of every
+        location in time order, capped at date_end, and the same series for
+        any chunk size.
+        """
+        
+        config_data = copy.deepcopy(self.config_data)
+        config_data["simulation"].update(mode="timeseries", timeseries_frequency="hourly"
+                                        ,date_start=datetime.date(2000, 1, 1), date_end=datetime.date(2000, 1, 3))
+        number_locations = len(config_data["location"])
+        output_data = []
+        
+        with unittest.mock.patch("generator.weather_data_generator.get_config", return_value=config_data):
+            for chunk_size in (10000, 7):
+                wdg = WeatherDataGen(number_simulated_data=10000, seed=11)
+                output_data.append(pd.concat(wdg.generate_iter(chunk_size=chunk_size), ignore_index=True))
+        
+        timestamps = output_data[0]["Local Time"].values
+        
+        self.assertEqual(len(output_data[0]), 48 * number_locations)
+        self.assertEqual(list(output_data[0]["Location"][:number_locations]), [get_city(loc) for loc in config_data["location"]])
+        self.assertTrue((timestamps[number_locations:] - timestamps[:-number_locations]==3600).all())
+        pd.testing.assert_frame_equal(output_data[0], output_data[1])
 
     def test_weather_data_generator_save_output(self):
         """Checks if the save_output method generate the csv file.
@@ -72,6 +613,111 @@ class TransformTestCase(unittest.TestCase):
         
         self.assertTrue(os.path.exists(file_path))
 
+    def test_weather_data_generator_generate_iter(self):
+        """Checks if the generate_iter method can generate 10 data points
+        in chunks of at most 4 data points.
+        """
+        wdg = WeatherDataGen(number_simulated_data=10)
+        chunk_lengths = [len(output_data) for output_data in wdg.generate_iter(chunk_size=4)]
+        
+        self.assertEqual(chunk_lengths, [4, 4, 2])
+
+    def test_weather_data_generator_save_output_iter(self):
+        """Checks if the save_output_iter method saves all the chunks in
+        the csv file.
+        """
+        file_path = get_file_path(file_name=self.config_data["simulation"]["output_data"]
+                                 ,folder_name="data"
+                                 ,subdirectory="output")
+
+        wdg = WeatherDataGen(number_simulated_data=10)
+        wdg.save_output_iter(chunk_size=3)
+        
+        with open(file_path) as file:
+            self.assertEqual(len(file.readlines()), 10)
+
+    def test_weather_data_generator_save_output_iter_workers(self):
+        """Checks if the save_output_iter method saves the same output for
+        the same seed regardless of the chunk size and number of workers.
+        """
+        file_path = get_file_path(file_name=self.config_data["simulation"]["output_data"]
+                                 ,folder_name="data"
+                                 ,subdirectory="output")
+        output_text = []
+        
+        for chunk_size, workers in ((10, 1), (3, 1), (3, 3), (4, 2)):
+            wdg = WeatherDataGen(number_simulated_data=10, seed=89)
+            wdg.save_output_iter(chunk_size=chunk_size, workers=workers)
+            
+            with open(file_path) as file:
+                output_text.append(file.read())
+        
+        for text in output_text[1:]:
+            self.assertEqual(text, output_text[0])
+
+    def test_weather_data_generator_save_output_iter_abort(self):
+        """Checks if the save_output_iter method aborts the output sink when
+        the generation fails, removing the incomplete file and stopping the
+        writer thread.
+        """
+        
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        
+        file_path = os.path.join(directory, "output.csv")
+        generate_chunk = WeatherDataGen.generate_chunk
+        
+        def fail_chunk(generator, chunk_start, number_data):
+            if chunk_start>=30:
+                raise RuntimeError("Generation failed.")
+            
+            return generate_chunk(generator, chunk_start, number_data)
+        
+        wdg = WeatherDataGen(number_simulated_data=100)
+        
+        with unittest.mock.patch.object(WeatherDataGen, "generate_chunk", fail_chunk):
+            with self.assertRaises(RuntimeError):
+                wdg.save_output_iter(chunk_size=10, sink="file", sink_path=file_path)
+        
+        self.assertFalse(os.path.exists(file_path))
+        self.assertFalse(any(thread.name=="FileSink" for thread in threading.enumerate()))
+
+    def test_weather_data_generator_position_jitter(self):
+        """Checks if the position jitter generates positions within the
+        elevation grid with the elevation of the jittered coordinates, and
+        the same output for any number of workers.
+        """
+        
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        
+        config_data = copy.deepcopy(self.config_data)
+        config_data["gis"].update(input_subdirectory=directory, elevation_index_subdirectory=os.path.join(directory, "index"))
+        config_data["simulation"]["position_jitter"] = 0.5
+        write_elevation_tiles(config_data["gis"])
+        index = ElevationIndex.from_config(config_data["gis"])
+        output_bytes = []
+        
+        with unittest.mock.patch("generator.weather_data_generator.get_config", return_value=config_data):
+            wdg = WeatherDataGen(number_simulated_data=500, seed=21)
+            positions = np.array([position.split(",") for position in wdg.generate_chunk(0, 500)["Position"].astype(str)], dtype=float)
+            
+            for workers in (1, 3):
+                file_path = os.path.join(directory, "output_{}.csv".format(workers))
+                WeatherDataGen(number_simulated_data=500, seed=21).save_output_iter(chunk_size=70, workers=workers, sink="file", sink_path=file_path)
+                
+                with open(file_path, "rb") as file:
+                    output_bytes.append(file.read())
+        
+        west, south = index.bounds[:, :2].min(axis=0)
+        east, north = index.bounds[:, 2:].max(axis=0)
+        
+        self.assertGreater(len(np.unique(positions[:, :2], axis=0)), len(config_data["location"]))
+        self.assertTrue(((south<=positions[:, 0]) & (positions[:, 0]<=north)).all())
+        self.assertTrue(((west<=positions[:, 1]) & (positions[:, 1]<=east)).all())
+        np.testing.assert_array_equal(positions[:, 2], index.lookup(positions[:, 0], positions[:, 1]))
+        self.assertEqual(output_bytes[0], output_bytes[1])
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file